@@ -6,6 +6,31 @@ import fs from "fs/promises"
 
 const execAsync = promisify(exec)
 
+// Service warm de recherche (yc-strategy-agent/scripts/search_server.py)
+const SEARCH_SERVICE_URL = process.env.SEARCH_SERVICE_URL || "http://127.0.0.1:8765"
+
+/**
+ * Interroge le service de recherche warm ; renvoie null s'il ne tourne pas
+ */
+async function searchViaService(idea: string): Promise<any[] | null> {
+  try {
+    const response = await fetch(`${SEARCH_SERVICE_URL}/search`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ idea_pitch: idea, limit: 3 }),
+      signal: AbortSignal.timeout(10000),
+    })
+    if (!response.ok) {
+      console.error("Search service error:", await response.text())
+      return null
+    }
+    const { results } = await response.json()
+    return results
+  } catch {
+    return null
+  }
+}
+
 /**
  * API pour exécuter la recherche YC Strategy
  */
@@ -20,45 +45,52 @@ export async function POST(request: Request) {
       )
     }
 
-    // Chemin vers le script Python
-    const scriptPath = path.join(
-      process.cwd(),
-      "yc-strategy-agent",
-      "scripts",
-      "1_semantic_search.py"
-    )
+    // Service warm d'abord, sinon on lance le script Python
+    let results = await searchViaService(idea)
+    let stdout = ""
 
-    // Exécuter le script Python
-    const { stdout, stderr } = await execAsync(
-      `python3 "${scriptPath}" "${idea.replace(/"/g, '\\"')}"`,
-      {
-        cwd: path.join(process.cwd(), "yc-strategy-agent"),
-        env: { ...process.env },
-        maxBuffer: 1024 * 1024 * 10, // 10MB buffer
-      }
-    )
+    if (!results) {
+      // Chemin vers le script Python
+      const scriptPath = path.join(
+        process.cwd(),
+        "yc-strategy-agent",
+        "scripts",
+        "1_semantic_search.py"
+      )
 
-    if (stderr && !stderr.includes("Warning")) {
-      console.error("Python script error:", stderr)
+      // Exécuter le script Python
+      const output = await execAsync(
+        `python3 "${scriptPath}" "${idea.replace(/"/g, '\\"')}" --json`,
+        {
+          cwd: path.join(process.cwd(), "yc-strategy-agent"),
+          env: { ...process.env },
+          maxBuffer: 1024 * 1024 * 10, // 10MB buffer
+        }
+      )
+      stdout = output.stdout
+
+      if (output.stderr && !output.stderr.includes("Warning")) {
+        console.error("Python script error:", output.stderr)
+      }
     }
 
     // Parser la sortie JSON
     try {
-      const results = JSON.parse(stdout)
+      results = results ?? JSON.parse(stdout)
       
       // Formater les résultats pour l'arbre
       const ycInsights = {
         similarCompanies: results.slice(0, 3).map((company: any) => ({
-          name: company.company_name || "Unknown",
-          description: company.one_liner || "",
+          name: company.name || company.company_name || "Unknown",
+          description: company.description || company.one_liner || "",
           batch: company.batch || "",
-          score: company.score || 0,
-          url: company.website || "",
+          score: company.similarity_score ?? company.score ?? 0,
+          url: company.url || company.website || "",
         })),
         insights: {
           marketValidation: `${results.length} entreprises YC similaires trouvées`,
-          topCompany: results[0]?.company_name || "",
-          averageScore: (results.reduce((acc: number, c: any) => acc + (c.score || 0), 0) / results.length).toFixed(2),
+          topCompany: results[0]?.name || results[0]?.company_name || "",
+          averageScore: (results.reduce((acc: number, c: any) => acc + (c.similarity_score ?? c.score ?? 0), 0) / results.length).toFixed(2),
         }
       }
 
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+"""
+Versioned embedding artifacts for bootstrapping a collection without inference
+
+An artifact holds everything an upload computes: the deduplicated rows'
+point IDs, dense vectors, BM25 sparse vectors and payloads. It lives in a
+directory named after the embedding model and the CSV hash:
+
+    data/artifacts/<model>-<csv sha256[:12]>/
+        manifest.json        models, CSV hash, dedup settings, counts, file checksums
+        vectors.npz          compressed ids, vectors and CSR-packed sparse vectors
+        payloads.jsonl.gz    one payload per point, in the same order
+
+Restoring creates the collection and upserts the stored batches; neither
+the dense nor the sparse model is loaded. The manifest is checked before
+any array is read, so an artifact built for another model, another CSV or
+other dedup settings is rejected straight away.
+"""
+import os
+import json
+import gzip
+import time
+import hashlib
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+from qdrant_client import QdrantClient
+from qdrant_client.models import SparseVector
+
+from lib.batching import plan_batches
+from lib.query_cache import bump_index_generation
+from lib.embedding_profiles import model_cache_key
+from lib.dedup import DEDUP_ENABLED, DEDUP_MIN_TOKENS, DEDUP_THRESHOLD, load_deduplicated_rows
+from lib.qdrant_client import (
+    COLLECTION_NAME,
+    EMBEDDING_MODEL,
+    SPARSE_MODEL,
+    VECTOR_NAME,
+    VECTOR_SIZE,
+    create_batch_from_chunk,
+    create_collection,
+    _batch_to_upsert,
+    _merge_batches,
+    _slice_batch,
+)
+
+load_dotenv()
+
+ARTIFACT_DIR = os.getenv(
+    "ARTIFACT_DIR",
+    str(Path(__file__).parent.parent / "data" / "artifacts")
+)
+
+ARTIFACT_FORMAT_VERSION = 1
+
+
+def file_sha256(path: str) -> str:
+    """Hex SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dedup_settings() -> Dict[str, Any]:
+    """Settings that decide which rows (and so which points) an artifact holds"""
+    return {'enabled': DEDUP_ENABLED, 'threshold': DEDUP_THRESHOLD, 'min_tokens': DEDUP_MIN_TOKENS}
+
+
+def default_artifact_path(csv_path: str, artifact_dir: str = ARTIFACT_DIR) -> Path:
+    """Directory of the artifact for the current model (and profile) and this CSV"""
+    model_slug = model_cache_key(EMBEDDING_MODEL).split('/')[-1].lower().replace(':', '-')
+    return Path(artifact_dir) / f"{model_slug}-{file_sha256(csv_path)[:12]}"
+
+
+def build_artifact(
+    csv_path: str,
+    artifact_path: Optional[str] = None,
+    include_sparse: bool = True,
+    chunk_size: int = 256
+) -> Path:
+    """Embed the CSV once and write it as an artifact; returns its directory"""
+    path = Path(artifact_path) if artifact_path else default_artifact_path(csv_path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    rows = list(load_deduplicated_rows(csv_path))
+    texts = [row['description'].strip() for row in rows]
+    batches = []
+    for indexes in plan_batches(texts, max_batch_size=chunk_size):
+        batch = create_batch_from_chunk([rows[i] for i in indexes], None, include_sparse)
+        if batch is not None:
+            batches.append(batch)
+    merged = _merge_batches(batches)
+
+    arrays = {
+        'ids': np.asarray(merged['ids'], dtype=np.int64),
+        'vectors': np.asarray(merged['vectors'], dtype=np.float32),
+    }
+    if merged['sparse'] is not None:
+        # CSR layout: the terms of point i are indices/values[indptr[i]:indptr[i + 1]]
+        lengths = [len(vector.indices) for vector in merged['sparse']]
+        arrays['sparse_indptr'] = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        arrays['sparse_indices'] = np.array([i for vector in merged['sparse'] for i in vector.indices], dtype=np.uint32)
+        arrays['sparse_values'] = np.array([v for vector in merged['sparse'] for v in vector.values], dtype=np.float32)
+    np.savez_compressed(path / "vectors.npz", **arrays)
+
+    with gzip.open(path / "payloads.jsonl.gz", 'wt', encoding='utf-8') as f:
+        for payload in merged['payloads']:
+            f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+    manifest = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'embedding_model': EMBEDDING_MODEL,
+        'embedding_key': model_cache_key(EMBEDDING_MODEL),
+        'vector_name': VECTOR_NAME,
+        'vector_size': VECTOR_SIZE,
+        'sparse_model': SPARSE_MODEL if include_sparse else None,
+        'csv_sha256': file_sha256(csv_path),
+        'dedup': dedup_settings(),
+        'count': len(arrays['ids']),
+        'built_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'files': {name: file_sha256(path / name) for name in ("vectors.npz", "payloads.jsonl.gz")},
+    }
+    with open(path / "manifest.json", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+
+def check_artifact(artifact_path: str, csv_path: str) -> Dict[str, Any]:
+    """Read an artifact's manifest and raise ValueError if it does not match this setup"""
+    manifest_path = Path(artifact_path) / "manifest.json"
+    if not manifest_path.exists():
+        raise ValueError(f"No artifact at '{artifact_path}'. Build one with scripts/build_artifact.py.")
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    expected = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'embedding_model': EMBEDDING_MODEL,
+        'embedding_key': model_cache_key(EMBEDDING_MODEL),
+        'vector_name': VECTOR_NAME,
+        'vector_size': VECTOR_SIZE,
+        'csv_sha256': file_sha256(csv_path),
+        'dedup': dedup_settings(),
+    }
+    mismatches = [
+        f"{key}: artifact has {manifest.get(key)!r}, expected {value!r}"
+        for key, value in expected.items() if manifest.get(key) != value
+    ]
+    if manifest.get('sparse_model') not in (None, SPARSE_MODEL):
+        mismatches.append(f"sparse_model: artifact has {manifest['sparse_model']!r}, expected {SPARSE_MODEL!r}")
+    if mismatches:
+        raise ValueError(f"Artifact '{artifact_path}' does not match this setup:\n  " + "\n  ".join(mismatches))
+
+    for name, checksum in manifest['files'].items():
+        if file_sha256(Path(artifact_path) / name) != checksum:
+            raise ValueError(f"Artifact file '{name}' is corrupt (checksum mismatch)")
+    return manifest
+
+
+def load_artifact_batch(artifact_path: str) -> Dict[str, Any]:
+    """The artifact's points as one columnar batch (see create_batch_from_chunk)"""
+    path = Path(artifact_path)
+    with np.load(path / "vectors.npz") as arrays:
+        ids = arrays['ids']
+        vectors = arrays['vectors']
+        sparse = None
+        if 'sparse_indptr' in arrays:
+            indptr, indices, values = arrays['sparse_indptr'], arrays['sparse_indices'], arrays['sparse_values']
+            sparse = [
+                SparseVector(indices=indices[start:end].tolist(), values=values[start:end].tolist())
+                for start, end in zip(indptr[:-1], indptr[1:])
+            ]
+    with gzip.open(path / "payloads.jsonl.gz", 'rt', encoding='utf-8') as f:
+        payloads = [json.loads(line) for line in f]
+    if not len(ids) == len(vectors) == len(payloads):
+        raise ValueError(f"Artifact '{artifact_path}' is inconsistent: {len(ids)} ids, {len(vectors)} vectors, {len(payloads)} payloads")
+    return {'ids': ids.tolist(), 'vectors': vectors, 'sparse': sparse, 'payloads': payloads}
+
+
+def restore_collection_from_artifact(
+    client: QdrantClient,
+    artifact_path: str,
+    csv_path: str,
+    collection_name: str = COLLECTION_NAME,
+    profile: Optional[str] = None,
+    batch_size: int = 256
+) -> int:
+    """Re-create the collection from an artifact (no model is loaded); returns the point count"""
+    manifest = check_artifact(artifact_path, csv_path)
+    batch = load_artifact_batch(artifact_path)
+    if batch['sparse'] is None:
+        print("⚠️  Artifact has no sparse vectors: hybrid search needs a rebuild (--rebuild)")
+
+    create_collection(client, collection_name, recreate=True, profile=profile)
+    count = len(batch['ids'])
+    for start in range(0, count, batch_size):
+        chunk = _slice_batch(batch, start, start + batch_size)
+        client.upsert(collection_name=collection_name, points=_batch_to_upsert(chunk), wait=True)
+    print(f"Restored {count} points from artifact built {manifest['built_at']}")
+    bump_index_generation()
+    return count
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Length-aware batching for embedding generation
+
+The ONNX model pads every text in a batch to the longest one, so a batch
+mixing one-line taglines with long descriptions spends most of its forward
+pass on padding. Texts are instead sorted by (estimated) token length and
+cut into batches whose padded size, rows x longest text, stays under a
+token budget: short texts go in large batches, long texts in small ones.
+
+Token counts are estimated from word pieces (words and punctuation) rather
+than by running the model's tokenizer, so planning never loads the model.
+"""
+import os
+import re
+import threading
+from collections import deque
+from typing import List, Dict, Any, Sequence
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+EMBED_TOKEN_BUDGET = int(os.getenv("EMBED_TOKEN_BUDGET", "16384"))
+EMBED_MAX_BATCH_SIZE = int(os.getenv("EMBED_MAX_BATCH_SIZE", "256"))
+
+# Number of recent batches kept for per-batch reporting
+BATCH_STATS_WINDOW = 1000
+
+# BERT-style models truncate at 512 tokens, including [CLS] and [SEP]
+MAX_SEQUENCE_LENGTH = 512
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate model token count of a text (word pieces + special tokens)"""
+    return min(len(_TOKEN_PATTERN.findall(text)) + 2, MAX_SEQUENCE_LENGTH)
+
+
+def plan_batches(
+    texts: Sequence[str],
+    token_budget: int = EMBED_TOKEN_BUDGET,
+    max_batch_size: int = EMBED_MAX_BATCH_SIZE
+) -> List[List[int]]:
+    """
+    Group text indexes into batches of similar length
+
+    Indexes are sorted by estimated token length and added to the current
+    batch until its padded size (rows x longest text) would exceed
+    `token_budget` or it reaches `max_batch_size` rows. Callers put results
+    back in input order through the returned indexes.
+    """
+    lengths = [estimate_tokens(text) for text in texts]
+    order = sorted(range(len(texts)), key=lambda i: lengths[i])
+
+    batches: List[List[int]] = []
+    batch: List[int] = []
+    for i in order:
+        # Sorted ascending, so the newest text is always the longest in the batch
+        if batch and ((len(batch) + 1) * lengths[i] > token_budget or len(batch) >= max_batch_size):
+            batches.append(batch)
+            batch = []
+        batch.append(i)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class BatchStats:
+    """Padding and throughput of the embedding batches run so far"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.batches = deque(maxlen=BATCH_STATS_WINDOW)
+            self.totals = {'batches': 0, 'rows': 0, 'tokens': 0, 'padded_tokens': 0, 'seconds': 0.0}
+
+    def record(self, texts: Sequence[str], seconds: float):
+        """Record one model call over `texts`"""
+        lengths = [estimate_tokens(text) for text in texts]
+        if not lengths:
+            return
+        tokens = sum(lengths)
+        padded = len(lengths) * max(lengths)
+        with self._lock:
+            self.totals['batches'] += 1
+            self.totals['rows'] += len(lengths)
+            self.totals['tokens'] += tokens
+            self.totals['padded_tokens'] += padded
+            self.totals['seconds'] += seconds
+            self.batches.append({
+                'rows': len(lengths),
+                'tokens': tokens,
+                'padded_tokens': padded,
+                'padding_ratio': 1 - tokens / padded,
+                'seconds': seconds,
+                'tokens_per_s': tokens / seconds if seconds > 0 else 0.0,
+            })
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals over every batch recorded since the last reset"""
+        with self._lock:
+            totals = dict(self.totals)
+        tokens, padded, seconds = totals['tokens'], totals['padded_tokens'], totals['seconds']
+        return {
+            'batches': totals['batches'],
+            'rows': totals['rows'],
+            'tokens': tokens,
+            'padded_tokens': padded,
+            'padding_ratio': 1 - tokens / padded if padded else 0.0,
+            'model_seconds': seconds,
+            'tokens_per_s': tokens / seconds if seconds > 0 else 0.0,
+        }
+
+
+# Process-wide stats for every embed_texts model call
+embedding_batch_stats = BatchStats()
@@ -0,0 +1,390 @@
+#!/usr/bin/env python
+"""
+Long-lived Chromium browsers with a pool of recyclable contexts
+
+Launching Chromium takes about a second and used to happen for every page
+scraped. The pool launches up to BROWSER_POOL_SIZE browsers on first use and
+keeps them running for the life of the process. Every checkout gets a fresh
+page in an isolated browser context (own cookies, storage and cache). The
+contexts are reused:
+
+- a context is closed and replaced after BROWSER_CONTEXT_MAX_USES pages, so
+  cookies and memory do not pile up;
+- a context whose page crashed or raised is closed right away;
+- a browser that disconnected (crashed or was killed) is relaunched on the
+  next checkout.
+
+The main thread's pool is closed at interpreter exit; other threads close
+theirs with close_browser_pool(). stats() reports launches, pages per
+browser and the launch time saved compared with one launch per page.
+
+Sync Playwright objects belong to the thread that started them, so
+get_browser_pool() returns one pool per thread. AsyncBrowserPool serves the
+async scrapers from one event loop; close it with `await pool.close()`
+before the loop ends (its browsers exit with the process otherwise).
+"""
+import os
+import time
+import atexit
+import asyncio
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+BROWSER_CONTEXTS_PER_BROWSER = int(os.getenv("BROWSER_CONTEXTS_PER_BROWSER", "4"))
+BROWSER_CONTEXT_MAX_USES = int(os.getenv("BROWSER_CONTEXT_MAX_USES", "20"))
+BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "true").lower() not in ("0", "false", "no")
+
+
+class _BrowserSlot:
+    """One launched browser and the contexts opened in it"""
+
+    def __init__(self, browser: Any, launch_s: float):
+        self.browser = browser
+        self.launch_s = launch_s
+        self.pages = 0
+        self.contexts = 0
+
+
+class _ContextSlot:
+    """One browser context and how many pages it has served"""
+
+    def __init__(self, context: Any, browser_slot: _BrowserSlot):
+        self.context = context
+        self.browser_slot = browser_slot
+        self.uses = 0
+
+
+class _BrowserPoolBase:
+    """Bookkeeping shared by the sync and async pools"""
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        contexts_per_browser: int = BROWSER_CONTEXTS_PER_BROWSER,
+        context_max_uses: int = BROWSER_CONTEXT_MAX_USES,
+        headless: bool = BROWSER_HEADLESS
+    ):
+        self.size = max(1, size)
+        self.contexts_per_browser = max(1, contexts_per_browser)
+        self.context_max_uses = max(1, context_max_uses)
+        self.headless = headless
+        self._browsers: List[_BrowserSlot] = []
+        self._idle: List[_ContextSlot] = []
+        self.counters = {
+            'launches': 0,
+            'launch_s': 0.0,
+            'relaunches': 0,
+            'pages': 0,
+            'contexts_created': 0,
+            'contexts_recycled': 0,
+            # Pages that crashed or raised; their context is discarded
+            'failures': 0,
+        }
+
+    def _pick_browser(self) -> Optional[_BrowserSlot]:
+        """Least busy browser, or None when another one should be launched"""
+        if self._browsers:
+            slot = min(self._browsers, key=lambda s: s.contexts)
+            if slot.contexts < self.contexts_per_browser or len(self._browsers) >= self.size:
+                return slot
+        return None
+
+    def _record_launch(self, browser: Any, launch_s: float) -> _BrowserSlot:
+        slot = _BrowserSlot(browser, launch_s)
+        self._browsers.append(slot)
+        self.counters['launches'] += 1
+        self.counters['launch_s'] += launch_s
+        return slot
+
+    def _drop_browser(self, slot: _BrowserSlot):
+        """Forget a disconnected browser and every idle context in it"""
+        self._browsers.remove(slot)
+        self._idle = [context for context in self._idle if context.browser_slot is not slot]
+        self.counters['relaunches'] += 1
+
+    def _keep_context(self, slot: _ContextSlot, healthy: bool) -> bool:
+        """Count a served page; True when the context may serve another one"""
+        slot.uses += 1
+        slot.browser_slot.pages += 1
+        self.counters['pages'] += 1
+        if not healthy:
+            self.counters['failures'] += 1
+        elif slot.uses >= self.context_max_uses:
+            self.counters['contexts_recycled'] += 1
+        else:
+            return slot.browser_slot in self._browsers
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Launch count and time, pages per browser and launch time saved"""
+        return {
+            'size': self.size,
+            'open_browsers': len(self._browsers),
+            'idle_contexts': len(self._idle),
+            **_pool_metrics(self.counters),
+            'browser_pages': [slot.pages for slot in self._browsers],
+        }
+
+
+def _pool_metrics(counters: Dict[str, Any]) -> Dict[str, Any]:
+    """Counters plus the metrics derived from them"""
+    launches, pages = counters['launches'], counters['pages']
+    avg_launch_s = counters['launch_s'] / launches if launches else 0.0
+    return {
+        **counters,
+        'avg_launch_s': avg_launch_s,
+        'pages_per_browser': pages / launches if launches else 0.0,
+        # One launch per page is what every page cost before the pool
+        'launch_s_saved': max(pages - launches, 0) * avg_launch_s,
+    }
+
+
+class BrowserPool(_BrowserPoolBase):
+    """Sync Playwright pool; use `with pool.page() as page:`"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._playwright = None
+        self._thread = threading.get_ident()
+
+    def _launch(self) -> _BrowserSlot:
+        if self._playwright is None:
+            from playwright.sync_api import sync_playwright
+            self._playwright = sync_playwright().start()
+        start = time.perf_counter()
+        browser = self._playwright.chromium.launch(headless=self.headless)
+        return self._record_launch(browser, time.perf_counter() - start)
+
+    def _checkout(self) -> _ContextSlot:
+        if threading.get_ident() != self._thread:
+            raise RuntimeError("A sync BrowserPool can only be used by the thread that created it")
+        for slot in list(self._browsers):
+            if not slot.browser.is_connected():
+                print(f"⚠️  Browser disconnected after {slot.pages} pages, relaunching")
+                self._drop_browser(slot)
+        if self._idle:
+            return self._idle.pop()
+        browser_slot = self._pick_browser() or self._launch()
+        browser_slot.contexts += 1
+        self.counters['contexts_created'] += 1
+        return _ContextSlot(browser_slot.browser.new_context(), browser_slot)
+
+    def _checkin(self, slot: _ContextSlot, healthy: bool):
+        if self._keep_context(slot, healthy):
+            self._idle.append(slot)
+            return
+        slot.browser_slot.contexts -= 1
+        try:
+            slot.context.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def page(self) -> Iterator[Any]:
+        """
+        A new page in a pooled context, closed on exit. The context is
+        recycled when the page crashed or the block raised.
+        """
+        slot = self._checkout()
+        crashed = []
+        try:
+            page = slot.context.new_page()
+        except Exception:
+            self._checkin(slot, False)
+            raise
+        page.on("crash", lambda _: crashed.append(True))
+        healthy = False
+        try:
+            yield page
+            healthy = True
+        finally:
+            try:
+                page.close()
+            except Exception:
+                healthy = False
+            self._checkin(slot, healthy and not crashed)
+
+    def close(self):
+        """Close every context and browser and stop Playwright"""
+        for slot in self._idle:
+            try:
+                slot.context.close()
+            except Exception:
+                pass
+        for slot in self._browsers:
+            try:
+                slot.browser.close()
+            except Exception:
+                pass
+        self._idle, self._browsers = [], []
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+
+class AsyncBrowserPool(_BrowserPoolBase):
+    """Async Playwright pool, same policy as BrowserPool; use `async with pool.page() as page:`"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._playwright = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self):
+        """Playwright's async driver belongs to one event loop; start afresh under a new one"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Browsers of a finished loop cannot be awaited any more, drop them
+            self._browsers, self._idle = [], []
+            self._playwright = None
+            self._lock = asyncio.Lock()
+            self._loop = loop
+
+    async def _launch(self) -> _BrowserSlot:
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+        start = time.perf_counter()
+        browser = await self._playwright.chromium.launch(headless=self.headless)
+        return self._record_launch(browser, time.perf_counter() - start)
+
+    async def _checkout(self) -> _ContextSlot:
+        self._bind_loop()
+        async with self._lock:
+            for slot in list(self._browsers):
+                if not slot.browser.is_connected():
+                    print(f"⚠️  Browser disconnected after {slot.pages} pages, relaunching")
+                    self._drop_browser(slot)
+            if self._idle:
+                return self._idle.pop()
+            browser_slot = self._pick_browser() or await self._launch()
+            browser_slot.contexts += 1
+            self.counters['contexts_created'] += 1
+        try:
+            context = await browser_slot.browser.new_context()
+        except Exception:
+            browser_slot.contexts -= 1
+            raise
+        return _ContextSlot(context, browser_slot)
+
+    async def _checkin(self, slot: _ContextSlot, healthy: bool):
+        if self._keep_context(slot, healthy):
+            self._idle.append(slot)
+            return
+        slot.browser_slot.contexts -= 1
+        try:
+            await slot.context.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """
+        A new page in a pooled context, closed on exit. The context is
+        recycled when the page crashed or the block raised.
+        """
+        slot = await self._checkout()
+        crashed = []
+        try:
+            page = await slot.context.new_page()
+        except Exception:
+            await self._checkin(slot, False)
+            raise
+        page.on("crash", lambda _: crashed.append(True))
+        healthy = False
+        try:
+            yield page
+            healthy = True
+        finally:
+            try:
+                await page.close()
+            except Exception:
+                healthy = False
+            await self._checkin(slot, healthy and not crashed)
+
+    async def close(self):
+        """Close every context and browser and stop Playwright"""
+        self._bind_loop()
+        async with self._lock:
+            for slot in self._idle:
+                try:
+                    await slot.context.close()
+                except Exception:
+                    pass
+            for slot in self._browsers:
+                try:
+                    await slot.browser.close()
+                except Exception:
+                    pass
+            self._idle, self._browsers = [], []
+            if self._playwright is not None:
+                try:
+                    await self._playwright.stop()
+                except Exception:
+                    pass
+                self._playwright = None
+
+
+async_browser_pool = AsyncBrowserPool()
+
+_local = threading.local()
+_pools: List[BrowserPool] = []
+_pools_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return this thread's browser pool"""
+    pool = getattr(_local, 'pool', None)
+    if pool is None:
+        pool = _local.pool = BrowserPool()
+        with _pools_lock:
+            _pools.append(pool)
+    return pool
+
+
+def browser_pool_stats() -> Dict[str, Any]:
+    """Metrics of every browser pool of the process (sync and async), summed"""
+    with _pools_lock:
+        pools = list(_pools) + [async_browser_pool]
+    totals: Dict[str, Any] = {}
+    for pool in pools:
+        for key, value in pool.counters.items():
+            totals[key] = totals.get(key, 0) + value
+    return _pool_metrics(totals)
+
+
+def close_browser_pool():
+    """Close the calling thread's browser pool (worker threads call this before they exit)"""
+    pool = getattr(_local, 'pool', None)
+    if pool is None:
+        return
+    # The pool stays in _pools, so its counters still count in browser_pool_stats()
+    _local.pool = None
+    pool.close()
+
+
+def shutdown_browser_pools():
+    """
+    Close the exiting thread's browser pool (registered to run at interpreter exit)
+
+    Sync Playwright objects are bound to the thread that created them, so
+    pools of other threads are skipped rather than closed from here; their
+    browsers exit with the Playwright driver when the process does.
+    """
+    try:
+        close_browser_pool()
+    except Exception as e:
+        print(f"⚠️  Error closing browser pool: {e}")
+
+
+atexit.register(shutdown_browser_pools)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+"""
+Near-duplicate detection for the company CSV, run before embedding
+
+Descriptions are normalized (lowercase, punctuation stripped, whitespace
+collapsed), cut into character 5-gram shingles and summarized by a
+128-permutation MinHash signature. Locality-sensitive hashing over 16 bands
+of 8 rows turns the signatures into candidate pairs, which are confirmed
+with the exact Jaccard similarity of their shingle sets.
+
+A confirmed pair is merged only when it is the same company: the same
+listing URL, or the same name with a near-identical description (a
+re-scraped or edited listing). Distinct companies pitching themselves in
+near-identical words ("AI Grading for Teachers") are kept and listed in the
+report, as are names shared by several companies. Very short descriptions
+("B2B", "N/A") are left out of the LSH so placeholder text does not turn
+into huge candidate buckets.
+
+Within a merged group the last row of the CSV wins, as it did when a later
+row overwrote an earlier point with the same ID.
+
+Ingest streams the CSV: duplicates are planned from two passes that keep
+only point IDs, names and signatures (plus the rows of candidate pairs),
+and the kept rows are then streamed by a third pass.
+"""
+import os
+import re
+import json
+import time
+import zlib
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator, Callable
+
+import numpy as np
+from dotenv import load_dotenv
+
+from lib.qdrant_client import company_point_id, company_point_key, iter_csv_rows
+
+load_dotenv()
+
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() not in ("0", "false", "no")
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.9"))
+DEDUP_MIN_TOKENS = int(os.getenv("DEDUP_MIN_TOKENS", "3"))
+DEDUP_REPORT_PATH = os.getenv(
+    "DEDUP_REPORT_PATH",
+    str(Path(__file__).parent.parent / "data" / "outputs" / "dedup_report.json")
+)
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+# Buckets larger than this are paired against their first row only
+LSH_MAX_BUCKET = 32
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def normalize_description(text: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace"""
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', text.lower())).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Character n-grams of a normalized text (the whole text if it is shorter)"""
+    return {text[i:i + size] for i in range(max(1, len(text) - size + 1))}
+
+
+def _permutations(num_perm: int = NUM_PERM, seed: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """Coefficients of the universal hashes (a * x + b) mod p standing in for permutations"""
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, 1 << 61, size=num_perm, dtype=np.uint64)
+    b = rng.randint(0, 1 << 61, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signatures(shingle_sets: List[set], num_perm: int = NUM_PERM, seed: int = 1) -> np.ndarray:
+    """(n, num_perm) uint32 MinHash signatures of the shingle sets"""
+    a, b = _permutations(num_perm, seed)
+    signatures = np.empty((len(shingle_sets), num_perm), dtype=np.uint32)
+    for i, shingle_set in enumerate(shingle_sets):
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingle_set), dtype=np.uint64, count=len(shingle_set))
+        # uint64 overflow wraps, which is fine for hashing
+        with np.errstate(over='ignore'):
+            permuted = ((np.outer(a, hashes) + b[:, None]) % _MERSENNE_PRIME) & _MAX_HASH
+        signatures[i] = permuted.min(axis=1)
+    return signatures
+
+
+def lsh_candidate_pairs(signatures: np.ndarray, bands: int = LSH_BANDS, max_bucket: int = LSH_MAX_BUCKET) -> set:
+    """
+    Pairs of row indexes whose signatures agree on at least one whole band
+
+    A bucket of more than `max_bucket` rows (boilerplate descriptions) only
+    pairs each row with the bucket's first one, so it costs linear rather
+    than quadratic work; confirmed pairs still merge the whole group.
+    """
+    rows = signatures.shape[1] // bands
+    pairs = set()
+    for band in range(bands):
+        buckets: Dict[bytes, List[int]] = {}
+        for i, key in enumerate(signatures[:, band * rows:(band + 1) * rows]):
+            buckets.setdefault(key.tobytes(), []).append(i)
+        for members in buckets.values():
+            if len(members) > max_bucket:
+                pairs.update((members[0], member) for member in members[1:])
+                continue
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pairs.add((members[x], members[y]))
+    return pairs
+
+
+class _SignatureIndex:
+    """MinHash signatures of the rows long enough to compare, computed chunk by chunk"""
+
+    def __init__(self, min_tokens: int = DEDUP_MIN_TOKENS, chunk_size: int = 1024):
+        self.min_tokens = min_tokens
+        self.chunk_size = chunk_size
+        self.rows: List[int] = []
+        self._chunks: List[np.ndarray] = []
+        self._pending: List[set] = []
+
+    def add(self, i: int, text: str):
+        normalized = normalize_description(text)
+        if len(normalized.split()) < self.min_tokens:
+            return
+        self.rows.append(i)
+        self._pending.append(shingles(normalized))
+        if len(self._pending) >= self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self._chunks.append(minhash_signatures(self._pending))
+            self._pending = []
+
+    def candidate_pairs(self) -> List[Tuple[int, int]]:
+        """LSH candidate pairs as (i, j) row indexes, i < j, sorted"""
+        self._flush()
+        if len(self.rows) < 2:
+            return []
+        pairs = lsh_candidate_pairs(np.concatenate(self._chunks))
+        return sorted((self.rows[x], self.rows[y]) for x, y in pairs)
+
+
+def _confirm_pairs(
+    pairs: List[Tuple[int, int]],
+    texts: Dict[int, str],
+    threshold: float
+) -> List[Tuple[int, int, float]]:
+    """Candidate pairs whose exact shingle Jaccard similarity reaches the threshold"""
+    shingle_sets = {i: shingles(normalize_description(text)) for i, text in texts.items()}
+    matches = []
+    for i, j in pairs:
+        jaccard = len(shingle_sets[i] & shingle_sets[j]) / len(shingle_sets[i] | shingle_sets[j])
+        if jaccard >= threshold:
+            matches.append((i, j, jaccard))
+    return matches
+
+
+def find_near_duplicates(
+    texts: List[str],
+    threshold: float = DEDUP_THRESHOLD,
+    min_tokens: int = DEDUP_MIN_TOKENS
+) -> List[Tuple[int, int, float]]:
+    """(i, j, jaccard) for every pair of texts at or above the threshold, i < j"""
+    index = _SignatureIndex(min_tokens)
+    for i, text in enumerate(texts):
+        index.add(i, text)
+    pairs = index.candidate_pairs()
+    involved = {i for pair in pairs for i in pair}
+    return _confirm_pairs(pairs, {i: texts[i] for i in involved}, threshold)
+
+
+def _company(row: Dict[str, str], point_id: int) -> Dict[str, Any]:
+    return {'id': point_id, 'name': row.get('name', ''), 'batch': row.get('batch', ''), 'url': row.get('url', '')}
+
+
+def plan_deduplication(
+    open_rows: Callable[[], Iterable[Dict[str, str]]],
+    threshold: float = DEDUP_THRESHOLD,
+    min_tokens: int = DEDUP_MIN_TOKENS
+) -> Tuple[set, Dict[str, Any]]:
+    """
+    Indexes of the rows that duplicate another row of the same company, and
+    the merge report
+
+    `open_rows` is called twice and must yield the same rows each time. The
+    first pass keeps only point IDs, names and MinHash signatures; the
+    second keeps the full rows of candidate pairs, so memory does not grow
+    with the size of the CSV.
+    """
+    # Pass 1: point IDs (same ID: the same listing, or a hash collision) and signatures
+    first_by_id: Dict[int, Tuple[int, str, str]] = {}
+    same_listing: List[Tuple[int, int]] = []
+    names: List[str] = []
+    index = _SignatureIndex(min_tokens)
+    for i, row in enumerate(open_rows()):
+        point_id, key = company_point_id(row), company_point_key(row)
+        if point_id in first_by_id:
+            j, first_key, first_name = first_by_id[point_id]
+            if key != first_key:
+                raise ValueError(f"Point ID collision between '{first_name}' and '{row['name']}'")
+            same_listing.append((j, i))
+        else:
+            first_by_id[point_id] = (i, key, row.get('name', ''))
+        names.append(row.get('name', ''))
+        index.add(i, row.get('description', ''))
+    del first_by_id
+
+    pairs = index.candidate_pairs()
+
+    # Pass 2: the rows of candidate pairs and same-listing duplicates
+    involved = {i for pair in pairs + same_listing for i in pair}
+    rows = {i: row for i, row in enumerate(open_rows()) if i in involved}
+    ids = {i: company_point_id(row) for i, row in rows.items()}
+
+    # Union-find over rows; the root of a group is its last row
+    parent: Dict[int, int] = {}
+
+    def find(i: int) -> int:
+        while parent.get(i, i) != i:
+            parent[i] = parent.get(parent[i], parent[i])
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[min(root_i, root_j)] = max(root_i, root_j)
+
+    # Why each row joined its group: (reason, similarity)
+    reasons: Dict[int, Tuple[str, float]] = {}
+
+    def merge(i: int, j: int, reason: str, similarity: float):
+        union(i, j)
+        for row in (i, j):
+            reasons.setdefault(row, (reason, similarity))
+
+    for j, i in same_listing:
+        merge(j, i, 'same_listing', 1.0)
+
+    similar = []
+    for i, j, jaccard in _confirm_pairs(pairs, {i: rows[i].get('description', '') for i in rows}, threshold):
+        if find(i) == find(j):
+            continue
+        if normalize_description(rows[i].get('name', '')) == normalize_description(rows[j].get('name', '')):
+            merge(i, j, 'same_name_similar_description', jaccard)
+        else:
+            similar.append({
+                'companies': [_company(rows[i], ids[i]), _company(rows[j], ids[j])],
+                'similarity': round(jaccard, 4),
+            })
+
+    dropped = {i for i in sorted(rows) if find(i) != i}
+    merged = [
+        {
+            'kept': _company(rows[find(i)], ids[find(i)]),
+            'dropped': _company(rows[i], ids[i]),
+            'reason': reasons[i][0],
+            'similarity': round(reasons[i][1], 4),
+        }
+        for i in sorted(dropped)
+    ]
+
+    name_counts: Dict[str, int] = {}
+    for i, name in enumerate(names):
+        if i not in dropped:
+            name_counts[name] = name_counts.get(name, 0) + 1
+
+    report = {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'threshold': threshold,
+        'min_tokens': min_tokens,
+        'rows': len(names),
+        'kept': len(names) - len(dropped),
+        'merged': merged,
+        'similar_descriptions': similar,
+        'shared_names': sorted(name for name, count in name_counts.items() if count > 1),
+    }
+    return dropped, report
+
+
+def deduplicate_rows(
+    rows: List[Dict[str, str]],
+    threshold: float = DEDUP_THRESHOLD,
+    min_tokens: int = DEDUP_MIN_TOKENS
+) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+    """
+    Drop rows that duplicate another row of the same company
+
+    Returns the kept rows (CSV order) and a report of what was merged, which
+    distinct companies have near-identical descriptions, and which names
+    are shared by several companies.
+    """
+    dropped, report = plan_deduplication(lambda: rows, threshold, min_tokens)
+    return [row for i, row in enumerate(rows) if i not in dropped], report
+
+
+def load_deduplicated_rows(csv_path: str, report_path: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """
+    Stream the company rows of the CSV with duplicates merged (all rows if
+    DEDUP_ENABLED is off), writing the merge report to `report_path` when given
+
+    Duplicates are found up front (two passes over the CSV, see
+    plan_deduplication); the rows themselves are streamed by a final pass.
+    """
+    if not DEDUP_ENABLED:
+        return iter_csv_rows(csv_path)
+
+    start_time = time.time()
+    dropped, report = plan_deduplication(lambda: iter_csv_rows(csv_path))
+    print(f"🔎 Deduplicated {report['rows']} rows in {time.time() - start_time:.2f} seconds: "
+          f"{len(report['merged'])} merged, {len(report['similar_descriptions'])} near-identical descriptions "
+          f"across distinct companies kept, {len(report['shared_names'])} names shared by several companies")
+    if report_path:
+        path = Path(report_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"   Merge report: {path}")
+    return (row for i, row in enumerate(iter_csv_rows(csv_path)) if i not in dropped)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+"""
+Persistent on-disk embedding cache
+
+Vectors live in a memory-mapped NumPy matrix, with a parallel array of
+64-bit keys hashed from (model name, normalized text) and an access clock
+used for least-recently-used eviction once the cache is full. The hash
+index is rebuilt from the key array when the cache is opened, so there is
+no separate index file to keep in sync.
+
+Several processes may share the cache (a setup or sync run while the search
+service keeps serving). Writes take an exclusive lock on a lock file, and a
+writer that finds the write counter changed by another process rebuilds its
+slot index from the shared key array first, so two writers never pick the
+same slot. Reads take no lock: they check the slot's key before and after
+copying its vector, so a concurrent eviction causes a miss, never another
+text's vector.
+"""
+import os
+import re
+import json
+import atexit
+import hashlib
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, keep to one writing process
+    fcntl = None
+
+load_dotenv()
+
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE", "true").lower() not in ("0", "false", "no")
+EMBEDDING_CACHE_DIR = os.getenv(
+    "EMBEDDING_CACHE_DIR",
+    str(Path(__file__).parent.parent / "data" / "cache" / "embeddings")
+)
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "50000"))
+
+_EMPTY_KEY = 0
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different copies of a text share an entry"""
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def cache_key(model_name: str, text: str) -> int:
+    """64-bit key for (model, normalized text); 0 is reserved for empty slots"""
+    digest = hashlib.blake2b(f"{model_name}\0{normalize_text(text)}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+class EmbeddingCache:
+    """Size-bounded, memory-mapped cache of embedding vectors for one model"""
+
+    def __init__(self, model_name: str, dim: int, capacity: int = EMBEDDING_CACHE_SIZE, cache_dir: str = EMBEDDING_CACHE_DIR):
+        self.model_name = model_name
+        self.dim = dim
+        self.capacity = capacity
+        self.path = Path(cache_dir) / re.sub(r'[^a-zA-Z0-9_.-]+', '_', model_name)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        with self._file_lock():
+            self._open()
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock shared with the other processes using this cache directory"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.path / "write.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _open(self):
+        """Open (or create) the memory-mapped arrays and rebuild the key index"""
+        meta_path = self.path / "meta.json"
+        meta = {'model_name': self.model_name, 'dim': self.dim, 'capacity': self.capacity}
+        if meta_path.exists():
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored != meta:
+                print(f"Embedding cache layout changed ({stored} -> {meta}), resetting {self.path}")
+                for name in ("vectors.npy", "keys.npy", "last_used.npy", "writes.npy"):
+                    (self.path / name).unlink(missing_ok=True)
+
+        def open_array(name: str, shape, dtype):
+            file_path = self.path / name
+            mode = 'r+' if file_path.exists() else 'w+'
+            return np.lib.format.open_memmap(file_path, mode=mode, dtype=dtype, shape=shape)
+
+        self.vectors = open_array("vectors.npy", (self.capacity, self.dim), np.float32)
+        self.keys = open_array("keys.npy", (self.capacity,), np.uint64)
+        self.last_used = open_array("last_used.npy", (self.capacity,), np.uint64)
+        # Bumped by every write, so other processes know their slot index is stale
+        self.writes = open_array("writes.npy", (1,), np.uint64)
+
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild the slot index and free list from the shared key array"""
+        occupied = np.flatnonzero(self.keys != _EMPTY_KEY)
+        self.index: Dict[int, int] = {int(self.keys[slot]): int(slot) for slot in occupied}
+        self.free_slots: List[int] = np.flatnonzero(self.keys == _EMPTY_KEY)[::-1].tolist()
+        self.clock = int(self.last_used.max()) if len(self.index) else 0
+        self.seen_writes = int(self.writes[0])
+
+    @contextmanager
+    def _writing(self):
+        """Thread and file lock around a write, with the index brought up to date first"""
+        with self._lock, self._file_lock():
+            if int(self.writes[0]) != self.seen_writes:
+                self._load_index()
+            yield
+            self.writes[0] += 1
+            self.seen_writes = int(self.writes[0])
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Look up vectors for texts, returning None for misses"""
+        results: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for text in texts:
+                key = cache_key(self.model_name, text)
+                slot = self.index.get(key)
+                vector = None
+                if slot is not None and int(self.keys[slot]) == key:
+                    vector = np.array(self.vectors[slot])
+                    # Evicted and reused by another process while copying: a miss
+                    if int(self.keys[slot]) != key:
+                        vector = None
+                if vector is not None:
+                    self.clock += 1
+                    self.last_used[slot] = self.clock
+                    results.append(vector)
+                    self.hits += 1
+                else:
+                    if slot is not None:
+                        # Slot was reused by another writer since the index was built
+                        del self.index[key]
+                    results.append(None)
+                    self.misses += 1
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[np.ndarray]):
+        """Store vectors, evicting the least recently used entries when full"""
+        with self._writing():
+            new_items = {}
+            for text, vector in zip(texts, vectors):
+                key = cache_key(self.model_name, text)
+                if key not in self.index:
+                    new_items[key] = vector
+            if not new_items:
+                return
+
+            shortfall = len(new_items) - len(self.free_slots)
+            if shortfall > 0:
+                self._evict(min(shortfall, self.capacity))
+
+            for key, vector in new_items.items():
+                if not self.free_slots:
+                    break
+                slot = self.free_slots.pop()
+                self.clock += 1
+                # Write the vector before the key so readers never see a key without its vector
+                self.vectors[slot] = vector
+                self.keys[slot] = key
+                self.last_used[slot] = self.clock
+                self.index[key] = slot
+
+    def _evict(self, count: int):
+        """Free the `count` least recently used slots"""
+        occupied = np.flatnonzero(self.keys != _EMPTY_KEY)
+        if len(occupied) == 0:
+            return
+        count = min(count, len(occupied))
+        oldest = occupied[np.argpartition(self.last_used[occupied], count - 1)[:count]]
+        for slot in oldest.tolist():
+            self.index.pop(int(self.keys[slot]), None)
+            self.keys[slot] = _EMPTY_KEY
+            self.last_used[slot] = 0
+            self.free_slots.append(slot)
+        self.evictions += count
+
+    def flush(self):
+        """Persist pending writes to disk"""
+        with self._lock:
+            self.vectors.flush()
+            self.keys.flush()
+            self.last_used.flush()
+            self.writes.flush()
+
+    def clear(self):
+        """Drop every entry"""
+        with self._writing():
+            self.keys[:] = _EMPTY_KEY
+            self.last_used[:] = 0
+            self.index.clear()
+            self.free_slots = list(range(self.capacity - 1, -1, -1))
+            self.clock = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and occupancy"""
+        lookups = self.hits + self.misses
+        return {
+            'model_name': self.model_name,
+            'entries': len(self.index),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+        }
+
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name: str, dim: int) -> Optional[EmbeddingCache]:
+    """Return the process-wide cache for a model, or None when caching is disabled"""
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    with _caches_lock:
+        if model_name not in _caches:
+            _caches[model_name] = EmbeddingCache(model_name, dim)
+        return _caches[model_name]
+
+
+@atexit.register
+def _flush_caches():
+    for cache in _caches.values():
+        cache.flush()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+"""
+Multi-process embedding engine for corpus ingest
+
+Threads sharing one TextEmbedding instance contend on ONNX inference and on
+the GIL for the surrounding Python code, so adding threads barely helps.
+The engine instead runs N worker processes, each with its own model and a
+fixed intra-op thread count. Results are written as float32 straight into a
+shared-memory block allocated by the caller, so nothing is pickled on the
+way back except a completion message.
+
+The engine exposes the same `embed(texts)` call as TextEmbedding, so it can
+be passed anywhere an embedding model is accepted (embed_texts, the ingest
+pipeline).
+"""
+import os
+import itertools
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from lib.qdrant_client import EMBEDDING_MODEL, VECTOR_SIZE
+
+EMBED_PROCESSES = int(os.getenv("EMBED_PROCESSES", "0"))
+EMBED_THREADS_PER_PROCESS = int(os.getenv("EMBED_THREADS_PER_PROCESS", "1"))
+
+
+def _worker_main(model_name: str, threads: int, dim: int, tasks, results):
+    """Worker process: load a model, embed text batches into shared memory"""
+    from lib.embedding_profiles import load_text_embedding
+
+    try:
+        model = load_text_embedding(model_name, threads=threads)
+    except Exception as e:
+        results.put(('failed', os.getpid(), repr(e)))
+        return
+    results.put(('ready', os.getpid(), None))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        job_id, shm_name, total_rows, row_offset, texts = task
+        try:
+            shm = shared_memory.SharedMemory(name=shm_name)
+            try:
+                output = np.ndarray((total_rows, dim), dtype=np.float32, buffer=shm.buf)
+                for i, embedding in enumerate(model.embed(texts, batch_size=len(texts))):
+                    output[row_offset + i] = embedding
+                del output
+            finally:
+                shm.close()
+            results.put((job_id, len(texts), None))
+        except Exception as e:
+            results.put((job_id, 0, repr(e)))
+
+
+class _Job:
+    """Book-keeping for one embed() call spread across workers"""
+
+    def __init__(self, parts: int):
+        self.remaining = parts
+        self.error: Optional[str] = None
+        self.done = threading.Event()
+
+
+class EmbeddingEngine:
+    """Pool of embedding worker processes returning float32 arrays via shared memory"""
+
+    def __init__(
+        self,
+        num_workers: int = max(EMBED_PROCESSES, 1),
+        threads_per_worker: int = EMBED_THREADS_PER_PROCESS,
+        model_name: str = EMBEDDING_MODEL,
+        dim: int = VECTOR_SIZE,
+        batch_size: int = 64
+    ):
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker
+        self.model_name = model_name
+        self.dim = dim
+        self.batch_size = batch_size
+
+        # spawn: a forked child would inherit the parent's ONNX/thread state
+        ctx = mp.get_context("spawn")
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        self._workers = [
+            ctx.Process(
+                target=_worker_main,
+                args=(model_name, threads_per_worker, dim, self._tasks, self._results),
+                daemon=True
+            )
+            for _ in range(num_workers)
+        ]
+        self._jobs: Dict[int, _Job] = {}
+        self._jobs_lock = threading.Lock()
+        self._job_ids = itertools.count()
+        self._listener: Optional[threading.Thread] = None
+        self._started = False
+
+    def start(self):
+        """Start the workers and wait until every model is loaded"""
+        if self._started:
+            return self
+        for worker in self._workers:
+            worker.start()
+        for _ in self._workers:
+            message = self._results.get()
+            if message[0] != 'ready':
+                self._started = True
+                self.close()
+                raise RuntimeError(f"Embedding worker {message[1]} failed to load the model: {message[2]}")
+        self._listener = threading.Thread(target=self._listen, name="embedding-engine-results", daemon=True)
+        self._listener.start()
+        self._started = True
+        print(f"Embedding engine ready: {self.num_workers} processes x {self.threads_per_worker} threads")
+        return self
+
+    def _listen(self):
+        """Route completion messages from the workers to the waiting embed() calls"""
+        while True:
+            message = self._results.get()
+            if message is None:
+                break
+            job_id, _, error = message
+            with self._jobs_lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    continue
+                if error and not job.error:
+                    job.error = error
+                job.remaining -= 1
+                if job.remaining == 0:
+                    job.done.set()
+
+    def embed(self, texts: Sequence[str], **kwargs) -> np.ndarray:
+        """Embed texts across the worker processes as a (len(texts), dim) float32 array"""
+        if not self._started:
+            self.start()
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+
+        shm = shared_memory.SharedMemory(create=True, size=len(texts) * self.dim * 4)
+        try:
+            # Split so every worker gets work even for a single small call
+            part_size = max(1, min(self.batch_size, -(-len(texts) // self.num_workers)))
+            offsets = list(range(0, len(texts), part_size))
+
+            job_id = next(self._job_ids)
+            job = _Job(parts=len(offsets))
+            with self._jobs_lock:
+                self._jobs[job_id] = job
+            for offset in offsets:
+                self._tasks.put((job_id, shm.name, len(texts), offset, texts[offset:offset + part_size]))
+
+            while not job.done.wait(timeout=1.0):
+                if not all(worker.is_alive() for worker in self._workers):
+                    with self._jobs_lock:
+                        del self._jobs[job_id]
+                    raise RuntimeError("An embedding worker process exited unexpectedly")
+            with self._jobs_lock:
+                del self._jobs[job_id]
+            if job.error:
+                raise RuntimeError(f"Embedding worker failed: {job.error}")
+
+            # One memcpy out of the shared block before it is released
+            return np.ndarray((len(texts), self.dim), dtype=np.float32, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        """Stop the worker processes"""
+        if not self._started:
+            return
+        for _ in self._workers:
+            self._tasks.put(None)
+        for worker in self._workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+        self._results.put(None)
+        self._started = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
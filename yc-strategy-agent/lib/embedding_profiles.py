@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+"""
+Lighter embedding profiles: int8 model, PCA-reduced and float16 vectors
+
+A profile combines three independent savings:
+- `quantized`: an int8 (dynamically quantized) copy of the ONNX model, which
+  loads faster, takes about a quarter of the disk/RAM and embeds faster on
+  CPU at a small cost in vector fidelity
+- `dims`: a PCA projection fitted on the corpus vectors when the local
+  index is built, applied to corpus and query vectors alike
+- `dtype`: float16 storage of the local index vectors (scores are still
+  computed in float32)
+
+`dims` and `dtype` apply to the local search path (lib/local_index.py); the
+Qdrant collection keeps full-size vectors and uses collection profiles for
+quantization. Measured tradeoffs against the default come from
+scripts/benchmark_embedding_profiles.py.
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+from fastembed import TextEmbedding
+
+load_dotenv()
+
+EMBEDDING_PROFILES: Dict[str, Dict[str, Any]] = {
+    'default': {'quantized': False, 'dims': None, 'dtype': 'float32'},
+    'int8': {'quantized': True, 'dims': None, 'dtype': 'float32'},
+    'pca128': {'quantized': False, 'dims': 128, 'dtype': 'float32'},
+    'pca64': {'quantized': False, 'dims': 64, 'dtype': 'float32'},
+    'float16': {'quantized': False, 'dims': None, 'dtype': 'float16'},
+    # Everything at once: int8 model, 128 dims, float16 store
+    'lite': {'quantized': True, 'dims': 128, 'dtype': 'float16'},
+}
+EMBEDDING_PROFILE = os.getenv("EMBEDDING_PROFILE", "default")
+QUANTIZED_MODEL_DIR = os.getenv(
+    "QUANTIZED_MODEL_DIR",
+    str(Path(__file__).parent.parent / "data" / "models")
+)
+
+
+def get_embedding_profile(profile: Optional[str] = None) -> Dict[str, Any]:
+    """Settings of an embedding profile (EMBEDDING_PROFILE by default)"""
+    name = profile or EMBEDDING_PROFILE
+    if name not in EMBEDDING_PROFILES:
+        raise ValueError(f"Unknown embedding profile '{name}'. Available: {', '.join(EMBEDDING_PROFILES)}")
+    return EMBEDDING_PROFILES[name]
+
+
+def quantized_model_path(model_name: str) -> Path:
+    """Directory of the int8 copy of a model"""
+    return Path(QUANTIZED_MODEL_DIR) / f"{model_name.split('/')[-1].lower()}-int8"
+
+
+def model_cache_key(model_name: str, profile: Optional[str] = None) -> str:
+    """Embedding cache namespace: int8 vectors must not be served as float32 ones"""
+    return f"{model_name}:int8" if get_embedding_profile(profile)['quantized'] else model_name
+
+
+def model_source_dir(model_name: str) -> Path:
+    """
+    Directory of a fastembed model's ONNX graph and tokenizer files,
+    downloading the model into the fastembed cache first if needed
+    """
+    cache_dir = os.getenv("FASTEMBED_CACHE_PATH", os.path.join(tempfile.gettempdir(), "fastembed_cache"))
+    model = TextEmbedding(model_name=model_name, cache_dir=cache_dir)
+
+    # fastembed keeps Hugging Face sources in the hub cache layout
+    description = next(
+        (d for d in TextEmbedding.list_supported_models() if d['model'].lower() == model_name.lower()),
+        {}
+    )
+    hf_repo = description.get('sources', {}).get('hf')
+    if hf_repo:
+        try:
+            from huggingface_hub import snapshot_download
+            return Path(snapshot_download(repo_id=hf_repo, cache_dir=cache_dir, local_files_only=True))
+        except Exception:
+            pass
+
+    # Models fetched from another source: fall back on where fastembed loaded it from
+    model_dir = getattr(getattr(model, 'model', None), '_model_dir', None)
+    if model_dir is None:
+        raise ValueError(
+            f"Could not find the files of '{model_name}' in the fastembed cache ({cache_dir}). "
+            f"Download it with TextEmbedding(model_name='{model_name}') and set FASTEMBED_CACHE_PATH."
+        )
+    return Path(model_dir)
+
+
+def quantize_model(model_name: str, output_dir: Optional[str] = None) -> Path:
+    """
+    Write an int8 dynamically quantized copy of a fastembed model
+
+    The float model is downloaded through fastembed as usual; its tokenizer
+    and config files are copied next to the quantized ONNX graph, so the
+    copy loads with TextEmbedding(specific_model_path=...). Needs the `onnx`
+    package.
+    """
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as e:
+        raise ValueError(f"Quantizing needs the 'onnx' package (pip install onnx): {e}")
+
+    source = model_source_dir(model_name)
+    output = Path(output_dir) if output_dir else quantized_model_path(model_name)
+    output.mkdir(parents=True, exist_ok=True)
+    for path in source.rglob('*'):
+        if path.is_dir():
+            continue
+        target = output / path.relative_to(source)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == '.onnx':
+            quantize_dynamic(model_input=str(path), model_output=str(target), weight_type=QuantType.QInt8)
+        else:
+            shutil.copyfile(path, target)
+    return output
+
+
+def load_text_embedding(model_name: str, profile: Optional[str] = None, **kwargs) -> TextEmbedding:
+    """Load the embedding model of a profile (the int8 copy for quantized profiles)"""
+    if not get_embedding_profile(profile)['quantized']:
+        return TextEmbedding(model_name=model_name, **kwargs)
+    path = quantized_model_path(model_name)
+    if not path.exists():
+        raise ValueError(f"No int8 model at '{path}'. Run scripts/quantize_embedding_model.py first.")
+    return TextEmbedding(model_name=model_name, specific_model_path=str(path), **kwargs)
+
+
+class PcaProjection:
+    """Linear projection onto the top principal components of a set of vectors"""
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)
+
+    @property
+    def dims(self) -> int:
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(cls, vectors: np.ndarray, dims: int) -> "PcaProjection":
+        """Fit on (n, d) vectors, keeping `dims` components"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if dims > min(vectors.shape):
+            raise ValueError(f"Cannot keep {dims} components of {vectors.shape[0]} vectors of size {vectors.shape[1]}")
+        mean = vectors.mean(axis=0)
+        _, _, vt = np.linalg.svd(vectors - mean, full_matrices=False)
+        return cls(mean, vt[:dims])
+
+    def transform(self, vectors: np.ndarray) -> np.ndarray:
+        """Project (n, d) vectors to (n, dims)"""
+        return (np.asarray(vectors, dtype=np.float32) - self.mean) @ self.components.T
+
+    def save(self, path: str):
+        np.savez(path, mean=self.mean, components=self.components)
+
+    @classmethod
+    def load(cls, path: str) -> "PcaProjection":
+        with np.load(path) as arrays:
+            return cls(arrays['mean'], arrays['components'])
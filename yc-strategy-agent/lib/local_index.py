@@ -0,0 +1,341 @@
+#!/usr/bin/env python
+"""
+In-process exact vector search over the YC companies corpus
+
+The whole corpus is a few thousand 384-dim vectors, small enough to keep in
+a memory-mapped, L2-normalized float32 matrix and search exactly with one
+matrix-vector product plus argpartition. Lighter embedding profiles store a
+PCA projection fitted at build time and/or float16 vectors instead (see
+lib/embedding_profiles.py). Payloads are stored column by
+column (one UTF-8 blob + offsets array per field) so a hit only decodes the
+fields of the rows it returns.
+
+Used as the `local` search backend (SEARCH_BACKEND=local) for offline runs,
+and as an exact-recall baseline for the Qdrant results.
+"""
+import os
+import json
+import time
+import shutil
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+
+import numpy as np
+from dotenv import load_dotenv
+
+from lib.qdrant_client import (
+    COLLECTION_NAME,
+    EMBEDDING_MODEL,
+    VECTOR_NAME,
+    VECTOR_SIZE,
+    PAYLOAD_FIELDS,
+    build_company_payload,
+    build_search_filter,
+    parse_batch_year,
+    embed_texts,
+    company_point_id,
+)
+from lib.dedup import load_deduplicated_rows
+from lib.query_cache import bump_index_generation, read_index_generation
+from lib.embedding_profiles import EMBEDDING_PROFILE, PcaProjection, get_embedding_profile, model_cache_key
+
+load_dotenv()
+
+LOCAL_INDEX_DIR = os.getenv(
+    "LOCAL_INDEX_DIR",
+    str(Path(__file__).parent.parent / "data" / "local_index")
+)
+
+# Rows of a float16 index upcast per score block, bounding the float32 copy
+_FLOAT16_BLOCK_ROWS = 8192
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row so a dot product is the cosine similarity"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indexes of the k highest scores (last axis), sorted by descending score"""
+    k = min(k, scores.shape[-1])
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=-1), axis=-1)
+    return np.take_along_axis(candidates, order, axis=-1)
+
+
+def write_local_index(
+    ids: np.ndarray,
+    vectors: np.ndarray,
+    payloads: List[Dict[str, Any]],
+    index_dir: str = LOCAL_INDEX_DIR,
+    source: str = "",
+    profile: Optional[str] = None
+):
+    """
+    Write normalized vectors, IDs and columnar payloads to index_dir
+
+    `profile` (EMBEDDING_PROFILE by default) may fit a PCA projection on the
+    vectors and store them as float16. Which model produced the vectors is
+    up to the caller.
+    """
+    target = Path(index_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    # Build aside and rename file by file (meta.json last) so open memory maps never see a truncated file
+    path = target.with_name(target.name + ".tmp")
+    shutil.rmtree(path, ignore_errors=True)
+    path.mkdir(parents=True)
+    settings = get_embedding_profile(profile)
+
+    vectors = normalize_rows(vectors)
+    if settings['dims']:
+        projection = PcaProjection.fit(vectors, settings['dims'])
+        projection.save(path / "projection.npz")
+        vectors = normalize_rows(projection.transform(vectors))
+    np.save(path / "vectors.npy", vectors.astype(settings['dtype']))
+    np.save(path / "ids.npy", np.asarray(ids, dtype=np.int64))
+    # 0 = unknown year; kept numeric so year-range filters are a vectorized comparison
+    np.save(path / "batch_year.npy", np.array(
+        [parse_batch_year(str(payload.get('batch', '') or '')) or 0 for payload in payloads],
+        dtype=np.int32
+    ))
+
+    for field in PAYLOAD_FIELDS:
+        encoded = [str(payload.get(field, '') or '').encode('utf-8') for payload in payloads]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(value) for value in encoded])
+        np.save(path / f"{field}.offsets.npy", offsets)
+        with open(path / f"{field}.bin", 'wb') as f:
+            f.write(b''.join(encoded))
+
+    meta = {
+        'embedding_model': EMBEDDING_MODEL,
+        # Model plus embedding profile (int8 vectors differ from float32 ones)
+        'embedding_key': model_cache_key(EMBEDDING_MODEL),
+        'vector_name': VECTOR_NAME,
+        'vector_size': int(VECTOR_SIZE),
+        'storage_profile': profile or EMBEDDING_PROFILE,
+        'dims': settings['dims'] or int(VECTOR_SIZE),
+        'dtype': settings['dtype'],
+        'count': len(payloads),
+        'fields': PAYLOAD_FIELDS,
+        'source': source,
+        'built_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    with open(path / "meta.json", 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    (target / "projection.npz").unlink(missing_ok=True)
+    for file in sorted(path.iterdir(), key=lambda file: file.name == "meta.json"):
+        os.replace(file, target / file.name)
+    path.rmdir()
+    bump_index_generation()
+
+
+def build_local_index_from_csv(
+    csv_path: str,
+    index_dir: str = LOCAL_INDEX_DIR,
+    chunk_size: int = 256,
+    profile: Optional[str] = None
+) -> int:
+    """Embed the CSV (through the embedding cache) and write a local index"""
+    # Same rows and point IDs as the Qdrant upload
+    rows = list(load_deduplicated_rows(csv_path))
+
+    vectors = np.empty((len(rows), VECTOR_SIZE), dtype=np.float32)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        vectors[start:start + len(chunk)] = embed_texts([row['description'].strip() for row in chunk])
+
+    write_local_index(
+        ids=np.array([company_point_id(row) for row in rows], dtype=np.int64),
+        vectors=vectors,
+        payloads=[build_company_payload(row) for row in rows],
+        index_dir=index_dir,
+        source=f"csv:{csv_path}",
+        profile=profile
+    )
+    return len(rows)
+
+
+def build_local_index_from_collection(
+    client,
+    collection_name: str = COLLECTION_NAME,
+    index_dir: str = LOCAL_INDEX_DIR,
+    profile: Optional[str] = None
+) -> int:
+    """Mirror an existing Qdrant collection (vectors + payloads) into a local index"""
+    ids, vectors, payloads = [], [], []
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=collection_name,
+            limit=1000,
+            offset=offset,
+            with_payload=PAYLOAD_FIELDS,
+            with_vectors=[VECTOR_NAME]
+        )
+        for record in records:
+            ids.append(record.id)
+            vectors.append(record.vector[VECTOR_NAME])
+            payloads.append(record.payload or {})
+        if offset is None:
+            break
+
+    write_local_index(
+        ids=np.array(ids, dtype=np.int64),
+        vectors=np.array(vectors, dtype=np.float32).reshape(-1, VECTOR_SIZE),
+        payloads=payloads,
+        index_dir=index_dir,
+        source=f"qdrant:{collection_name}",
+        profile=profile
+    )
+    return len(ids)
+
+
+class LocalIndex:
+    """Read-only, memory-mapped exact search index"""
+
+    def __init__(self, index_dir: str = LOCAL_INDEX_DIR):
+        path = Path(index_dir)
+        meta_path = path / "meta.json"
+        if not meta_path.exists():
+            raise ValueError(f"Local index not found in '{index_dir}'. Run scripts/build_local_index.py first.")
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta['embedding_model'] != EMBEDDING_MODEL:
+            raise ValueError(
+                f"Local index was built with '{self.meta['embedding_model']}' "
+                f"but EMBEDDING_MODEL is '{EMBEDDING_MODEL}'. Rebuild the index."
+            )
+        if self.meta.get('embedding_key') != model_cache_key(EMBEDDING_MODEL):
+            raise ValueError(
+                f"Local index holds '{self.meta.get('embedding_key')}' vectors "
+                f"but EMBEDDING_PROFILE gives '{model_cache_key(EMBEDDING_MODEL)}'. Rebuild the index."
+            )
+
+        self.vectors = np.load(path / "vectors.npy", mmap_mode='r')
+        projection_path = path / "projection.npz"
+        self.projection = PcaProjection.load(projection_path) if projection_path.exists() else None
+        self.ids = np.load(path / "ids.npy", mmap_mode='r')
+        self.row_by_id = {int(point_id): row for row, point_id in enumerate(self.ids)}
+        self.columns: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for field in self.meta['fields']:
+            offsets = np.load(path / f"{field}.offsets.npy", mmap_mode='r')
+            blob_path = path / f"{field}.bin"
+            blob = np.memmap(blob_path, dtype=np.uint8, mode='r') if blob_path.stat().st_size else np.empty(0, dtype=np.uint8)
+            self.columns[field] = (offsets, blob)
+        self.batch_year = np.load(path / "batch_year.npy", mmap_mode='r')
+        self._decoded_columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def value(self, field: str, row: int) -> str:
+        """Decode one payload field of one row"""
+        offsets, blob = self.columns[field]
+        return bytes(blob[offsets[row]:offsets[row + 1]]).decode('utf-8')
+
+    def payload(self, row: int) -> Dict[str, str]:
+        """Decode the full payload of one row"""
+        return {field: self.value(field, row) for field in self.columns}
+
+    def column_values(self, field: str) -> np.ndarray:
+        """Every value of a payload field, decoded once and kept for filtering"""
+        if field not in self._decoded_columns:
+            self._decoded_columns[field] = np.array([self.value(field, row) for row in range(len(self))], dtype=object)
+        return self._decoded_columns[field]
+
+    def filter_mask(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Boolean row mask for search filters (same keys as build_search_filter)"""
+        if build_search_filter(filters) is None:
+            return None
+        mask = np.ones(len(self), dtype=bool)
+        for key, field in (('industries', 'main_industry'), ('sub_industries', 'sub_industry'), ('batches', 'batch')):
+            if filters.get(key):
+                mask &= np.isin(self.column_values(field), list(filters[key]))
+        if filters.get('min_batch_year') is not None:
+            mask &= self.batch_year >= filters['min_batch_year']
+        if filters.get('max_batch_year') is not None:
+            mask &= (self.batch_year <= filters['max_batch_year']) & (self.batch_year > 0)
+        return mask
+
+    def search_rows(self, query_vectors: np.ndarray, limit: int, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact top-k for one or more query vectors
+
+        Returns (rows, scores) shaped (n_queries, k). Rows excluded by the
+        optional boolean mask are never returned.
+        """
+        scores = self.scores(query_vectors)
+        if mask is not None:
+            scores = np.where(mask[np.newaxis, :], scores, -np.inf)
+            limit = min(limit, int(mask.sum()))
+        rows = top_k(scores, limit)
+        return rows, np.take_along_axis(scores, rows, axis=-1)
+
+    def project(self, query_vectors: np.ndarray) -> np.ndarray:
+        """Normalized query vectors in the index's space (PCA-projected if it has one)"""
+        queries = normalize_rows(np.atleast_2d(query_vectors))
+        if self.projection is not None:
+            queries = normalize_rows(self.projection.transform(queries))
+        return queries
+
+    def scores(self, query_vectors: np.ndarray) -> np.ndarray:
+        """Cosine similarity of each query to every row, (n_queries, n_rows) float32"""
+        queries = self.project(query_vectors)
+        if self.vectors.dtype == np.float32:
+            return queries @ self.vectors.T
+        # NumPy has no fast float16 matmul: upcast one block of rows at a time
+        scores = np.empty((len(queries), len(self)), dtype=np.float32)
+        for start in range(0, len(self), _FLOAT16_BLOCK_ROWS):
+            block = np.asarray(self.vectors[start:start + _FLOAT16_BLOCK_ROWS], dtype=np.float32)
+            scores[:, start:start + len(block)] = queries @ block.T
+        return scores
+
+    def search(self, query_vector: np.ndarray, limit: int = 3, mask: Optional[np.ndarray] = None) -> List[Tuple[int, Dict[str, str], float]]:
+        """Exact top-k for a single query as (point_id, payload, score) tuples"""
+        rows, scores = self.search_rows(query_vector, limit, mask)
+        return [
+            (int(self.ids[row]), self.payload(int(row)), float(score))
+            for row, score in zip(rows[0], scores[0])
+        ]
+
+
+_local_index: Optional[LocalIndex] = None
+_local_index_version: Optional[Tuple[Optional[int], Optional[int]]] = None
+_local_index_lock = threading.Lock()
+
+
+def _index_version(index_dir: str) -> Tuple[Optional[int], Optional[int]]:
+    """meta.json mtime and index generation: either changes when the index is rebuilt"""
+    try:
+        meta_mtime = os.stat(Path(index_dir) / "meta.json").st_mtime_ns
+    except OSError:
+        meta_mtime = None
+    return meta_mtime, read_index_generation()
+
+
+def get_local_index() -> LocalIndex:
+    """Return the process-wide local index, reopening it after a rebuild"""
+    global _local_index, _local_index_version
+    version = _index_version(LOCAL_INDEX_DIR)
+    with _local_index_lock:
+        if _local_index is None or version != _local_index_version:
+            _local_index = LocalIndex()
+            _local_index_version = version
+        return _local_index
+
+
+def recall_at_k(expected: Iterable[List[int]], actual: Iterable[List[int]]) -> float:
+    """Mean fraction of the expected IDs found in the actual results, per query"""
+    ratios = []
+    for expected_ids, actual_ids in zip(expected, actual):
+        if expected_ids:
+            ratios.append(len(set(expected_ids) & set(actual_ids)) / len(expected_ids))
+    return sum(ratios) / len(ratios) if ratios else 0.0
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+"""
+Precomputed company-to-company nearest neighbours
+
+An offline job scores every company against every other one in blocks of
+rows (one matrix product + argpartition per block) and keeps the top-k per
+company. Results are stored as fixed-width arrays next to the point IDs:
+
+    ids.npy              (n,)    int64   point IDs
+    vector_hash.npy      (n,)    S16     hash of each row's vector (change detection)
+    neighbor_ids.npy     (n, k)  int64   neighbour point IDs, best first
+    neighbor_scores.npy  (n, k)  float16 cosine similarities
+
+Lookups memory-map the arrays and find the row through an ID -> row dict,
+so "companies similar to X" costs no embedding and no Qdrant query.
+
+Rebuilds are incremental: only rows whose vector changed (or that are new)
+are scored against the whole corpus, rows whose neighbour list referenced a
+changed or removed company are recomputed, and every other row merges its
+existing list with its scores against the changed rows. Stored scores are
+float16, so near-ties at the k-th slot can differ from a full rebuild.
+"""
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+from lib.qdrant_client import COLLECTION_NAME, EMBEDDING_MODEL, VECTOR_NAME, VECTOR_SIZE
+from lib.local_index import normalize_rows, top_k
+from lib.embedding_profiles import model_cache_key
+
+load_dotenv()
+
+NEIGHBORS_DIR = os.getenv(
+    "NEIGHBORS_DIR",
+    str(Path(__file__).parent.parent / "data" / "neighbors")
+)
+NEIGHBORS_K = int(os.getenv("NEIGHBORS_K", "20"))
+
+
+def vector_hashes(vectors: np.ndarray) -> np.ndarray:
+    """16-byte digest of each row, used to detect changed vectors between builds"""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    return np.array(
+        [hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in vectors],
+        dtype='S16'
+    )
+
+
+def blocked_top_k(
+    query_vectors: np.ndarray,
+    vectors: np.ndarray,
+    k: int,
+    query_rows: Optional[np.ndarray] = None,
+    block_size: int = 1024
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k rows of `vectors` for each query vector, `block_size` queries at a time
+
+    `query_rows` gives each query's own row in `vectors` so a company is not
+    its own neighbour. Vectors must be L2-normalized. Returns (rows, scores)
+    shaped (n_queries, k).
+    """
+    k = min(k, max(len(vectors) - 1, 0))
+    rows = np.empty((len(query_vectors), k), dtype=np.int64)
+    scores = np.empty((len(query_vectors), k), dtype=np.float32)
+    for start in range(0, len(query_vectors), block_size):
+        block = query_vectors[start:start + block_size] @ vectors.T
+        if query_rows is not None:
+            block[np.arange(len(block)), query_rows[start:start + block_size]] = -np.inf
+        block_rows = top_k(block, k)
+        rows[start:start + len(block)] = block_rows
+        scores[start:start + len(block)] = np.take_along_axis(block, block_rows, axis=-1)
+    return rows, scores
+
+
+def build_neighbors(
+    ids: np.ndarray,
+    vectors: np.ndarray,
+    k: int = NEIGHBORS_K,
+    neighbors_dir: str = NEIGHBORS_DIR,
+    block_size: int = 1024,
+    full: bool = False,
+    source: str = ""
+) -> Dict[str, int]:
+    """
+    Compute (or incrementally update) the top-k neighbours of every point
+
+    Returns counts of rows that were fully recomputed, merged with changed
+    rows, or left as they were.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    vectors = normalize_rows(vectors)
+    hashes = vector_hashes(vectors)
+    n = len(ids)
+
+    previous = None
+    if not full:
+        try:
+            previous = NeighborIndex(neighbors_dir)
+            if previous.k != k or previous.neighbor_ids.shape[1] != min(k, max(n - 1, 0)):
+                previous = None
+        except ValueError:
+            previous = None
+
+    if previous is None:
+        recompute = np.ones(n, dtype=bool)
+        changed = np.ones(n, dtype=bool)
+    else:
+        old_rows = np.array([previous.row_by_id.get(int(point_id), -1) for point_id in ids], dtype=np.int64)
+        known = old_rows >= 0
+        changed = ~known
+        changed[known] = previous.hashes[old_rows[known]] != hashes[known]
+        # A row must be recomputed when its own vector changed or when its list
+        # points at a company that changed or left (its score or slot is stale)
+        stale_ids = set(ids[changed].tolist()) | (set(previous.row_by_id) - set(ids.tolist()))
+        recompute = changed.copy()
+        if stale_ids:
+            stale = np.isin(previous.neighbor_ids, np.fromiter(stale_ids, dtype=np.int64)).any(axis=1)
+            recompute[known] |= stale[old_rows[known]]
+
+    k_eff = min(k, max(n - 1, 0))
+    neighbor_ids = np.empty((n, k_eff), dtype=np.int64)
+    neighbor_scores = np.empty((n, k_eff), dtype=np.float32)
+    all_rows = np.arange(n)
+
+    recompute_rows = all_rows[recompute]
+    rows, scores = blocked_top_k(vectors[recompute_rows], vectors, k_eff, recompute_rows, block_size)
+    neighbor_ids[recompute_rows] = ids[rows]
+    neighbor_scores[recompute_rows] = scores
+
+    merge_rows = all_rows[~recompute]
+    changed_rows = all_rows[changed]
+    if len(merge_rows):
+        old = old_rows[merge_rows]
+        old_ids = np.asarray(previous.neighbor_ids[old])
+        old_scores = np.asarray(previous.neighbor_scores[old], dtype=np.float32)
+        if len(changed_rows):
+            # Scores of the untouched rows against the changed ones, merged into their lists
+            for start in range(0, len(merge_rows), block_size):
+                block_rows = merge_rows[start:start + block_size]
+                block = vectors[block_rows] @ vectors[changed_rows].T
+                candidate_ids = np.concatenate([old_ids[start:start + block_size], np.broadcast_to(ids[changed_rows], block.shape)], axis=1)
+                candidate_scores = np.concatenate([old_scores[start:start + block_size], block], axis=1)
+                best = top_k(candidate_scores, k_eff)
+                neighbor_ids[block_rows] = np.take_along_axis(candidate_ids, best, axis=1)
+                neighbor_scores[block_rows] = np.take_along_axis(candidate_scores, best, axis=1)
+        else:
+            neighbor_ids[merge_rows] = old_ids
+            neighbor_scores[merge_rows] = old_scores
+
+    path = Path(neighbors_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    arrays = {
+        'ids': ids,
+        'vector_hash': hashes,
+        'neighbor_ids': neighbor_ids,
+        'neighbor_scores': neighbor_scores.astype(np.float16),
+    }
+    # Write aside and rename so open memory maps (readers, `previous`) never see a truncated file
+    for name, array in arrays.items():
+        np.save(path / f"{name}.tmp.npy", array)
+        os.replace(path / f"{name}.tmp.npy", path / f"{name}.npy")
+
+    stats = {
+        'points': n,
+        'recomputed': int(recompute.sum()),
+        'merged': int(len(merge_rows)) if len(changed_rows) else 0,
+        'unchanged': 0 if len(changed_rows) else int(len(merge_rows)),
+    }
+    meta = {
+        'embedding_model': EMBEDDING_MODEL,
+        'embedding_key': model_cache_key(EMBEDDING_MODEL),
+        'k': k,
+        'count': n,
+        'source': source,
+        'built_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'last_build': stats,
+    }
+    with open(path / "meta.json", 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return stats
+
+
+def fetch_collection_vectors(client, collection_name: str = COLLECTION_NAME) -> Tuple[np.ndarray, np.ndarray]:
+    """Point IDs and dense vectors of every point in a collection"""
+    ids, vectors = [], []
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=collection_name,
+            limit=1000,
+            offset=offset,
+            with_payload=False,
+            with_vectors=[VECTOR_NAME]
+        )
+        for record in records:
+            ids.append(record.id)
+            vectors.append(record.vector[VECTOR_NAME])
+        if offset is None:
+            break
+    return np.array(ids, dtype=np.int64), np.array(vectors, dtype=np.float32).reshape(-1, VECTOR_SIZE)
+
+
+class NeighborIndex:
+    """Read-only, memory-mapped top-k neighbour lists keyed by point ID"""
+
+    def __init__(self, neighbors_dir: str = NEIGHBORS_DIR):
+        path = Path(neighbors_dir)
+        meta_path = path / "meta.json"
+        if not meta_path.exists():
+            raise ValueError(f"Neighbour index not found in '{neighbors_dir}'. Run scripts/build_neighbors.py first.")
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta['embedding_model'] != EMBEDDING_MODEL:
+            raise ValueError(
+                f"Neighbour index was built with '{self.meta['embedding_model']}' "
+                f"but EMBEDDING_MODEL is '{EMBEDDING_MODEL}'. Rebuild it."
+            )
+        if self.meta.get('embedding_key') != model_cache_key(EMBEDDING_MODEL):
+            raise ValueError(
+                f"Neighbour index holds '{self.meta.get('embedding_key')}' vectors "
+                f"but EMBEDDING_PROFILE gives '{model_cache_key(EMBEDDING_MODEL)}'. Rebuild it."
+            )
+
+        self.k = self.meta['k']
+        self.ids = np.load(path / "ids.npy", mmap_mode='r')
+        self.hashes = np.load(path / "vector_hash.npy", mmap_mode='r')
+        self.neighbor_ids = np.load(path / "neighbor_ids.npy", mmap_mode='r')
+        self.neighbor_scores = np.load(path / "neighbor_scores.npy", mmap_mode='r')
+        self.row_by_id = {int(point_id): row for row, point_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def neighbors(self, point_id: int, limit: int = 10) -> List[Tuple[int, float]]:
+        """(neighbour point ID, cosine similarity) pairs for a point, best first"""
+        row = self.row_by_id.get(int(point_id))
+        if row is None:
+            raise KeyError(f"Point {point_id} is not in the neighbour index")
+        return [
+            (int(neighbor_id), float(score))
+            for neighbor_id, score in zip(self.neighbor_ids[row, :limit], self.neighbor_scores[row, :limit])
+        ]
+
+    def neighbors_by_name(self, company_name: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """
+        Neighbours of a company looked up by name through the payload store
+        (the most recent batch when several companies share the name)
+        """
+        from lib.payload_store import get_payload_store
+
+        point_ids = [point_id for point_id in get_payload_store().ids_by_name(company_name) if point_id in self.row_by_id]
+        if not point_ids:
+            raise KeyError(f"No company named '{company_name}' in the neighbour index")
+        return self.neighbors(point_ids[0], limit)
+
+
+_neighbor_index: Optional[NeighborIndex] = None
+
+
+def get_neighbor_index() -> NeighborIndex:
+    """Return the process-wide neighbour index, opening it on first use"""
+    global _neighbor_index
+    if _neighbor_index is None:
+        _neighbor_index = NeighborIndex()
+    return _neighbor_index
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+"""
+Persistent cache of scraped pages with per-source TTLs and revalidation
+
+The same popular companies come back across many ideas. Each scraped page
+is stored in SQLite under its normalized URL and source ('yc_listing' or
+'landing_page') with:
+- the raw HTML, zlib-compressed
+- the extracted dict, so a hit skips fetching, rendering and parsing
+- the ETag / Last-Modified validators of the response, when it had any
+
+An entry is fresh for the TTL of its source (PAGE_CACHE_TTL_YC_LISTING,
+PAGE_CACHE_TTL_LANDING_PAGE). A stale entry with validators is revalidated
+with a conditional GET: a 304 makes it fresh again without scraping, and
+anything else falls through to a normal scrape, which replaces it (a YC
+listing returned by the conditional GET is parsed as is, not fetched again).
+
+Pages are cached as extracted from the page alone; per-caller data such as
+the CSV fields of a YC listing is applied after reading from the cache.
+
+stats() reports hits, revalidations, misses and the size of the cache;
+scripts/purge_page_cache.py removes entries.
+"""
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from typing import Dict, Any, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE", "true").lower() not in ("0", "false", "no")
+PAGE_CACHE_PATH = os.getenv(
+    "PAGE_CACHE_PATH",
+    str(Path(__file__).parent.parent / "data" / "cache" / "pages.sqlite")
+)
+PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", "86400"))
+PAGE_CACHE_TTLS = {
+    # YC listings change rarely, landing pages more often
+    'yc_listing': float(os.getenv("PAGE_CACHE_TTL_YC_LISTING", "604800")),
+    'landing_page': float(os.getenv("PAGE_CACHE_TTL_LANDING_PAGE", "86400")),
+}
+
+# Query parameters that never change the page (plus every utm_*)
+_TRACKING_PARAMS = {'ref', 'fbclid', 'gclid', 'mc_cid', 'mc_eid'}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Cache key of a URL: scheme, fragment, default ports, tracking parameters
+    and trailing slashes do not make a different page
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or '/'
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not (key.lower().startswith('utm_') or key.lower() in _TRACKING_PARAMS)
+    )
+    return f"{host}{path}" + (f"?{urlencode(query)}" if query else "")
+
+
+def response_validators(headers: Any) -> Dict[str, Optional[str]]:
+    """ETag and Last-Modified of a response (requests or Playwright headers)"""
+    headers = {key.lower(): value for key, value in dict(headers or {}).items()}
+    return {'etag': headers.get('etag'), 'last_modified': headers.get('last-modified')}
+
+
+class CachedPage:
+    """One cache entry"""
+
+    def __init__(self, row: tuple, ttl: float):
+        self.url, self.source, html, data, self.etag, self.last_modified, self.fetched_at, self.validated_at = row
+        self._html = html
+        self.data: Dict[str, Any] = json.loads(data)
+        self.fresh = time.time() - self.validated_at <= ttl
+
+    @property
+    def html(self) -> str:
+        return zlib.decompress(self._html).decode('utf-8')
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers that let the origin answer 304 Not Modified"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """SQLite page store (one connection per thread, WAL so scrapes can write concurrently)"""
+
+    def __init__(self, cache_path: str = PAGE_CACHE_PATH):
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        self.cache_path = cache_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'revalidated': 0, 'stale': 0, 'misses': 0, 'stores': 0}
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "key TEXT NOT NULL, source TEXT NOT NULL, url TEXT NOT NULL, html BLOB NOT NULL, data TEXT NOT NULL, "
+            "etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL, validated_at REAL NOT NULL, "
+            "PRIMARY KEY (key, source))"
+        )
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.cache_path, timeout=10)
+            self._local.conn = conn
+        return conn
+
+    def _count(self, counter: str):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def get(self, url: str, source: str) -> Optional[CachedPage]:
+        """The entry of a URL, fresh or stale; counts a hit, a stale entry or a miss"""
+        row = self._connection().execute(
+            "SELECT url, source, html, data, etag, last_modified, fetched_at, validated_at "
+            "FROM pages WHERE key = ? AND source = ?",
+            (normalize_url(url), source)
+        ).fetchone()
+        if row is None:
+            self._count('misses')
+            return None
+        page = CachedPage(row, PAGE_CACHE_TTLS.get(source, PAGE_CACHE_TTL))
+        self._count('hits' if page.fresh else 'stale')
+        return page
+
+    def put(
+        self,
+        url: str,
+        source: str,
+        html: str,
+        data: Dict[str, Any],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """Store (or replace) a scraped page and its extracted data"""
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (normalize_url(url), source, url, zlib.compress(html.encode('utf-8'), 6),
+             json.dumps(data, ensure_ascii=False), etag, last_modified, now, now)
+        )
+        conn.commit()
+        self._count('stores')
+
+    def mark_validated(self, url: str, source: str):
+        """The origin answered 304: the entry is fresh for another TTL"""
+        conn = self._connection()
+        conn.execute(
+            "UPDATE pages SET validated_at = ? WHERE key = ? AND source = ?",
+            (time.time(), normalize_url(url), source)
+        )
+        conn.commit()
+        self._count('revalidated')
+
+    def purge(
+        self,
+        source: Optional[str] = None,
+        expired_only: bool = False,
+        older_than: Optional[float] = None
+    ) -> int:
+        """Delete entries (of one source, past their TTL, or fetched more than older_than seconds ago)"""
+        now = time.time()
+        conditions, params = [], []
+        if source:
+            conditions.append("source = ?")
+            params.append(source)
+        if older_than is not None:
+            conditions.append("fetched_at < ?")
+            params.append(now - older_than)
+        if expired_only:
+            ttl_cases = " ".join(f"WHEN '{name}' THEN {ttl}" for name, ttl in PAGE_CACHE_TTLS.items())
+            conditions.append(f"validated_at < ? - (CASE source {ttl_cases} ELSE {PAGE_CACHE_TTL} END)")
+            params.append(now)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        conn = self._connection()
+        deleted = conn.execute(f"DELETE FROM pages{where}", params).rowcount
+        conn.commit()
+        conn.execute("VACUUM")
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        """Entries and compressed size per source, and this process's lookup counters"""
+        rows = self._connection().execute(
+            "SELECT source, COUNT(*), SUM(LENGTH(html)), SUM(LENGTH(data)), MIN(fetched_at) FROM pages GROUP BY source"
+        ).fetchall()
+        with self._lock:
+            counters = dict(self.counters)
+        # Every lookup is a hit, a stale entry or a miss; revalidated ones were stale
+        lookups = counters['hits'] + counters['stale'] + counters['misses']
+        return {
+            'path': self.cache_path,
+            'sources': {
+                source: {
+                    'entries': count,
+                    'html_bytes': html_bytes or 0,
+                    'data_bytes': data_bytes or 0,
+                    'oldest_fetched_at': oldest,
+                    'ttl': PAGE_CACHE_TTLS.get(source, PAGE_CACHE_TTL),
+                }
+                for source, count, html_bytes, data_bytes, oldest in rows
+            },
+            **counters,
+            'hit_rate': (counters['hits'] + counters['revalidated']) / lookups if lookups else 0.0,
+        }
+
+
+_page_cache: Optional[PageCache] = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """Return the process-wide page cache, or None when PAGE_CACHE is off"""
+    global _page_cache
+    if not PAGE_CACHE_ENABLED:
+        return None
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = PageCache()
+        return _page_cache
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Local read-only store of company payloads keyed by point ID
+
+With SEARCH_PAYLOAD_SOURCE=local, searches ask Qdrant for IDs and scores
+only (with_payload=False, with_vectors=False) and fill the results in from
+this SQLite database instead, so response size no longer grows with the
+description text of every hit. The store is rebuilt from the CSV by the
+setup script; IDs missing from it are fetched from Qdrant as a fallback.
+"""
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable
+
+from dotenv import load_dotenv
+
+from lib.qdrant_client import PAYLOAD_FIELDS, build_company_payload, company_point_id
+from lib.dedup import load_deduplicated_rows
+
+load_dotenv()
+
+PAYLOAD_STORE_PATH = os.getenv(
+    "PAYLOAD_STORE_PATH",
+    str(Path(__file__).parent.parent / "data" / "payload_store" / "companies.sqlite")
+)
+
+# SQLite caps the number of bound parameters per statement
+_MAX_IDS_PER_QUERY = 900
+
+
+def build_payload_store_from_csv(csv_path: str, store_path: str = PAYLOAD_STORE_PATH) -> int:
+    """Write every company's payload to a fresh SQLite file and swap it in atomically"""
+    path = Path(store_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.unlink(missing_ok=True)
+
+    columns = PAYLOAD_FIELDS + ['batch_year']
+
+    def records():
+        for row in load_deduplicated_rows(csv_path):
+            payload = build_company_payload(row)
+            yield (company_point_id(row), *(payload[column] for column in columns))
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute(
+            f"CREATE TABLE companies (id INTEGER PRIMARY KEY, {', '.join(f'{field} TEXT' for field in PAYLOAD_FIELDS)}, batch_year INTEGER)"
+        )
+        # Same rows and point IDs as the Qdrant upload
+        conn.executemany(
+            f"INSERT OR REPLACE INTO companies VALUES (?, {', '.join('?' for _ in columns)})",
+            records()
+        )
+        conn.commit()
+        count = conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+    return count
+
+
+class PayloadStore:
+    """Read-only lookups of company payloads by point ID (one connection per thread)"""
+
+    def __init__(self, store_path: str = PAYLOAD_STORE_PATH):
+        if not Path(store_path).exists():
+            raise ValueError(f"Payload store not found at '{store_path}'. Run scripts/0_setup_qdrant.py first.")
+        self.store_path = store_path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.store_path}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, point_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Payloads of the given point IDs; unknown IDs are left out"""
+        point_ids = list(dict.fromkeys(int(point_id) for point_id in point_ids))
+        payloads = {}
+        conn = self._connection()
+        for start in range(0, len(point_ids), _MAX_IDS_PER_QUERY):
+            chunk = point_ids[start:start + _MAX_IDS_PER_QUERY]
+            rows = conn.execute(
+                f"SELECT id, {', '.join(PAYLOAD_FIELDS)} FROM companies WHERE id IN ({', '.join('?' for _ in chunk)})",
+                chunk
+            )
+            for row in rows:
+                payloads[row[0]] = dict(zip(PAYLOAD_FIELDS, row[1:]))
+        return payloads
+
+    def ids_by_name(self, company_name: str) -> List[int]:
+        """Point IDs of the companies with this name, most recent batch first"""
+        rows = self._connection().execute(
+            "SELECT id FROM companies WHERE name = ? ORDER BY batch_year DESC",
+            (company_name,)
+        )
+        return [row[0] for row in rows]
+
+
+_payload_store: Optional[PayloadStore] = None
+
+
+def get_payload_store() -> PayloadStore:
+    """Return the process-wide payload store, opening it on first use"""
+    global _payload_store
+    if _payload_store is None:
+        _payload_store = PayloadStore()
+    return _payload_store
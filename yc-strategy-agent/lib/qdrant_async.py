@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+"""
+Async counterparts of the search and upload functions
+
+Queries and upserts go through pooled AsyncQdrantClients, so one event loop
+can keep many requests in flight on a few gRPC channels. Embedding is
+CPU-bound and runs in worker threads (asyncio.to_thread) to keep the loop
+responsive.
+"""
+import time
+import asyncio
+from typing import List, Dict, Any, Optional
+
+from qdrant_client import AsyncQdrantClient
+
+from lib.batching import plan_batches, embedding_batch_stats
+from lib.query_cache import bump_index_generation, get_query_cache, search_context
+from lib.qdrant_client import (
+    COLLECTION_NAME,
+    PAYLOAD_FIELDS,
+    SEARCH_BACKEND,
+    SEARCH_PAYLOAD_SOURCE,
+    async_client_pool,
+    build_query_request,
+    build_search_filter,
+    collection_has_sparse_vectors,
+    create_batch_from_chunk,
+    create_collection,
+    embed_sparse_queries,
+    embed_texts,
+    format_search_result,
+    get_pooled_async_client,
+    get_pooled_client,
+    _batch_to_upsert,
+    _check_payload_source,
+    _check_search_mode,
+    _print_batch_stats,
+    _print_cache_stats,
+    _search_local,
+    _slice_batch,
+)
+
+
+async def search_similar_companies_async(
+    idea_pitch: str,
+    limit: int = 3,
+    collection_name: str = COLLECTION_NAME,
+    client: Optional[AsyncQdrantClient] = None,
+    backend: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    mode: str = "dense",
+    payload_source: Optional[str] = None,
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """Async search_similar_companies (same arguments, results and query cache)"""
+    backend = backend or SEARCH_BACKEND
+    payload_source = payload_source or SEARCH_PAYLOAD_SOURCE
+    _check_search_mode(backend, mode)
+    _check_payload_source(payload_source)
+
+    cache = get_query_cache() if use_cache else None
+    context = search_context(collection=collection_name, backend=backend, mode=mode, limit=limit, filters=filters)
+    query_embedding = None
+    if cache:
+        cached, query_embedding = cache.lookup(idea_pitch, context)
+        if cached is not None:
+            return cached
+    if query_embedding is None:
+        query_embedding = (await asyncio.to_thread(embed_texts, [idea_pitch]))[0]
+    if cache:
+        cached = cache.lookup_similar(query_embedding, context)
+        if cached is not None:
+            return cached
+
+    if backend == "local":
+        results = await asyncio.to_thread(_search_local, idea_pitch, limit, filters, query_embedding)
+    else:
+        results = await _search_qdrant_async(idea_pitch, query_embedding, limit, collection_name, client, filters, mode, payload_source)
+    if cache:
+        cache.put(idea_pitch, context, query_embedding, results)
+    return results
+
+
+async def _search_qdrant_async(
+    idea_pitch: str,
+    query_embedding,
+    limit: int,
+    collection_name: str,
+    client: Optional[AsyncQdrantClient],
+    filters: Optional[Dict[str, Any]],
+    mode: str,
+    payload_source: str
+) -> List[Dict[str, Any]]:
+    """Async _search_qdrant"""
+    query_filter = build_search_filter(filters)
+    client = client or await get_pooled_async_client()
+
+    if not await client.collection_exists(collection_name=collection_name):
+        raise ValueError(f"Collection '{collection_name}' does not exist. Run setup script first.")
+
+    sparse_embedding = (await asyncio.to_thread(embed_sparse_queries, [idea_pitch]))[0] if mode == "hybrid" else None
+    thin = payload_source == "local"
+    request = build_query_request(query_embedding, sparse_embedding, limit, query_filter, with_payload=not thin)
+
+    try:
+        results = await client.query_points(
+            collection_name=collection_name,
+            query=request.query,
+            using=request.using,
+            prefetch=request.prefetch,
+            query_filter=request.filter,
+            search_params=request.params,
+            limit=limit,
+            with_payload=request.with_payload,
+            with_vectors=False
+        )
+    except Exception as e:
+        async_client_pool.report_failure(client)
+        raise ValueError(f"Error querying Qdrant: {e}")
+
+    if thin:
+        return await _hydrate_async(client, collection_name, results.points)
+    return [format_search_result(point.payload, point.score) for point in results.points]
+
+
+async def _hydrate_async(client: AsyncQdrantClient, collection_name: str, points) -> List[Dict[str, Any]]:
+    """Async hydrate_search_results for one response"""
+    from lib.payload_store import get_payload_store
+
+    payloads = get_payload_store().get_many(point.id for point in points)
+    missing = [point.id for point in points if point.id not in payloads]
+    if missing:
+        for record in await client.retrieve(collection_name=collection_name, ids=missing, with_payload=PAYLOAD_FIELDS):
+            payloads[record.id] = record.payload or {}
+    return [format_search_result(payloads.get(point.id, {}), point.score) for point in points]
+
+
+async def search_many_async(
+    pitches: List[str],
+    limit: int = 3,
+    concurrency: int = 16,
+    **kwargs
+) -> List[List[Dict[str, Any]]]:
+    """Run independent searches concurrently (at most `concurrency` in flight), results in input order"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def search_one(pitch: str) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await search_similar_companies_async(pitch, limit=limit, **kwargs)
+
+    return await asyncio.gather(*(search_one(pitch) for pitch in pitches))
+
+
+async def upload_companies_from_csv_async(
+    csv_path: str,
+    collection_name: str = COLLECTION_NAME,
+    batch_size: int = 256,
+    concurrency: int = 4,
+    recreate: bool = True,
+    chunk_size: int = 200,
+    sort_window: int = 2048,
+    profile: Optional[str] = None
+) -> int:
+    """
+    Async upload_companies_from_csv
+
+    Chunks are embedded one at a time in a worker thread while up to
+    `concurrency` upserts are in flight on the pooled async clients.
+    Returns the number of points uploaded.
+    """
+    from lib.dedup import DEDUP_REPORT_PATH, load_deduplicated_rows
+
+    sync_client = get_pooled_client()
+    await asyncio.to_thread(create_collection, sync_client, collection_name, recreate, profile)
+    include_sparse = await asyncio.to_thread(collection_has_sparse_vectors, sync_client, collection_name)
+    client = await get_pooled_async_client()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    pending = set()
+    uploaded = 0
+
+    async def upload(batch: Dict[str, Any]) -> int:
+        async with semaphore:
+            await client.upsert(collection_name=collection_name, points=_batch_to_upsert(batch), wait=True)
+        return len(batch['ids'])
+
+    async def embed_and_upload(window: List[Dict[str, str]]):
+        nonlocal uploaded
+        texts = [row.get('description', '').strip() for row in window]
+        for indexes in plan_batches(texts, max_batch_size=chunk_size):
+            embedded = await asyncio.to_thread(create_batch_from_chunk, [window[i] for i in indexes], None, include_sparse)
+            if embedded is None:
+                continue
+            for start in range(0, len(embedded['ids']), batch_size):
+                # Backpressure: keep at most 2x `concurrency` batches embedded ahead of the upserts
+                while len(pending) >= 2 * concurrency:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        pending.discard(task)
+                        uploaded += task.result()
+                pending.add(asyncio.create_task(upload(_slice_batch(embedded, start, start + batch_size))))
+
+    rows = await asyncio.to_thread(load_deduplicated_rows, csv_path, DEDUP_REPORT_PATH)
+    print(f"Streaming {csv_path} with {concurrency} concurrent async upserts...")
+    embedding_batch_stats.reset()
+    start_time = time.time()
+    try:
+        window = []
+        for row in rows:
+            window.append(row)
+            if len(window) >= sort_window:
+                await embed_and_upload(window)
+                window = []
+        if window:
+            await embed_and_upload(window)
+        for task in asyncio.as_completed(pending):
+            uploaded += await task
+    except Exception as e:
+        for task in pending:
+            task.cancel()
+        async_client_pool.report_failure(client)
+        raise ValueError(f"Error uploading points: {e}")
+
+    print(f"✅ Embedded and uploaded {uploaded} points in {time.time() - start_time:.2f} seconds")
+    _print_cache_stats()
+    _print_batch_stats()
+    bump_index_generation()
+    return uploaded
@@ -3,14 +3,33 @@
 Qdrant operations wrapper for YC companies semantic search
 """
 import os
+import re
+import csv
+import json
 import time
-from typing import List, Dict, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+import threading
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 from dotenv import load_dotenv
-from qdrant_client import QdrantClient
-from qdrant_client.models import Document, PointStruct, VectorParams, CollectionStatus
-from fastembed import TextEmbedding
+from qdrant_client import QdrantClient, AsyncQdrantClient
+from qdrant_client.models import (
+    Batch, VectorParams, CollectionStatus, PointIdsList, QueryRequest,
+    Filter, FieldCondition, MatchAny, Range, PayloadSchemaType,
+    SparseVectorParams, SparseVector, Modifier, Prefetch, FusionQuery, Fusion,
+    HnswConfigDiff, SearchParams, QuantizationSearchParams,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    BinaryQuantization, BinaryQuantizationConfig
+)
+from fastembed import TextEmbedding, SparseTextEmbedding
+import atexit
 import hashlib
+import numpy as np
+
+from lib.embedding_cache import get_embedding_cache
+from lib.embedding_profiles import load_text_embedding, model_cache_key
+from lib.query_cache import bump_index_generation, get_query_cache, search_context
+from lib.batching import plan_batches, embedding_batch_stats
+from lib.qdrant_pool import QdrantClientPool, AsyncQdrantClientPool
 
 load_dotenv()
 
@@ -21,10 +40,85 @@ EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "BAAI/bge-small-en")
 VECTOR_SIZE = int(os.getenv("VECTOR_SIZE", "384"))
 DISTANCE_METRIC = os.getenv("DISTANCE_METRIC", "Cosine")
 VECTOR_NAME = f"fast-{EMBEDDING_MODEL.split('/')[-1].lower()}"
+# Sparse lexical (BM25) vector indexed next to the dense one for hybrid search
+SPARSE_MODEL = os.getenv("SPARSE_MODEL", "Qdrant/bm25")
+SPARSE_VECTOR_NAME = os.getenv("SPARSE_VECTOR_NAME", "bm25")
+# Candidates fetched from each of the dense and sparse rankings before fusion
+HYBRID_PREFETCH_LIMIT = int(os.getenv("HYBRID_PREFETCH_LIMIT", "50"))
+# "qdrant" (remote collection) or "local" (in-process NumPy index, see lib/local_index.py)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "qdrant").lower()
+# "qdrant" (payloads returned with each hit) or "local" (IDs and scores only,
+# payloads read from the local store, see lib/payload_store.py)
+SEARCH_PAYLOAD_SOURCE = os.getenv("SEARCH_PAYLOAD_SOURCE", "qdrant").lower()
+
+# Company fields stored in each point's payload and returned by searches
+PAYLOAD_FIELDS = ['name', 'description', 'main_industry', 'sub_industry', 'batch', 'url']
+
+# Payload fields indexed in Qdrant so filters prune candidates during the HNSW search
+PAYLOAD_INDEXES = {
+    'main_industry': PayloadSchemaType.KEYWORD,
+    'sub_industry': PayloadSchemaType.KEYWORD,
+    'batch': PayloadSchemaType.KEYWORD,
+    'batch_year': PayloadSchemaType.INTEGER,
+}
+
+# Collection storage/index profiles. Each combines HNSW graph settings,
+# quantization, on-disk placement of the original vectors and the search-time
+# parameters (ef, rescoring) that go with them. Measured tradeoffs are
+# produced by scripts/benchmark_profiles.py.
+COLLECTION_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Qdrant defaults: float32 vectors in RAM, default HNSW, no quantization
+    'default': {
+        'on_disk': False,
+        'hnsw_config': None,
+        'quantization_config': None,
+        'search_params': None,
+    },
+    # Smallest RAM footprint: 1-bit vectors in RAM, originals and graph on disk,
+    # heavy oversampling + rescoring from disk to recover recall
+    'memory-lean': {
+        'on_disk': True,
+        'hnsw_config': HnswConfigDiff(m=8, ef_construct=64, on_disk=True),
+        'quantization_config': BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True)),
+        'search_params': SearchParams(
+            hnsw_ef=128,
+            quantization=QuantizationSearchParams(rescore=True, oversampling=3.0)
+        ),
+    },
+    # int8 vectors in RAM with originals kept in RAM for cheap rescoring
+    'balanced': {
+        'on_disk': False,
+        'hnsw_config': HnswConfigDiff(m=16, ef_construct=128),
+        'quantization_config': ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        ),
+        'search_params': SearchParams(
+            hnsw_ef=128,
+            quantization=QuantizationSearchParams(rescore=True, oversampling=2.0)
+        ),
+    },
+    # Denser graph built once, fewer hops and a small ef at query time
+    'latency-optimized': {
+        'on_disk': False,
+        'hnsw_config': HnswConfigDiff(m=32, ef_construct=256),
+        'quantization_config': ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        ),
+        'search_params': SearchParams(
+            hnsw_ef=64,
+            quantization=QuantizationSearchParams(rescore=True, oversampling=1.5)
+        ),
+    },
+}
+COLLECTION_PROFILE = os.getenv("COLLECTION_PROFILE", "default")
+
+_embedding_model: Optional[TextEmbedding] = None
+_sparse_model: Optional[SparseTextEmbedding] = None
+_embedding_model_lock = threading.Lock()
 
 
 def get_qdrant_client() -> QdrantClient:
-    """Initialize and return Qdrant client"""
+    """Initialize and return a new Qdrant client (caller closes it)"""
     return QdrantClient(
         url=QDRANT_URL,
         api_key=QDRANT_API_KEY,
@@ -33,35 +127,258 @@ def get_qdrant_client() -> QdrantClient:
     )
 
 
-def create_collection(client: QdrantClient, collection_name: str = COLLECTION_NAME, recreate: bool = False):
-    """Create Qdrant collection if it doesn't exist"""
+def get_async_qdrant_client() -> AsyncQdrantClient:
+    """Initialize and return a new async Qdrant client (caller closes it)"""
+    return AsyncQdrantClient(
+        url=QDRANT_URL,
+        api_key=QDRANT_API_KEY,
+        prefer_grpc=True,
+        timeout=30
+    )
+
+
+client_pool = QdrantClientPool(get_qdrant_client)
+async_client_pool = AsyncQdrantClientPool(get_async_qdrant_client)
+atexit.register(client_pool.close)
+atexit.register(async_client_pool.shutdown)
+
+
+def get_pooled_client() -> QdrantClient:
+    """Return a shared, health-checked client from the process-wide pool (do not close it)"""
+    return client_pool.get()
+
+
+async def get_pooled_async_client() -> AsyncQdrantClient:
+    """Return a shared, health-checked async client from the process-wide pool (do not close it)"""
+    return await async_client_pool.get()
+
+
+def get_embedding_model() -> TextEmbedding:
+    """Return the process-wide embedding model (int8 under a quantized EMBEDDING_PROFILE), loading it on first use"""
+    global _embedding_model
+    if _embedding_model is None:
+        with _embedding_model_lock:
+            if _embedding_model is None:
+                _embedding_model = load_text_embedding(EMBEDDING_MODEL)
+    return _embedding_model
+
+
+def get_sparse_model() -> SparseTextEmbedding:
+    """Return the process-wide BM25 sparse model, loading it on first use"""
+    global _sparse_model
+    if _sparse_model is None:
+        with _embedding_model_lock:
+            if _sparse_model is None:
+                _sparse_model = SparseTextEmbedding(model_name=SPARSE_MODEL)
+    return _sparse_model
+
+
+def embed_sparse_documents(texts: List[str]) -> List[SparseVector]:
+    """BM25 term-frequency vectors for corpus texts (IDF is applied by Qdrant)"""
+    return [
+        SparseVector(indices=embedding.indices.tolist(), values=embedding.values.tolist())
+        for embedding in get_sparse_model().embed(texts)
+    ]
+
+
+def embed_sparse_queries(texts: List[str]) -> List[SparseVector]:
+    """BM25 query vectors (one weight per distinct term)"""
+    return [
+        SparseVector(indices=embedding.indices.tolist(), values=embedding.values.tolist())
+        for embedding in get_sparse_model().query_embed(texts)
+    ]
+
+
+def embed_texts(texts: List[str], embedding_model: Optional[TextEmbedding] = None) -> np.ndarray:
+    """
+    Embed texts as a (len(texts), VECTOR_SIZE) float32 matrix
+
+    Vectors already in the on-disk embedding cache are reused; only distinct
+    misses go through the model, which is not even loaded when everything hits.
+    Misses are embedded in length-sorted batches under a token budget (see
+    lib/batching.py) and each model call is recorded in embedding_batch_stats.
+    """
+    cache = get_embedding_cache(model_cache_key(EMBEDDING_MODEL), VECTOR_SIZE)
+    cached = cache.get_many(texts) if cache else [None] * len(texts)
+    
+    # Identical texts (placeholder descriptions like "B2B") go through the model once
+    miss_indexes: Dict[str, List[int]] = {}
+    for i, vector in enumerate(cached):
+        if vector is None:
+            miss_indexes.setdefault(texts[i], []).append(i)
+    if miss_indexes:
+        model = embedding_model or get_embedding_model()
+        miss_texts = list(miss_indexes)
+        for batch in plan_batches(miss_texts):
+            batch_texts = [miss_texts[j] for j in batch]
+            start = time.perf_counter()
+            computed = list(model.embed(batch_texts, batch_size=len(batch_texts)))
+            embedding_batch_stats.record(batch_texts, time.perf_counter() - start)
+            for text, vector in zip(batch_texts, computed):
+                for i in miss_indexes[text]:
+                    cached[i] = vector
+            if cache:
+                cache.put_many(batch_texts, computed)
+    
+    if not texts:
+        return np.empty((0, VECTOR_SIZE), dtype=np.float32)
+    return np.asarray(cached, dtype=np.float32)
+
+
+def get_collection_profile(profile: Optional[str] = None) -> Dict[str, Any]:
+    """Look up a collection profile by name (default COLLECTION_PROFILE)"""
+    profile = profile or COLLECTION_PROFILE
+    if profile not in COLLECTION_PROFILES:
+        raise ValueError(f"Unknown collection profile '{profile}' (expected one of: {', '.join(COLLECTION_PROFILES)})")
+    return COLLECTION_PROFILES[profile]
+
+
+def create_collection(
+    client: QdrantClient,
+    collection_name: str = COLLECTION_NAME,
+    recreate: bool = False,
+    profile: Optional[str] = None
+):
+    """Create Qdrant collection if it doesn't exist, using a storage/index profile"""
+    settings = get_collection_profile(profile)
     if client.collection_exists(collection_name=collection_name):
         if recreate:
             print(f"Deleting existing collection '{collection_name}'...")
             client.delete_collection(collection_name=collection_name)
         else:
             print(f"Collection '{collection_name}' already exists")
+            if not collection_has_sparse_vectors(client, collection_name):
+                print(f"⚠️  No '{SPARSE_VECTOR_NAME}' sparse vector: hybrid search needs a rebuild (--rebuild)")
+            ensure_payload_indexes(client, collection_name)
             return
     
     vectors_config = {
-        VECTOR_NAME: VectorParams(size=int(VECTOR_SIZE), distance=DISTANCE_METRIC)
+        VECTOR_NAME: VectorParams(size=int(VECTOR_SIZE), distance=DISTANCE_METRIC, on_disk=settings['on_disk'])
+    }
+    # IDF is computed server-side from the stored term frequencies
+    sparse_vectors_config = {
+        SPARSE_VECTOR_NAME: SparseVectorParams(modifier=Modifier.IDF)
     }
     client.create_collection(
         collection_name=collection_name,
-        vectors_config=vectors_config
+        vectors_config=vectors_config,
+        sparse_vectors_config=sparse_vectors_config,
+        hnsw_config=settings['hnsw_config'],
+        quantization_config=settings['quantization_config']
     )
-    print(f"Created collection '{collection_name}' with vector '{VECTOR_NAME}'")
+    print(f"Created collection '{collection_name}' with vectors '{VECTOR_NAME}' and '{SPARSE_VECTOR_NAME}' (sparse), "
+          f"profile '{profile or COLLECTION_PROFILE}'")
+    ensure_payload_indexes(client, collection_name)
+
+
+def collection_has_sparse_vectors(client: QdrantClient, collection_name: str = COLLECTION_NAME) -> bool:
+    """Whether the collection was created with the BM25 sparse vector"""
+    sparse_vectors = client.get_collection(collection_name).config.params.sparse_vectors or {}
+    return SPARSE_VECTOR_NAME in sparse_vectors
+
+
+def ensure_payload_indexes(client: QdrantClient, collection_name: str = COLLECTION_NAME):
+    """Create any missing payload indexes used by filtered search"""
+    existing = client.get_collection(collection_name).payload_schema or {}
+    for field, schema in PAYLOAD_INDEXES.items():
+        if field not in existing:
+            client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field,
+                field_schema=schema,
+                wait=True
+            )
+            print(f"Created {schema.value} payload index on '{field}'")
 
 
-def hash_company_name(name: str) -> int:
-    """Generate consistent integer ID from company name"""
-    return int(hashlib.md5(name.encode()).hexdigest()[:8], 16)
+def parse_batch_year(batch: str) -> Optional[int]:
+    """Year of a YC batch label such as 'Summer 2025' or 'W24'"""
+    match = re.search(r'(\d{4})', batch or '')
+    if match:
+        return int(match.group(1))
+    match = re.search(r'\b[SWFX](\d{2})\b', batch or '', re.IGNORECASE)
+    if match:
+        return 2000 + int(match.group(1))
+    return None
 
 
-def create_points_from_chunk(chunk_rows: List[Dict[str, str]], embedding_model: TextEmbedding) -> List[PointStruct]:
-    """Create PointStructs from a chunk of rows with batched embedding generation"""
-    points = []
+def build_search_filter(filters: Optional[Dict[str, Any]]) -> Optional[Filter]:
+    """
+    Translate search filters into a Qdrant Filter
+
+    Supported keys: industries, sub_industries, batches (lists of exact
+    values, matched against main_industry, sub_industry and batch) and
+    min_batch_year / max_batch_year (inclusive).
+    """
+    if not filters:
+        return None
+    
+    unknown = set(filters) - {'industries', 'sub_industries', 'batches', 'min_batch_year', 'max_batch_year'}
+    if unknown:
+        raise ValueError(f"Unknown search filter(s): {', '.join(sorted(unknown))}")
     
+    conditions = []
+    for key, field in (('industries', 'main_industry'), ('sub_industries', 'sub_industry'), ('batches', 'batch')):
+        if filters.get(key):
+            conditions.append(FieldCondition(key=field, match=MatchAny(any=list(filters[key]))))
+    if filters.get('min_batch_year') is not None or filters.get('max_batch_year') is not None:
+        conditions.append(FieldCondition(
+            key='batch_year',
+            range=Range(gte=filters.get('min_batch_year'), lte=filters.get('max_batch_year'))
+        ))
+    return Filter(must=conditions) if conditions else None
+
+
+def company_point_key(row: Dict[str, str]) -> str:
+    """What identifies a company: its YC listing URL, or name and batch without one"""
+    url = row.get('url', '').strip().lower().rstrip('/')
+    return url or f"{row.get('name', '').strip()}|{row.get('batch', '').strip()}"
+
+
+def company_point_id(row: Dict[str, str]) -> int:
+    """
+    Stable 63-bit point ID of a company (fits Qdrant, int64 arrays and SQLite)
+
+    Several YC companies share a name, so the ID is derived from the listing
+    rather than the name; at 63 bits collisions are negligible, and
+    lib/dedup.py checks for them anyway.
+    """
+    digest = hashlib.blake2b(company_point_key(row).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') & ((1 << 63) - 1)
+
+
+def build_company_payload(row: Dict[str, str]) -> Dict[str, Any]:
+    """Payload stored with each company point"""
+    payload = {field: row.get(field, '') for field in PAYLOAD_FIELDS}
+    payload['batch_year'] = parse_batch_year(payload['batch'])
+    return payload
+
+
+def company_content_hash(row: Dict[str, str]) -> str:
+    """
+    Hash of the embedded text, payload and embedding model/profile, used to
+    detect changed rows on re-index (a profile switch re-embeds every row)
+    """
+    content = {
+        'embedding_key': model_cache_key(EMBEDDING_MODEL),
+        'text': row.get('description', '').strip(),
+        'payload': build_company_payload(row)
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def create_batch_from_chunk(
+    chunk_rows: List[Dict[str, str]],
+    embedding_model: Optional[TextEmbedding] = None,
+    include_sparse: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Embed a chunk of rows into a columnar batch: point IDs, a float32 vector
+    matrix, optional BM25 vectors and payloads
+
+    Vectors stay in one NumPy matrix until upload, instead of being turned
+    into a Python list per point here.
+    """
     # Extract texts and filter empty ones
     texts = []
     valid_rows = []
@@ -72,95 +389,310 @@ def create_points_from_chunk(chunk_rows: List[Dict[str, str]], embedding_model:
             valid_rows.append(row)
     
     if not texts:
-        return []
+        return None
     
-    # Generate embeddings in batch (more efficient)
-    embeddings = list(embedding_model.embed(texts))
-    
-    # Create points with embeddings
-    for row, embedding in zip(valid_rows, embeddings):
-        point_id = hash_company_name(row['name'])
-        points.append(PointStruct(
-            id=point_id,
-            payload={
-                'name': row['name'],
-                'description': row['description'],
-                'main_industry': row.get('main_industry', ''),
-                'sub_industry': row.get('sub_industry', ''),
-                'batch': row.get('batch', ''),
-                'url': row.get('url', '')
-            },
-            vector={VECTOR_NAME: embedding.tolist()}
-        ))
+    # Generate embeddings in batch (more efficient), reusing cached vectors
+    embeddings = np.asarray(embed_texts(texts, embedding_model), dtype=np.float32)
+    
+    payloads = []
+    for row in valid_rows:
+        payload = build_company_payload(row)
+        payload['content_hash'] = company_content_hash(row)
+        payloads.append(payload)
     
-    return points
+    return {
+        'ids': [company_point_id(row) for row in valid_rows],
+        'vectors': embeddings,
+        'sparse': embed_sparse_documents(texts) if include_sparse else None,
+        'payloads': payloads
+    }
+
+
+def _batch_to_upsert(batch: Dict[str, Any]) -> Batch:
+    """Turn a columnar batch into a Qdrant Batch, converting the matrix in one call"""
+    vectors = {VECTOR_NAME: batch['vectors'].tolist()}
+    if batch['sparse'] is not None:
+        vectors[SPARSE_VECTOR_NAME] = batch['sparse']
+    return Batch(ids=batch['ids'], vectors=vectors, payloads=batch['payloads'])
+
+
+def _merge_batches(batches: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Concatenate columnar batches"""
+    return {
+        'ids': [point_id for batch in batches for point_id in batch['ids']],
+        'vectors': np.concatenate([batch['vectors'] for batch in batches]),
+        'sparse': None if batches[0]['sparse'] is None else [vector for batch in batches for vector in batch['sparse']],
+        'payloads': [payload for batch in batches for payload in batch['payloads']]
+    }
+
+
+def _slice_batch(batch: Dict[str, Any], start: int, end: Optional[int] = None) -> Dict[str, Any]:
+    """Rows [start:end] of a columnar batch"""
+    return {
+        'ids': batch['ids'][start:end],
+        'vectors': batch['vectors'][start:end],
+        'sparse': None if batch['sparse'] is None else batch['sparse'][start:end],
+        'payloads': batch['payloads'][start:end]
+    }
+
+
+def _print_cache_stats():
+    """Report embedding cache effectiveness after an ingest run"""
+    cache = get_embedding_cache(model_cache_key(EMBEDDING_MODEL), VECTOR_SIZE)
+    if cache:
+        cache.flush()
+        stats = cache.stats()
+        print(f"   Embedding cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%} hit rate), {stats['entries']}/{stats['capacity']} entries")
+
+
+def _print_batch_stats():
+    """Report padding and throughput of the model calls made during an ingest run"""
+    stats = embedding_batch_stats.summary()
+    if stats['batches']:
+        print(f"   Embedding batches: {stats['batches']} batches, {stats['rows']} texts, "
+              f"{stats['padding_ratio']:.0%} padding, {stats['tokens_per_s']:.0f} tokens/s")
+
+
+def iter_csv_rows(csv_path: str) -> Iterator[Dict[str, str]]:
+    """Stream company rows with a non-empty description from the CSV"""
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            if row.get('description', '').strip():
+                yield row
+
+
+# Queue sentinels: _STOP marks the end of a producer's stream, _DONE wakes idle consumers
+_STOP = object()
+_DONE = object()
+
+
+def _put_until_stopped(q: queue.Queue, item: Any, stop: threading.Event):
+    """Block on a bounded queue (backpressure) but give up once the pipeline stops"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.5)
+            return
+        except queue.Full:
+            continue
+
+
+def _get_until_stopped(q: queue.Queue, stop: threading.Event) -> Any:
+    """Block on a queue until an item arrives or the pipeline stops"""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.5)
+        except queue.Empty:
+            continue
+    return _STOP
+
+
+def run_ingest_pipeline(
+    client: QdrantClient,
+    rows: Iterable[Dict[str, str]],
+    collection_name: str = COLLECTION_NAME,
+    embedding_model: Optional[TextEmbedding] = None,
+    chunk_size: int = 200,
+    batch_size: int = 256,
+    max_workers: int = 8,
+    upload_workers: int = 2,
+    queue_size: int = 8,
+    sort_window: int = 2048
+) -> int:
+    """
+    Stream rows through embedding and upsert stages connected by bounded queues
+
+    reader -> [chunk queue] -> embed workers -> [points queue] -> upload workers
+
+    Each queue holds at most `queue_size` items, so a slow stage blocks the
+    one feeding it instead of letting rows pile up in memory. Peak memory is
+    bounded by the queue sizes rather than the dataset size, and upserts run
+    while later chunks are still being embedded. Returns the number of points
+    uploaded.
+
+    The reader buffers up to `sort_window` rows and cuts them into chunks of
+    similar description length under the embedding token budget (at most
+    `chunk_size` rows each), so model batches carry little padding.
+    """
+    # Fill the BM25 vector whenever the collection has one (older collections may not)
+    include_sparse = collection_has_sparse_vectors(client, collection_name)
+    embedding_batch_stats.reset()
+    chunk_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    points_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors: List[BaseException] = []
+    counters = {'embedded': 0, 'uploaded': 0, 'batches': 0}
+    counters_lock = threading.Lock()
+
+    def fail(e: BaseException):
+        errors.append(e)
+        stop.set()
+
+    def emit_window(window: List[Dict[str, str]]):
+        texts = [row.get('description', '').strip() for row in window]
+        for batch in plan_batches(texts, max_batch_size=chunk_size):
+            _put_until_stopped(chunk_queue, [window[i] for i in batch], stop)
+
+    def read_stage():
+        try:
+            window = []
+            for row in rows:
+                window.append(row)
+                if len(window) >= sort_window:
+                    emit_window(window)
+                    window = []
+            if window:
+                emit_window(window)
+        except BaseException as e:
+            fail(e)
+        finally:
+            for _ in range(max_workers):
+                _put_until_stopped(chunk_queue, _STOP, stop)
+
+    def embed_stage():
+        try:
+            while True:
+                chunk = _get_until_stopped(chunk_queue, stop)
+                if chunk is _STOP:
+                    break
+                embedded = create_batch_from_chunk(chunk, embedding_model, include_sparse=include_sparse)
+                if embedded is None:
+                    continue
+                with counters_lock:
+                    counters['embedded'] += len(embedded['ids'])
+                _put_until_stopped(points_queue, embedded, stop)
+        except BaseException as e:
+            fail(e)
+        finally:
+            _put_until_stopped(points_queue, _STOP, stop)
+
+    def upload_batch(batch: Dict[str, Any]):
+        client.upsert(collection_name=collection_name, points=_batch_to_upsert(batch), wait=True)
+        with counters_lock:
+            counters['uploaded'] += len(batch['ids'])
+            counters['batches'] += 1
+            if counters['batches'] % 10 == 0:
+                print(f"Uploaded {counters['uploaded']} points ({counters['embedded']} embedded so far)...")
+
+    def upload_stage(finished_embedders: List[int]):
+        pending: List[Dict[str, Any]] = []
+        pending_rows = 0
+        try:
+            while True:
+                embedded = _get_until_stopped(points_queue, stop)
+                if embedded is _DONE:
+                    break
+                if embedded is _STOP:
+                    with counters_lock:
+                        finished_embedders[0] += 1
+                        all_done = finished_embedders[0] >= max_workers
+                    if all_done:
+                        # Wake the other uploaders so they flush and exit too
+                        for _ in range(upload_workers - 1):
+                            _put_until_stopped(points_queue, _DONE, stop)
+                        break
+                    continue
+                pending.append(embedded)
+                pending_rows += len(embedded['ids'])
+                if pending_rows >= batch_size:
+                    merged = _merge_batches(pending)
+                    start = 0
+                    while pending_rows - start >= batch_size:
+                        upload_batch(_slice_batch(merged, start, start + batch_size))
+                        start += batch_size
+                    pending = [_slice_batch(merged, start)] if start < pending_rows else []
+                    pending_rows -= start
+            if pending_rows and not stop.is_set():
+                upload_batch(_merge_batches(pending))
+        except BaseException as e:
+            fail(e)
+
+    finished_embedders = [0]
+    threads = [threading.Thread(target=read_stage, name="ingest-reader", daemon=True)]
+    threads += [threading.Thread(target=embed_stage, name=f"ingest-embed-{i}", daemon=True) for i in range(max_workers)]
+    threads += [
+        threading.Thread(target=upload_stage, args=(finished_embedders,), name=f"ingest-upload-{i}", daemon=True)
+        for i in range(upload_workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+    return counters['uploaded']
+
+
+def start_embedding_engine(embed_processes: Optional[int] = None, embed_threads: Optional[int] = None):
+    """
+    Start a multi-process EmbeddingEngine for an ingest run, or return None
+    to embed in-process (embed_processes <= 0, the EMBED_PROCESSES default)
+    """
+    from lib.embedding_engine import EmbeddingEngine, EMBED_PROCESSES, EMBED_THREADS_PER_PROCESS
+    
+    processes = EMBED_PROCESSES if embed_processes is None else embed_processes
+    if processes <= 0:
+        return None
+    return EmbeddingEngine(
+        num_workers=processes,
+        threads_per_worker=embed_threads or EMBED_THREADS_PER_PROCESS
+    ).start()
 
 
 def upload_companies_from_csv(
     csv_path: str, 
     collection_name: str = COLLECTION_NAME,
-    batch_size: int = 256,  # Increased batch size for better performance
-    max_workers: int = 8,    # Parallel workers for processing
-    recreate: bool = True    # Recreate collection to ensure clean state
+    batch_size: int = 256,  # Points per upsert request
+    max_workers: int = 8,    # Parallel embedding workers
+    recreate: bool = True,   # Recreate collection to ensure clean state
+    chunk_size: int = 200,   # Rows per embedding batch
+    upload_workers: int = 2, # Parallel upsert workers
+    queue_size: int = 8,     # Max chunks buffered between pipeline stages
+    profile: Optional[str] = None,  # Collection profile (see COLLECTION_PROFILES)
+    embed_processes: Optional[int] = None,  # Embedding worker processes (default EMBED_PROCESSES)
+    embed_threads: Optional[int] = None     # Intra-op threads per embedding process
 ):
-    """Load companies from CSV and upload to Qdrant with parallelization"""
-    import csv
-    
-    client = get_qdrant_client()
-    create_collection(client, collection_name, recreate=recreate)
-    
-    # Step 1: Read all rows from CSV
-    print("Reading CSV file...")
-    rows = []
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = [row for row in reader if row.get('description', '').strip()]
-    
-    print(f"Found {len(rows)} companies to process")
-    
-    # Initialize embedding model once (shared across threads)
-    print(f"Initializing embedding model: {EMBEDDING_MODEL}...")
-    embedding_model = TextEmbedding(model_name=EMBEDDING_MODEL)
-    
-    # Step 2: Create points in parallel batches with batched embedding generation
-    print(f"Creating points with {max_workers} workers...")
-    points = []
+    """
+    Stream companies from CSV into Qdrant, overlapping embedding and upload
+
+    Duplicate rows of the same company are merged first (see lib/dedup.py).
+    """
+    from lib.dedup import DEDUP_REPORT_PATH, load_deduplicated_rows
     
-    # Process in chunks - each chunk will generate embeddings in batch
-    chunk_size = 200  # Process 200 rows at a time for embedding generation
-    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    client = get_pooled_client()
+    create_collection(client, collection_name, recreate=recreate, profile=profile)
     
-    # Process chunks in parallel
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all chunks
-        futures = [executor.submit(create_points_from_chunk, chunk, embedding_model) for chunk in chunks]
-        
-        # Collect results as they complete
-        for i, future in enumerate(as_completed(futures)):
-            chunk_points = future.result()
-            points.extend(chunk_points)
-            print(f"Processed chunk {i+1}/{len(chunks)} ({len(points)} points so far)...")
+    rows = load_deduplicated_rows(csv_path, report_path=DEDUP_REPORT_PATH)
     
-    print(f"Created {len(points)} points, uploading to Qdrant...")
+    print(f"Streaming {csv_path} with {max_workers} embedding workers...")
     print(f"Using vector name: {VECTOR_NAME}")
-    
-    # Step 3: Upload all points at once with parallel parameter
-    # Qdrant's upload_points handles parallelization internally
     start_time = time.time()
+    engine = start_embedding_engine(embed_processes, embed_threads)
     try:
-        client.upload_points(
+        uploaded = run_ingest_pipeline(
+            client,
+            iter(rows),
             collection_name=collection_name,
-            points=points,
+            embedding_model=engine,
+            chunk_size=chunk_size,
             batch_size=batch_size,
-            parallel=16  # Qdrant internal parallelization
+            max_workers=max_workers,
+            upload_workers=upload_workers,
+            queue_size=queue_size
         )
     except Exception as e:
-        client.close()
+        client_pool.report_failure(client)
         raise ValueError(f"Error uploading points: {e}")
+    finally:
+        if engine is not None:
+            engine.close()
     
     upload_time = time.time() - start_time
     
-    print(f"Upload completed in {upload_time:.2f} seconds")
+    print(f"Embedded and uploaded {uploaded} points in {upload_time:.2f} seconds")
+    _print_cache_stats()
+    _print_batch_stats()
     
     # Wait for collection to be ready
     print("Waiting for collection to be ready...")
@@ -172,61 +704,424 @@ def upload_companies_from_csv(
     actual_points = collection_info.points_count
     
     if actual_points == 0:
-        print(f"⚠️  Warning: Collection shows 0 points after upload!")
-        print(f"   Expected: {len(points)}")
-        print(f"   This might indicate a vector name mismatch or upload issue")
+        print("⚠️  Warning: Collection shows 0 points after upload!")
+        print(f"   Expected: {uploaded}")
+        print("   This might indicate a vector name mismatch or upload issue")
     else:
         print(f"✅ Successfully uploaded {actual_points} companies to Qdrant")
-        print(f"   Average: {actual_points/upload_time:.1f} points/second")
+        print(f"   Average: {uploaded/upload_time:.1f} points/second")
+    bump_index_generation()
+
+
+def fetch_indexed_hashes(client: QdrantClient, collection_name: str = COLLECTION_NAME) -> Dict[int, str]:
+    """Map point ID -> stored content hash for every point in the collection"""
+    hashes = {}
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=collection_name,
+            limit=1000,
+            offset=offset,
+            with_payload=['content_hash'],
+            with_vectors=False
+        )
+        for record in records:
+            hashes[record.id] = (record.payload or {}).get('content_hash', '')
+        if offset is None:
+            break
+    return hashes
+
+
+def sync_companies_from_csv(
+    csv_path: str,
+    collection_name: str = COLLECTION_NAME,
+    batch_size: int = 256,
+    max_workers: int = 8,
+    chunk_size: int = 200,
+    upload_workers: int = 2,
+    queue_size: int = 8,
+    delete_batch_size: int = 1000,
+    profile: Optional[str] = None,
+    embed_processes: Optional[int] = None,
+    embed_threads: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Incrementally bring the collection in line with the CSV
+
+    Only new or changed companies (by content hash) are embedded and upserted,
+    and points whose companies left the CSV are deleted. The collection is
+    never dropped, so searches keep being served during the sync. `profile`
+    only applies when the collection does not exist yet. `embed_processes`
+    moves embedding into worker processes (see start_embedding_engine).
+    Duplicate rows are merged first (see lib/dedup.py), so the points of
+    dropped duplicates are deleted like those of removed companies.
+    """
+    from lib.dedup import DEDUP_REPORT_PATH, load_deduplicated_rows
+    
+    client = get_pooled_client()
+    if not client.collection_exists(collection_name=collection_name):
+        create_collection(client, collection_name, profile=profile)
+    
+    print(f"Fetching content hashes from '{collection_name}'...")
+    indexed = fetch_indexed_hashes(client, collection_name)
+    print(f"Collection currently holds {len(indexed)} points")
+    
+    rows = load_deduplicated_rows(csv_path, report_path=DEDUP_REPORT_PATH)
+    stats = {'new': 0, 'changed': 0, 'unchanged': 0, 'deleted': 0}
+    seen_ids = set()
+    
+    def changed_rows():
+        for row in rows:
+            point_id = company_point_id(row)
+            seen_ids.add(point_id)
+            stored_hash = indexed.get(point_id)
+            if stored_hash is None:
+                stats['new'] += 1
+            elif stored_hash != company_content_hash(row):
+                stats['changed'] += 1
+            else:
+                stats['unchanged'] += 1
+                continue
+            yield row
+    
+    start_time = time.time()
+    engine = start_embedding_engine(embed_processes, embed_threads)
+    try:
+        upserted = run_ingest_pipeline(
+            client,
+            changed_rows(),
+            collection_name=collection_name,
+            embedding_model=engine,
+            chunk_size=chunk_size,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            upload_workers=upload_workers,
+            queue_size=queue_size
+        )
+        
+        stale_ids = [point_id for point_id in indexed if point_id not in seen_ids]
+        for i in range(0, len(stale_ids), delete_batch_size):
+            client.delete(
+                collection_name=collection_name,
+                points_selector=PointIdsList(points=stale_ids[i:i + delete_batch_size]),
+                wait=True
+            )
+        stats['deleted'] = len(stale_ids)
+    except Exception as e:
+        client_pool.report_failure(client)
+        raise ValueError(f"Error syncing points: {e}")
+    finally:
+        if engine is not None:
+            engine.close()
+    
+    print(f"✅ Sync completed in {time.time() - start_time:.2f} seconds: "
+          f"{stats['new']} new, {stats['changed']} changed, "
+          f"{stats['unchanged']} unchanged, {stats['deleted']} deleted "
+          f"({upserted} points upserted)")
+    _print_cache_stats()
+    _print_batch_stats()
+    if upserted or stats['deleted']:
+        bump_index_generation()
     
-    client.close()
+    return stats
 
 
 def search_similar_companies(
     idea_pitch: str,
     limit: int = 3,
-    collection_name: str = COLLECTION_NAME
+    collection_name: str = COLLECTION_NAME,
+    client: Optional[QdrantClient] = None,
+    backend: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    mode: str = "dense",
+    payload_source: Optional[str] = None,
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Search for similar companies using semantic search
+
+    `backend` (default SEARCH_BACKEND) selects the Qdrant collection or the
+    in-process local index. `filters` restricts results by industry, batch
+    or batch year (see build_search_filter); Qdrant applies them through
+    payload indexes during the vector search. `mode="hybrid"` also ranks by
+    the BM25 sparse vector and fuses both rankings server-side (reciprocal
+    rank fusion, so scores are fusion scores rather than cosine). Without
+    an explicit client, a shared client from the process-wide pool is used.
+    `payload_source="local"` (default SEARCH_PAYLOAD_SOURCE) requests IDs and
+    scores only and reads payloads from the local payload store.
+    
+    Repeated (and, with QUERY_CACHE_SEMANTIC, near-identical) pitches are
+    answered from the query cache (see lib/query_cache.py); `use_cache=False`
+    bypasses it, e.g. for benchmarks that must measure the search itself.
+    """
+    backend = backend or SEARCH_BACKEND
+    payload_source = payload_source or SEARCH_PAYLOAD_SOURCE
+    _check_search_mode(backend, mode)
+    _check_payload_source(payload_source)
+    
+    cache = get_query_cache() if use_cache else None
+    context = search_context(collection=collection_name, backend=backend, mode=mode, limit=limit, filters=filters)
+    query_embedding = None
+    if cache:
+        cached, query_embedding = cache.lookup(idea_pitch, context)
+        if cached is not None:
+            return cached
+    if query_embedding is None:
+        # Generate embedding explicitly for the query (cached, model loaded once per process)
+        query_embedding = embed_texts([idea_pitch])[0]
+    if cache:
+        cached = cache.lookup_similar(query_embedding, context)
+        if cached is not None:
+            return cached
+    
+    if backend == "local":
+        results = _search_local(idea_pitch, limit, filters, query_embedding)
+    else:
+        results = _search_qdrant(idea_pitch, query_embedding, limit, collection_name, client, filters, mode, payload_source)
+    if cache:
+        cache.put(idea_pitch, context, query_embedding, results)
+    return results
+
+
+def _search_qdrant(
+    idea_pitch: str,
+    query_embedding: np.ndarray,
+    limit: int,
+    collection_name: str,
+    client: Optional[QdrantClient],
+    filters: Optional[Dict[str, Any]],
+    mode: str,
+    payload_source: str
 ) -> List[Dict[str, Any]]:
-    """Search for similar companies using semantic search"""
-    client = get_qdrant_client()
+    """One search_similar_companies query against Qdrant"""
+    query_filter = build_search_filter(filters)
+    client = client or get_pooled_client()
     
     if not client.collection_exists(collection_name=collection_name):
         raise ValueError(f"Collection '{collection_name}' does not exist. Run setup script first.")
     
-    # Generate embedding explicitly for the query
-    embedding_model = TextEmbedding(model_name=EMBEDDING_MODEL)
-    query_embedding = list(embedding_model.embed([idea_pitch]))[0].tolist()
+    sparse_embedding = embed_sparse_queries([idea_pitch])[0] if mode == "hybrid" else None
+    thin = payload_source == "local"
+    request = build_query_request(query_embedding, sparse_embedding, limit, query_filter, with_payload=not thin)
     
-    # Search using query_points with explicit vector
+    # Search using query_points with explicit vector(s)
     try:
         results = client.query_points(
             collection_name=collection_name,
-            query=query_embedding,
-            using=VECTOR_NAME,
-            limit=limit
+            query=request.query,
+            using=request.using,
+            prefetch=request.prefetch,
+            query_filter=request.filter,
+            search_params=request.params,
+            limit=limit,
+            with_payload=request.with_payload,
+            with_vectors=False
         )
     except Exception as e:
-        client.close()
+        client_pool.report_failure(client)
         raise ValueError(f"Error querying Qdrant: {e}")
     
     # Check if we got results
     if not hasattr(results, 'points') or not results.points:
-        client.close()
         return []
     
     # Format results
-    similar_companies = []
-    for point in results.points:
-        similar_companies.append({
-            'name': point.payload.get('name', ''),
-            'description': point.payload.get('description', ''),
-            'main_industry': point.payload.get('main_industry', ''),
-            'sub_industry': point.payload.get('sub_industry', ''),
-            'batch': point.payload.get('batch', ''),
-            'url': point.payload.get('url', ''),
-            'similarity_score': point.score
-        })
-    
-    client.close()
-    return similar_companies
+    if thin:
+        return hydrate_search_results(client, collection_name, [results.points])[0]
+    return [format_search_result(point.payload, point.score) for point in results.points]
+
+
+def search_similar_companies_batch(
+    pitches: List[str],
+    limit: int = 3,
+    collection_name: str = COLLECTION_NAME,
+    client: Optional[QdrantClient] = None,
+    backend: Optional[str] = None,
+    request_batch_size: int = 512,
+    filters: Optional[Dict[str, Any]] = None,
+    mode: str = "dense",
+    payload_source: Optional[str] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Search for many idea pitches at once, returning one result list per pitch in input order
+
+    All pitches are embedded up front (through the embedding cache, in
+    length-sorted batches), then sent as batched query_batch_points requests
+    of `request_batch_size` searches each, so a batch costs a few model calls
+    and a handful of round trips instead of one of each per pitch. `filters`,
+    `mode` and `payload_source` apply to every pitch.
+    """
+    if not pitches:
+        return []
+    
+    backend = backend or SEARCH_BACKEND
+    payload_source = payload_source or SEARCH_PAYLOAD_SOURCE
+    _check_search_mode(backend, mode)
+    _check_payload_source(payload_source)
+    
+    query_filter = build_search_filter(filters)
+    query_embeddings = embed_texts(pitches)
+    sparse_embeddings = embed_sparse_queries(pitches) if mode == "hybrid" else [None] * len(pitches)
+    
+    if backend == "local":
+        return _search_local_batch(query_embeddings, limit, request_batch_size, filters)
+    
+    client = client or get_pooled_client()
+    thin = payload_source == "local"
+    
+    all_results: List[List[Dict[str, Any]]] = []
+    try:
+        for start in range(0, len(pitches), request_batch_size):
+            requests = [
+                build_query_request(embedding, sparse_embedding, limit, query_filter, with_payload=not thin)
+                for embedding, sparse_embedding in zip(
+                    query_embeddings[start:start + request_batch_size],
+                    sparse_embeddings[start:start + request_batch_size]
+                )
+            ]
+            responses = client.query_batch_points(collection_name=collection_name, requests=requests)
+            if thin:
+                all_results.extend(hydrate_search_results(client, collection_name, [response.points for response in responses]))
+            else:
+                for response in responses:
+                    all_results.append([format_search_result(point.payload, point.score) for point in response.points])
+    except Exception as e:
+        client_pool.report_failure(client)
+        raise ValueError(f"Error querying Qdrant: {e}")
+    
+    return all_results
+
+
+def _check_search_mode(backend: str, mode: str):
+    """Validate a backend/mode combination"""
+    if backend not in ("qdrant", "local"):
+        raise ValueError(f"Unknown search backend '{backend}' (expected 'qdrant' or 'local')")
+    if mode not in ("dense", "hybrid"):
+        raise ValueError(f"Unknown search mode '{mode}' (expected 'dense' or 'hybrid')")
+    if mode == "hybrid" and backend == "local":
+        raise ValueError("Hybrid search needs the Qdrant backend (the local index is dense-only)")
+
+
+def build_query_request(
+    query_embedding: np.ndarray,
+    sparse_embedding: Optional[SparseVector],
+    limit: int,
+    query_filter: Optional[Filter] = None,
+    prefetch_limit: int = HYBRID_PREFETCH_LIMIT,
+    profile: Optional[str] = None,
+    with_payload: bool = True
+) -> QueryRequest:
+    """
+    Dense query, or a hybrid query when a sparse vector is given
+
+    The hybrid form prefetches candidates from the dense and BM25 vectors and
+    fuses the two rankings with reciprocal rank fusion, all in one request.
+    Dense searches use the collection profile's search params (ef, rescoring).
+    `with_payload=False` returns IDs and scores only (thin responses).
+    """
+    search_params = get_collection_profile(profile)['search_params']
+    if sparse_embedding is None:
+        return QueryRequest(
+            query=query_embedding.tolist(),
+            using=VECTOR_NAME,
+            filter=query_filter,
+            params=search_params,
+            limit=limit,
+            with_payload=with_payload,
+            with_vector=False
+        )
+    prefetch_limit = max(prefetch_limit, limit)
+    return QueryRequest(
+        prefetch=[
+            Prefetch(
+                query=query_embedding.tolist(),
+                using=VECTOR_NAME,
+                filter=query_filter,
+                params=search_params,
+                limit=prefetch_limit
+            ),
+            Prefetch(query=sparse_embedding, using=SPARSE_VECTOR_NAME, filter=query_filter, limit=prefetch_limit),
+        ],
+        query=FusionQuery(fusion=Fusion.RRF),
+        limit=limit,
+        with_payload=with_payload,
+        with_vector=False
+    )
+
+
+def format_search_result(payload: Dict[str, Any], score: float) -> Dict[str, Any]:
+    """Shape a hit's payload and score into the result dict returned by searches"""
+    result = {field: payload.get(field, '') for field in PAYLOAD_FIELDS}
+    result['similarity_score'] = score
+    return result
+
+
+def _check_payload_source(payload_source: str):
+    if payload_source not in ("qdrant", "local"):
+        raise ValueError(f"Unknown payload source '{payload_source}' (expected 'qdrant' or 'local')")
+
+
+def hydrate_search_results(
+    client: QdrantClient,
+    collection_name: str,
+    responses: List[List[Any]]
+) -> List[List[Dict[str, Any]]]:
+    """
+    Fill in payloads for thin (ID + score) hits from the local payload store
+
+    All hits of all responses are looked up in one pass; IDs the store does
+    not know (e.g. added since it was built) are fetched from Qdrant.
+    """
+    from lib.payload_store import get_payload_store
+    
+    point_ids = [point.id for points in responses for point in points]
+    payloads = get_payload_store().get_many(point_ids)
+    missing = [point_id for point_id in dict.fromkeys(point_ids) if point_id not in payloads]
+    if missing:
+        for record in client.retrieve(collection_name=collection_name, ids=missing, with_payload=PAYLOAD_FIELDS):
+            payloads[record.id] = record.payload or {}
+    return [
+        [format_search_result(payloads.get(point.id, {}), point.score) for point in points]
+        for points in responses
+    ]
+
+
+def _search_local_batch(
+    query_embeddings: np.ndarray,
+    limit: int,
+    chunk_size: int,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[List[Dict[str, Any]]]:
+    """Exact batched search against the local index, one matmul per chunk of queries"""
+    from lib.local_index import get_local_index
+    
+    index = get_local_index()
+    mask = index.filter_mask(filters)
+    all_results = []
+    for start in range(0, len(query_embeddings), chunk_size):
+        rows, scores = index.search_rows(query_embeddings[start:start + chunk_size], limit, mask)
+        for query_rows, query_scores in zip(rows, scores):
+            all_results.append([
+                format_search_result(index.payload(int(row)), float(score))
+                for row, score in zip(query_rows, query_scores)
+            ])
+    return all_results
+
+
+def _search_local(
+    idea_pitch: str,
+    limit: int,
+    filters: Optional[Dict[str, Any]] = None,
+    query_embedding: Optional[np.ndarray] = None
+) -> List[Dict[str, Any]]:
+    """Exact search against the in-process NumPy index (no network)"""
+    from lib.local_index import get_local_index
+    
+    index = get_local_index()
+    if query_embedding is None:
+        query_embedding = embed_texts([idea_pitch])[0]
+    return [
+        format_search_result(payload, score)
+        for _, payload, score in index.search(query_embedding, limit=limit, mask=index.filter_mask(filters))
+    ]
 
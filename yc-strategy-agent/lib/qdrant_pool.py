@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+"""
+Long-lived, health-checked Qdrant client pools
+
+A gRPC QdrantClient multiplexes concurrent requests over one channel, so a
+process needs a handful of clients, not one per call. The pools below keep
+`size` clients open and hand them out round-robin. A client is health
+checked (a cheap get_collections call) when it has not been checked for
+`health_check_interval` seconds or after a caller reported a failure, and
+is closed and reconnected when the check fails.
+
+QdrantClientPool serves the sync QdrantClient, AsyncQdrantClientPool the
+AsyncQdrantClient used by the async search and upload functions.
+"""
+import os
+import time
+import asyncio
+import itertools
+import threading
+from typing import Callable, List, Any, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+QDRANT_POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", "2"))
+QDRANT_HEALTH_CHECK_INTERVAL = float(os.getenv("QDRANT_HEALTH_CHECK_INTERVAL", "30"))
+
+
+class _PoolSlot:
+    """One pooled client and when it was last known to be healthy"""
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.checked_at = time.monotonic()
+        self.suspect = False
+        self.checking = False
+
+
+class QdrantClientPool:
+    """Round-robin pool of sync clients with lazy health checks and reconnects"""
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int = QDRANT_POOL_SIZE,
+        health_check_interval: float = QDRANT_HEALTH_CHECK_INTERVAL
+    ):
+        self.factory = factory
+        self.size = max(1, size)
+        self.health_check_interval = health_check_interval
+        self.reconnects = 0
+        self._slots: List[_PoolSlot] = []
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """Return a healthy client; it stays owned by the pool (do not close it)"""
+        with self._lock:
+            if len(self._slots) < self.size:
+                slot = _PoolSlot(self.factory())
+                self._slots.append(slot)
+                return slot.client
+            slot = self._slots[next(self._next) % self.size]
+            due = slot.suspect or time.monotonic() - slot.checked_at > self.health_check_interval
+            if slot.checking or not due:
+                return slot.client
+            slot.checking = True
+            client = slot.client
+        # Ping outside the lock: a slow server must not hold up callers of the other slots
+        try:
+            return self._check(slot, client)
+        finally:
+            slot.checking = False
+
+    def _check(self, slot: _PoolSlot, client: Any) -> Any:
+        """Ping a client and replace it if the ping fails; returns the slot's client"""
+        try:
+            client.get_collections()
+        except Exception as e:
+            print(f"⚠️  Qdrant client unhealthy ({e}), reconnecting")
+            try:
+                client.close()
+            except Exception:
+                pass
+            client = self.factory()
+            with self._lock:
+                slot.client = client
+                self.reconnects += 1
+        with self._lock:
+            slot.checked_at = time.monotonic()
+            slot.suspect = False
+        return client
+
+    def report_failure(self, client: Any):
+        """Have a client health checked before it is handed out again"""
+        with self._lock:
+            for slot in self._slots:
+                if slot.client is client:
+                    slot.suspect = True
+
+    def stats(self) -> dict:
+        return {'size': self.size, 'open': len(self._slots), 'reconnects': self.reconnects}
+
+    def close(self):
+        """Close every pooled client"""
+        with self._lock:
+            for slot in self._slots:
+                try:
+                    slot.client.close()
+                except Exception:
+                    pass
+            self._slots = []
+
+
+class AsyncQdrantClientPool:
+    """Round-robin pool of AsyncQdrantClients, same policy as QdrantClientPool"""
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int = QDRANT_POOL_SIZE,
+        health_check_interval: float = QDRANT_HEALTH_CHECK_INTERVAL
+    ):
+        self.factory = factory
+        self.size = max(1, size)
+        self.health_check_interval = health_check_interval
+        self.reconnects = 0
+        self._slots: List[_PoolSlot] = []
+        self._next = itertools.count()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Clients of a previous event loop, closed on the next chance (or at exit)
+        self._abandoned: List[Any] = []
+
+    def _bind_loop(self):
+        """Async channels belong to one event loop; start afresh under a new one"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._abandoned.extend(slot.client for slot in self._slots)
+            self._slots = []
+            self._lock = asyncio.Lock()
+            self._loop = loop
+
+    @staticmethod
+    async def _close_clients(clients: List[Any]):
+        """Close clients, ignoring the ones whose loop is already gone"""
+        for client in clients:
+            try:
+                await client.close()
+            except Exception:
+                pass
+
+    async def get(self) -> Any:
+        """Return a healthy client; it stays owned by the pool (do not close it)"""
+        self._bind_loop()
+        if self._abandoned:
+            abandoned, self._abandoned = self._abandoned, []
+            await self._close_clients(abandoned)
+        async with self._lock:
+            if len(self._slots) < self.size:
+                slot = _PoolSlot(self.factory())
+                self._slots.append(slot)
+                return slot.client
+            slot = self._slots[next(self._next) % self.size]
+            if slot.suspect or time.monotonic() - slot.checked_at > self.health_check_interval:
+                await self._check(slot)
+            return slot.client
+
+    async def _check(self, slot: _PoolSlot):
+        """Ping a client and replace it if the ping fails"""
+        try:
+            await slot.client.get_collections()
+        except Exception as e:
+            print(f"⚠️  Async Qdrant client unhealthy ({e}), reconnecting")
+            try:
+                await slot.client.close()
+            except Exception:
+                pass
+            slot.client = self.factory()
+            self.reconnects += 1
+        slot.checked_at = time.monotonic()
+        slot.suspect = False
+
+    def report_failure(self, client: Any):
+        """Have a client health checked before it is handed out again"""
+        for slot in self._slots:
+            if slot.client is client:
+                slot.suspect = True
+
+    def stats(self) -> dict:
+        return {'size': self.size, 'open': len(self._slots), 'reconnects': self.reconnects}
+
+    async def close(self):
+        """Close every pooled client"""
+        self._bind_loop()
+        abandoned, self._abandoned = self._abandoned, []
+        await self._close_clients(abandoned)
+        async with self._lock:
+            await self._close_clients([slot.client for slot in self._slots])
+            self._slots = []
+
+    def shutdown(self):
+        """Close the clients still open at exit, outside any event loop (atexit hook)"""
+        clients = self._abandoned + [slot.client for slot in self._slots]
+        self._abandoned, self._slots = [], []
+        if not clients:
+            return
+        try:
+            asyncio.run(self._close_clients(clients))
+        except Exception:
+            pass
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+"""
+Two-level cache of search results in front of search_similar_companies
+
+1. Exact tier: an LRU keyed on the normalized pitch (whitespace collapsed).
+   Each entry keeps the pitch embedding and the results of every search
+   context (collection, backend, mode, limit, filters) it was run with, so
+   a repeat skips both the model and Qdrant, and the same pitch under new
+   filters still skips the model.
+2. Semantic tier (optional): when a pitch misses the exact tier, its
+   embedding is compared with the embeddings of cached searches in the same
+   context, and results are reused if the cosine distance to the closest
+   one is at most QUERY_CACHE_SEMANTIC_DISTANCE. Lightly edited pitches
+   ("AI CRM for startups" / "An AI CRM for start-ups") hit here.
+
+Entries expire after QUERY_CACHE_TTL seconds and both tiers are bounded in
+entries. Re-indexing (setup, sync, artifact restore, local index build)
+rewrites a generation marker file; every lookup compares it (one stat call)
+and drops the whole cache when it changed, including in other processes
+such as the search service.
+"""
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+from lib.embedding_cache import normalize_text
+
+load_dotenv()
+
+QUERY_CACHE_ENABLED = os.getenv("QUERY_CACHE", "true").lower() not in ("0", "false", "no")
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "1024"))
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "600"))
+QUERY_CACHE_SEMANTIC = os.getenv("QUERY_CACHE_SEMANTIC", "false").lower() in ("1", "true", "yes")
+QUERY_CACHE_SEMANTIC_SIZE = int(os.getenv("QUERY_CACHE_SEMANTIC_SIZE", "256"))
+QUERY_CACHE_SEMANTIC_DISTANCE = float(os.getenv("QUERY_CACHE_SEMANTIC_DISTANCE", "0.03"))
+INDEX_GENERATION_PATH = os.getenv(
+    "INDEX_GENERATION_PATH",
+    str(Path(__file__).parent.parent / "data" / "cache" / "index_generation")
+)
+
+
+def bump_index_generation(path: str = INDEX_GENERATION_PATH):
+    """Mark the indexed data as changed so every query cache drops its entries"""
+    marker = Path(path)
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.write_text(str(time.time_ns()), encoding='utf-8')
+
+
+def read_index_generation(path: str = INDEX_GENERATION_PATH) -> Optional[int]:
+    """Modification time of the marker file (ns), None while it does not exist"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def search_context(**params: Any) -> str:
+    """Canonical key of everything besides the pitch that shapes a result list"""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class _ExactEntry:
+    """A cached pitch: its embedding and results per search context"""
+
+    def __init__(self, embedding: np.ndarray):
+        self.embedding = embedding
+        self.results: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+
+
+class QueryCache:
+    """Exact LRU plus optional semantic tier, both with TTL and size bounds"""
+
+    def __init__(
+        self,
+        size: int = QUERY_CACHE_SIZE,
+        ttl: float = QUERY_CACHE_TTL,
+        semantic: bool = QUERY_CACHE_SEMANTIC,
+        semantic_size: int = QUERY_CACHE_SEMANTIC_SIZE,
+        semantic_distance: float = QUERY_CACHE_SEMANTIC_DISTANCE,
+        generation_path: str = INDEX_GENERATION_PATH
+    ):
+        self.size = size
+        self.ttl = ttl
+        self.semantic = semantic
+        self.semantic_size = semantic_size
+        self.semantic_distance = semantic_distance
+        self.generation_path = generation_path
+        self._exact: "OrderedDict[str, _ExactEntry]" = OrderedDict()
+        # (pitch, context) -> (created, unit embedding, results)
+        self._semantic: "OrderedDict[Tuple[str, str], Tuple[float, np.ndarray, List[Dict[str, Any]]]]" = OrderedDict()
+        self._generation = read_index_generation(generation_path)
+        self._lock = threading.Lock()
+        self.counters = {
+            'exact_hits': 0,
+            'semantic_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0,
+        }
+
+    def _check_generation(self, generation: Optional[int]):
+        """Drop everything when the index was rebuilt since the last lookup"""
+        if generation != self._generation:
+            self._exact.clear()
+            self._semantic.clear()
+            self._generation = generation
+            self.counters['invalidations'] += 1
+
+    def lookup(self, pitch: str, context: str) -> Tuple[Optional[List[Dict[str, Any]]], Optional[np.ndarray]]:
+        """
+        Exact-tier lookup: (results, embedding). Results are None on a miss;
+        the embedding is returned whenever the pitch itself is cached.
+        """
+        key = normalize_text(pitch)
+        now = time.monotonic()
+        generation = read_index_generation(self.generation_path)
+        with self._lock:
+            self._check_generation(generation)
+            entry = self._exact.get(key)
+            if entry is None:
+                return None, None
+            self._exact.move_to_end(key)
+            cached = entry.results.get(context)
+            if cached is not None:
+                if now - cached[0] <= self.ttl:
+                    self.counters['exact_hits'] += 1
+                    return _copy(cached[1]), entry.embedding
+                del entry.results[context]
+                self.counters['expirations'] += 1
+            return None, entry.embedding
+
+    def lookup_similar(self, embedding: np.ndarray, context: str) -> Optional[List[Dict[str, Any]]]:
+        """Semantic-tier lookup by query embedding; counts a miss when nothing is close enough"""
+        with self._lock:
+            if self.semantic and self._semantic:
+                now = time.monotonic()
+                for key in [key for key, (created, _, _) in self._semantic.items() if now - created > self.ttl]:
+                    del self._semantic[key]
+                    self.counters['expirations'] += 1
+                keys = [key for key in self._semantic if key[1] == context]
+                if keys:
+                    query = _unit(embedding)
+                    similarities = np.stack([self._semantic[key][1] for key in keys]) @ query
+                    best = int(np.argmax(similarities))
+                    if 1.0 - float(similarities[best]) <= self.semantic_distance:
+                        self._semantic.move_to_end(keys[best])
+                        self.counters['semantic_hits'] += 1
+                        return _copy(self._semantic[keys[best]][2])
+            self.counters['misses'] += 1
+            return None
+
+    def put(self, pitch: str, context: str, embedding: np.ndarray, results: List[Dict[str, Any]]):
+        """Store a search in both tiers"""
+        key = normalize_text(pitch)
+        now = time.monotonic()
+        results = _copy(results)
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry is None:
+                entry = self._exact[key] = _ExactEntry(np.asarray(embedding, dtype=np.float32))
+            self._exact.move_to_end(key)
+            entry.results[context] = (now, results)
+            while len(self._exact) > self.size:
+                self._exact.popitem(last=False)
+                self.counters['evictions'] += 1
+
+            if self.semantic:
+                self._semantic[(key, context)] = (now, _unit(embedding), results)
+                self._semantic.move_to_end((key, context))
+                while len(self._semantic) > self.semantic_size:
+                    self._semantic.popitem(last=False)
+                    self.counters['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._exact.clear()
+            self._semantic.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry counts, hit/miss counters and hit rates per tier"""
+        with self._lock:
+            counters = dict(self.counters)
+            exact_entries, semantic_entries = len(self._exact), len(self._semantic)
+        lookups = counters['exact_hits'] + counters['semantic_hits'] + counters['misses']
+        return {
+            'exact_entries': exact_entries,
+            'semantic_entries': semantic_entries,
+            'semantic': self.semantic,
+            **counters,
+            'exact_hit_rate': counters['exact_hits'] / lookups if lookups else 0.0,
+            'semantic_hit_rate': counters['semantic_hits'] / lookups if lookups else 0.0,
+            'hit_rate': (counters['exact_hits'] + counters['semantic_hits']) / lookups if lookups else 0.0,
+        }
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _copy(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Shallow copy of a result list, so callers cannot alter cached results"""
+    return [dict(result) for result in results]
+
+
+_query_cache: Optional[QueryCache] = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> Optional[QueryCache]:
+    """Return the process-wide query cache, or None when QUERY_CACHE is off"""
+    global _query_cache
+    if not QUERY_CACHE_ENABLED:
+        return None
+    with _query_cache_lock:
+        if _query_cache is None:
+            _query_cache = QueryCache()
+        return _query_cache
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+Readiness-driven waits for rendered pages
+
+Waiting for `networkidle` and then sleeping a fixed time is slow: pages with
+analytics and chat widgets rarely go network-idle, so the scrapers used to
+burn the whole 30 s timeout and the sleep on top. A ReadinessPolicy waits
+in stages instead, each bounded by what is left of a per-page budget:
+
+1. navigation until `domcontentloaded`
+2. the first of the policy's content selectors to be attached
+3. DOM stabilization: no mutation for `quiet_ms` milliseconds (policies
+   with quiet_ms=0 only settle when no selector showed up)
+
+Running out of budget is not an error; the page is read as it is then.
+wait() returns the navigation response and how long each stage took, and
+readiness_stats() aggregates the timings per policy.
+"""
+import os
+import time
+import threading
+from typing import List, Dict, Any, Tuple
+
+from dotenv import load_dotenv
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+load_dotenv()
+
+SCRAPE_PAGE_BUDGET_MS = float(os.getenv("SCRAPE_PAGE_BUDGET_MS", "15000"))
+SCRAPE_DOM_QUIET_MS = float(os.getenv("SCRAPE_DOM_QUIET_MS", "500"))
+
+# True once the DOM has not changed for `quiet` ms; the first call starts observing
+DOM_QUIET_CHECK = """
+    quiet => {
+        if (window.__lastDomMutation === undefined) {
+            window.__lastDomMutation = performance.now();
+            new MutationObserver(() => { window.__lastDomMutation = performance.now(); })
+                .observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+        }
+        return performance.now() - window.__lastDomMutation >= quiet;
+    }
+"""
+
+_STAGES = ('domcontentloaded_ms', 'selector_ms', 'stable_ms', 'total_ms')
+
+
+class ReadinessPolicy:
+    """Selectors to wait for, the DOM quiet period and the per-page budget"""
+
+    def __init__(
+        self,
+        name: str,
+        selectors: Tuple[str, ...] = (),
+        quiet_ms: float = SCRAPE_DOM_QUIET_MS,
+        budget_ms: float = SCRAPE_PAGE_BUDGET_MS
+    ):
+        self.name = name
+        self.selectors = selectors
+        self.quiet_ms = quiet_ms
+        self.budget_ms = budget_ms
+
+    def wait(self, page: Any, url: str) -> Tuple[Any, Dict[str, Any]]:
+        """Navigate a sync page to url and wait until it is ready or the budget is spent"""
+        start = time.perf_counter()
+        clock = _StageClock(start, self.budget_ms)
+        response = page.goto(url, wait_until="domcontentloaded", timeout=self.budget_ms)
+        timings = {'domcontentloaded_ms': clock.lap()}
+
+        found = False
+        if self.selectors:
+            try:
+                page.wait_for_selector(", ".join(self.selectors), state="attached", timeout=clock.remaining())
+                found = True
+            except PlaywrightTimeoutError:
+                timings['budget_exhausted'] = True
+            timings['selector_ms'] = clock.lap()
+
+        if (self.quiet_ms or not found) and not clock.spent():
+            try:
+                page.wait_for_function(DOM_QUIET_CHECK, arg=self.quiet_ms or SCRAPE_DOM_QUIET_MS,
+                                       polling=100, timeout=clock.remaining())
+            except PlaywrightTimeoutError:
+                timings['budget_exhausted'] = True
+            timings['stable_ms'] = clock.lap()
+
+        return response, self._finish(timings, found, start)
+
+    async def wait_async(self, page: Any, url: str) -> Tuple[Any, Dict[str, Any]]:
+        """Async counterpart of wait() for pages of the async browser pool"""
+        start = time.perf_counter()
+        clock = _StageClock(start, self.budget_ms)
+        response = await page.goto(url, wait_until="domcontentloaded", timeout=self.budget_ms)
+        timings = {'domcontentloaded_ms': clock.lap()}
+
+        found = False
+        if self.selectors:
+            try:
+                await page.wait_for_selector(", ".join(self.selectors), state="attached", timeout=clock.remaining())
+                found = True
+            except PlaywrightTimeoutError:
+                timings['budget_exhausted'] = True
+            timings['selector_ms'] = clock.lap()
+
+        if (self.quiet_ms or not found) and not clock.spent():
+            try:
+                await page.wait_for_function(DOM_QUIET_CHECK, arg=self.quiet_ms or SCRAPE_DOM_QUIET_MS,
+                                             polling=100, timeout=clock.remaining())
+            except PlaywrightTimeoutError:
+                timings['budget_exhausted'] = True
+            timings['stable_ms'] = clock.lap()
+
+        return response, self._finish(timings, found, start)
+
+    def _finish(self, timings: Dict[str, Any], found: bool, start: float) -> Dict[str, Any]:
+        timings['total_ms'] = (time.perf_counter() - start) * 1000
+        timings['selector_found'] = found
+        _record(self.name, timings)
+        return timings
+
+
+class _StageClock:
+    """Stage durations and the budget left, in milliseconds"""
+
+    def __init__(self, start: float, budget_ms: float):
+        self.start = self.last = start
+        self.budget_ms = budget_ms
+
+    def lap(self) -> float:
+        now = time.perf_counter()
+        elapsed, self.last = (now - self.last) * 1000, now
+        return elapsed
+
+    def spent(self) -> bool:
+        return (time.perf_counter() - self.start) * 1000 >= self.budget_ms
+
+    def remaining(self) -> float:
+        # Playwright treats a timeout of 0 as "no timeout"
+        return max(self.budget_ms - (time.perf_counter() - self.start) * 1000, 1.0)
+
+
+YC_LISTING_READINESS = ReadinessPolicy(
+    'yc_listing',
+    selectors=('script#__NEXT_DATA__', 'h1'),
+    quiet_ms=0
+)
+
+LANDING_PAGE_READINESS = ReadinessPolicy(
+    'landing_page',
+    selectors=('h1', 'main', '[role="main"]')
+)
+
+
+# Per policy and stage: [count, sum, max] in ms, so long-running processes keep constant memory
+_timings: Dict[str, Dict[str, List[float]]] = {}
+_counts: Dict[str, Dict[str, int]] = {}
+_timings_lock = threading.Lock()
+
+
+def _record(policy: str, timings: Dict[str, Any]):
+    with _timings_lock:
+        stages = _timings.setdefault(policy, {stage: [0, 0.0, 0.0] for stage in _STAGES})
+        counts = _counts.setdefault(policy, {'pages': 0, 'selector_found': 0, 'budget_exhausted': 0})
+        for stage in _STAGES:
+            if stage in timings:
+                aggregate = stages[stage]
+                aggregate[0] += 1
+                aggregate[1] += timings[stage]
+                aggregate[2] = max(aggregate[2], timings[stage])
+        counts['pages'] += 1
+        counts['selector_found'] += int(timings['selector_found'])
+        counts['budget_exhausted'] += int(timings.get('budget_exhausted', False))
+
+
+def readiness_stats() -> Dict[str, Dict[str, Any]]:
+    """Per policy: pages, selector hits, budget exhaustions and mean/max ms per stage"""
+    with _timings_lock:
+        stats = {}
+        for policy, stages in _timings.items():
+            stats[policy] = dict(_counts[policy])
+            for stage, (count, total, maximum) in stages.items():
+                if count:
+                    stats[policy][stage] = {'mean': total / count, 'max': maximum}
+        return stats
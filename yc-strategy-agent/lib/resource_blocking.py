@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+"""
+Request interception that keeps scraped pages from loading what we never read
+
+The scrapers only read text, meta tags, links and __NEXT_DATA__, yet a
+rendered page downloads every image, font, video, stylesheet and tracker.
+A ResourceBlocker routes all of a page's requests and aborts:
+- requests of a blocked resource type (SCRAPE_BLOCKED_RESOURCE_TYPES)
+- requests to a denylisted domain or its subdomains (analytics, ads, chat
+  widgets; extended with SCRAPE_BLOCKED_DOMAINS)
+
+The site's own domain (and so the page's document) is never blocked, even
+when it is on the denylist. Sites that break without some resource get
+an allowlist entry in SCRAPE_RESOURCE_ALLOWLIST, a JSON object from site
+domain to resource types and/or domains to let through, e.g.
+{"example.com": ["stylesheet", "cdn.example.com"]}.
+
+Blocked requests are never downloaded, so the bytes saved are estimated
+from typical sizes per resource type (ESTIMATED_BYTES).
+"""
+import os
+import json
+import threading
+from urllib.parse import urlparse
+from typing import List, Dict, Any, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SCRAPE_BLOCK_RESOURCES = os.getenv("SCRAPE_BLOCK_RESOURCES", "true").lower() not in ("0", "false", "no")
+SCRAPE_BLOCKED_RESOURCE_TYPES = [
+    resource_type.strip()
+    for resource_type in os.getenv("SCRAPE_BLOCKED_RESOURCE_TYPES", "image,media,font,stylesheet").split(",")
+    if resource_type.strip()
+]
+
+DEFAULT_BLOCKED_DOMAINS = [
+    'google-analytics.com', 'googletagmanager.com', 'googleadservices.com', 'doubleclick.net',
+    'googlesyndication.com', 'connect.facebook.net', 'analytics.twitter.com', 'ads.linkedin.com',
+    'snap.licdn.com', 'hotjar.com', 'segment.com', 'segment.io', 'mixpanel.com', 'amplitude.com',
+    'heap.io', 'heapanalytics.com', 'fullstory.com', 'clarity.ms', 'intercom.io', 'intercomcdn.com',
+    'js.hs-scripts.com', 'js.hs-analytics.net', 'hubspot.net', 'drift.com', 'crisp.chat',
+    'sentry.io', 'newrelic.com', 'nr-data.net', 'optimizely.com', 'posthog.com',
+]
+SCRAPE_BLOCKED_DOMAINS = DEFAULT_BLOCKED_DOMAINS + [
+    domain.strip().lower()
+    for domain in os.getenv("SCRAPE_BLOCKED_DOMAINS", "").split(",")
+    if domain.strip()
+]
+
+
+def _load_allowlist(raw: str) -> Dict[str, List[str]]:
+    """Parse SCRAPE_RESOURCE_ALLOWLIST; a malformed value is ignored, not fatal at import"""
+    try:
+        allowlist = json.loads(raw or "{}")
+    except json.JSONDecodeError as e:
+        print(f"⚠️  Ignoring SCRAPE_RESOURCE_ALLOWLIST, not valid JSON: {e}")
+        return {}
+    if not isinstance(allowlist, dict) or not all(
+        isinstance(entries, list) and all(isinstance(entry, str) for entry in entries)
+        for entries in allowlist.values()
+    ):
+        print("⚠️  Ignoring SCRAPE_RESOURCE_ALLOWLIST, expected an object of domain → list of strings")
+        return {}
+    return allowlist
+
+
+SCRAPE_RESOURCE_ALLOWLIST: Dict[str, List[str]] = _load_allowlist(os.getenv("SCRAPE_RESOURCE_ALLOWLIST", "{}"))
+
+# Typical transfer sizes, used to estimate the bytes a blocked request would have cost
+ESTIMATED_BYTES = {
+    'image': 40_000,
+    'media': 500_000,
+    'font': 30_000,
+    'stylesheet': 20_000,
+    'script': 50_000,
+    'xhr': 5_000,
+    'fetch': 5_000,
+}
+DEFAULT_ESTIMATED_BYTES = 5_000
+
+
+def _host(url: str) -> str:
+    return (urlparse(url).hostname or '').lower()
+
+
+def _on_domain(host: str, domain: str) -> bool:
+    """True when host is domain or one of its subdomains"""
+    return host == domain or host.endswith('.' + domain)
+
+
+class ResourceBlocker:
+    """Decides, per request, whether a page of one site loads it"""
+
+    def __init__(
+        self,
+        site_url: str,
+        resource_types: Optional[List[str]] = None,
+        domains: Optional[List[str]] = None,
+        allowlist: Optional[Dict[str, List[str]]] = None
+    ):
+        site = _host(site_url)
+        allowlist = SCRAPE_RESOURCE_ALLOWLIST if allowlist is None else allowlist
+        allowed = {
+            entry.lower()
+            for site_domain, entries in allowlist.items() if _on_domain(site, site_domain.lower())
+            for entry in entries
+        }
+        resource_types = SCRAPE_BLOCKED_RESOURCE_TYPES if resource_types is None else resource_types
+        domains = SCRAPE_BLOCKED_DOMAINS if domains is None else domains
+        self.site = site
+        self.blocked_types = {resource_type for resource_type in resource_types if resource_type not in allowed}
+        self.blocked_domains = [
+            domain for domain in domains
+            if domain not in allowed and not _on_domain(site, domain)
+        ]
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.blocked_types:
+            return True
+        host = _host(url)
+        return any(_on_domain(host, domain) for domain in self.blocked_domains)
+
+    def _decide(self, route: Any) -> bool:
+        request = route.request
+        blocked = self.should_block(request.resource_type, request.url)
+        _record_request(request.resource_type, blocked)
+        return blocked
+
+    def handle(self, route: Any):
+        """Route handler for sync pages"""
+        if self._decide(route):
+            route.abort()
+        else:
+            route.continue_()
+
+    async def handle_async(self, route: Any):
+        """Route handler for async pages"""
+        if self._decide(route):
+            await route.abort()
+        else:
+            await route.continue_()
+
+
+def block_resources(page: Any, url: str) -> Optional[ResourceBlocker]:
+    """Intercept a sync page's requests before it navigates to url (no-op when disabled)"""
+    if not SCRAPE_BLOCK_RESOURCES:
+        return None
+    blocker = ResourceBlocker(url)
+    page.route("**/*", blocker.handle)
+    _record_page()
+    return blocker
+
+
+async def block_resources_async(page: Any, url: str) -> Optional[ResourceBlocker]:
+    """Async counterpart of block_resources"""
+    if not SCRAPE_BLOCK_RESOURCES:
+        return None
+    blocker = ResourceBlocker(url)
+    await page.route("**/*", blocker.handle_async)
+    _record_page()
+    return blocker
+
+
+_counters = {'pages': 0, 'requests': 0, 'blocked': 0, 'bytes_saved_est': 0}
+_blocked_by_type: Dict[str, int] = {}
+_counters_lock = threading.Lock()
+
+
+def _record_page():
+    with _counters_lock:
+        _counters['pages'] += 1
+
+
+def _record_request(resource_type: str, blocked: bool):
+    with _counters_lock:
+        _counters['requests'] += 1
+        if blocked:
+            _counters['blocked'] += 1
+            _counters['bytes_saved_est'] += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+            _blocked_by_type[resource_type] = _blocked_by_type.get(resource_type, 0) + 1
+
+
+def resource_blocking_stats() -> Dict[str, Any]:
+    """Requests seen and blocked, estimated bytes saved, in total and per page"""
+    with _counters_lock:
+        counters = dict(_counters)
+        by_type = dict(_blocked_by_type)
+    pages = counters['pages']
+    return {
+        **counters,
+        'blocked_by_type': by_type,
+        'blocked_rate': counters['blocked'] / counters['requests'] if counters['requests'] else 0.0,
+        'blocked_per_page': counters['blocked'] / pages if pages else 0.0,
+        'bytes_saved_est_per_page': counters['bytes_saved_est'] / pages if pages else 0.0,
+    }
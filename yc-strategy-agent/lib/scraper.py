@@ -1,314 +1,481 @@
 #!/usr/bin/env python
 """
 Web scraping utilities for YC listings and landing pages
+
+YC listings are fetched in tiers: the raw HTML from a pooled HTTP session
+first (its __NEXT_DATA__ script and meta tags usually hold everything), and
+a Chromium render only when name, description or website are still
+missing. scrape_tier_stats() counts the pages each tier resolved.
+
+Scraped pages and their extracted data are kept in the page cache
+(lib/page_cache.py); a fresh or revalidated entry is returned without
+fetching or parsing anything.
 """
-import time
+import os
 import re
+import json
+import sqlite3
+import threading
 import requests
 from bs4 import BeautifulSoup
-from typing import Dict, Any, Optional
-from playwright.sync_api import sync_playwright
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Optional, Tuple
+
+from lib.browser_pool import get_browser_pool
+from lib.readiness import LANDING_PAGE_READINESS, YC_LISTING_READINESS
+from lib.resource_blocking import block_resources
+from lib.page_cache import get_page_cache, response_validators
+
+load_dotenv()
+
+SCRAPE_HTTP_FIRST = os.getenv("SCRAPE_HTTP_FIRST", "true").lower() not in ("0", "false", "no")
+SCRAPE_HTTP_TIMEOUT = float(os.getenv("SCRAPE_HTTP_TIMEOUT", "10"))
+SCRAPE_HTTP_POOL_SIZE = int(os.getenv("SCRAPE_HTTP_POOL_SIZE", "16"))
+SCRAPE_USER_AGENT = os.getenv(
+    "SCRAPE_USER_AGENT",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# A listing missing any of these after the HTTP tier is rendered in Chromium
+REQUIRED_YC_FIELDS = ('name', 'description', 'website')
+
+# Page props of a Next.js page (YC listings keep the company data there)
+NEXT_DATA_SCRIPT = """
+    () => {
+        if (window.__NEXT_DATA__) {
+            return window.__NEXT_DATA__.props.pageProps;
+        }
+        return null;
+    }
+"""
+
+_NEXT_DATA_RE = re.compile(r'<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.DOTALL)
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+_tier_counts = {'cache': 0, 'http': 0, 'browser': 0, 'escalations': 0, 'http_partial': 0, 'failed': 0}
+_tier_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Process-wide session, so listing fetches reuse pooled keep-alive connections"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=SCRAPE_HTTP_POOL_SIZE, pool_maxsize=SCRAPE_HTTP_POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({'User-Agent': SCRAPE_USER_AGENT, 'Accept-Language': 'en-US,en;q=0.9'})
+            _http_session = session
+        return _http_session
+
+
+def count_tier(tier: str):
+    """Count a listing resolved by a tier (see scrape_tier_stats)"""
+    with _tier_lock:
+        _tier_counts[tier] += 1
+
+
+def scrape_tier_stats() -> Dict[str, Any]:
+    """Listings served from the page cache, resolved by the HTTP tier and by the browser, escalations and failures"""
+    with _tier_lock:
+        counts = dict(_tier_counts)
+    resolved = counts['http'] + counts['browser'] + counts['http_partial']
+    return {**counts, 'http_rate': counts['http'] / resolved if resolved else 0.0}
+
+
+def extract_next_data(html: str) -> Optional[Dict[str, Any]]:
+    """Page props from the __NEXT_DATA__ script of server-rendered HTML"""
+    match = _NEXT_DATA_RE.search(html)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1)).get('props', {}).get('pageProps')
+    except (ValueError, AttributeError):
+        return None
+
+
+def has_required_fields(data: Dict[str, Any]) -> bool:
+    return all(data.get(field) for field in REQUIRED_YC_FIELDS)
+
+
+_page_cache_failed = False
+
+
+def _cache_failed(e: Exception):
+    """Report a broken page cache once; callers carry on as on a miss"""
+    global _page_cache_failed
+    if not _page_cache_failed:
+        _page_cache_failed = True
+        print(f"  ⚠️  Page cache unavailable ({e}), scraping without it")
+
+
+def _page_cache():
+    """The page cache, or None when it is off or cannot be opened"""
+    try:
+        return get_page_cache()
+    except (sqlite3.Error, OSError) as e:
+        _cache_failed(e)
+        return None
+
+
+def cached_page_data(url: str, source: str) -> Tuple[Optional[Dict[str, Any]], Optional[requests.Response]]:
+    """
+    (data, None) for a cached page that is fresh, or stale but confirmed
+    unchanged by a conditional GET (304). Otherwise data is None and the
+    page must be scraped; when the conditional GET already returned the new
+    page (2xx), that response comes second so it is not fetched again.
+    A cache that cannot be read counts as a miss.
+    """
+    cache = _page_cache()
+    if cache is None:
+        return None, None
+    try:
+        cached = cache.get(url, source)
+    except sqlite3.Error as e:
+        _cache_failed(e)
+        return None, None
+    if cached is None:
+        return None, None
+    if cached.fresh:
+        return cached.data, None
+    headers = cached.conditional_headers()
+    if not headers:
+        return None, None
+    try:
+        response = get_http_session().get(url, headers=headers, timeout=SCRAPE_HTTP_TIMEOUT)
+    except requests.RequestException:
+        return None, None
+    if response.status_code != 304:
+        return None, (response if response.ok else None)
+    try:
+        cache.mark_validated(url, source)
+    except sqlite3.Error as e:
+        _cache_failed(e)
+    return cached.data, None
+
+
+def cache_page(url: str, source: str, html: str, data: Dict[str, Any], headers: Any = None):
+    """Store a scraped page and its extracted data (failed scrapes are not cached)"""
+    cache = _page_cache()
+    if cache is None or 'error' in data:
+        return
+    try:
+        cache.put(url, source, html, data, **response_validators(headers))
+    except sqlite3.Error as e:
+        print(f"  ⚠️  Could not cache {url}: {e}")
+
+
+def fetch_yc_listing_http(
+    yc_url: str,
+    csv_data: Optional[Dict[str, str]] = None,
+    response: Optional[requests.Response] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Parse a listing from its raw HTML, without a browser; None when the
+    fetch fails. `response` is an already fetched page (a revalidation that
+    did not answer 304). Complete listings are cached.
+    """
+    if response is None:
+        try:
+            response = get_http_session().get(yc_url, timeout=SCRAPE_HTTP_TIMEOUT)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"  ⚠️  HTTP fetch of {yc_url} failed ({e}), rendering it instead")
+            return None
+    data = parse_yc_listing(response.text, yc_url, extract_next_data(response.text))
+    if has_required_fields(data):
+        cache_page(yc_url, 'yc_listing', response.text, data, response.headers)
+    return apply_csv_data(data, csv_data)
 
 
 def scrape_yc_listing(yc_url: str, csv_data: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """
     Scrape YC company listing page
     Example: https://www.ycombinator.com/companies/doordash
+    
+    Served from the page cache when possible. Otherwise tries the raw HTML
+    first (SCRAPE_HTTP_FIRST) and renders the page only when a required
+    field is still missing.
     """
+    cached, response = cached_page_data(yc_url, 'yc_listing')
+    if cached is not None:
+        count_tier('cache')
+        return apply_csv_data(cached, csv_data)
+    
+    partial = None
+    if SCRAPE_HTTP_FIRST or response is not None:
+        partial = fetch_yc_listing_http(yc_url, csv_data, response)
+        if partial is not None and has_required_fields(partial):
+            count_tier('http')
+            return partial
+        count_tier('escalations')
+    
     try:
-        # Use playwright for JS-rendered content
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(yc_url, wait_until="networkidle", timeout=30000)
-            
-            # Wait for dynamic content to load
-            time.sleep(3)
+        # Use playwright for JS-rendered content (pooled, long-lived browser)
+        with get_browser_pool().page() as page:
+            # Skip images, fonts, styles and trackers; ready once the page data or the heading is in the DOM
+            block_resources(page, yc_url)
+            response, _ = YC_LISTING_READINESS.wait(page, yc_url)
             
             # Try to extract data from page's JavaScript/JSON
             # YC pages often have data in script tags or window.__NEXT_DATA__
             page_data = None
             try:
-                page_data = page.evaluate("""
-                    () => {
-                        // Try to get data from Next.js data
-                        if (window.__NEXT_DATA__) {
-                            return window.__NEXT_DATA__.props.pageProps;
-                        }
-                        return null;
-                    }
-                """)
+                page_data = page.evaluate(NEXT_DATA_SCRIPT)
             except:
                 pass
             
             html = page.content()
-            browser.close()
         
-        soup = BeautifulSoup(html, 'html.parser')
+        data = parse_yc_listing(html, yc_url, page_data)
+        cache_page(yc_url, 'yc_listing', html, data, response.headers if response else None)
+        count_tier('browser')
+        return apply_csv_data(data, csv_data)
         
-        data = {
+    except Exception as e:
+        print(f"Error scraping YC listing {yc_url}: {e}")
+        import traceback
+        traceback.print_exc()
+        # Fields the HTTP tier found beat an error
+        if partial is not None:
+            count_tier('http_partial')
+            return partial
+        count_tier('failed')
+        return {
             'yc_url': yc_url,
-            'name': '',
-            'description': '',
-            'founders': [],
-            'batch': '',
-            'tags': [],
-            'website': '',
-            'full_description': ''
+            'error': str(e)
         }
+
+
+def parse_yc_listing(
+    html: str,
+    yc_url: str,
+    page_data: Optional[Dict[str, Any]] = None,
+    csv_data: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    Extract a YC listing's fields from its HTML and Next.js page props
+    (shared by the sync and async scrapers), then apply csv_data
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    data = {
+        'yc_url': yc_url,
+        'name': '',
+        'description': '',
+        'founders': [],
+        'batch': '',
+        'tags': [],
+        'website': '',
+        'full_description': ''
+    }
+    
+    # Try to extract from page data first (most reliable)
+    if page_data and isinstance(page_data, dict):
+        company_data = page_data.get('company') or page_data.get('companyData') or {}
+        if company_data:
+            if not data['name']:
+                data['name'] = company_data.get('name', '')
+            if not data['description']:
+                data['description'] = company_data.get('one_liner', '') or company_data.get('description', '')
+            if not data['full_description']:
+                data['full_description'] = company_data.get('long_description', '') or company_data.get('description', '')
+            if not data['batch']:
+                data['batch'] = company_data.get('batch', '')
+            if not data['website']:
+                data['website'] = company_data.get('website', '') or company_data.get('url', '')
+            if not data['founders'] and company_data.get('founders'):
+                data['founders'] = [f.get('name', '') for f in company_data['founders'] if isinstance(f, dict)]
+            if not data['tags'] and company_data.get('tags'):
+                data['tags'] = company_data['tags']
+    
+    # Fallback to HTML scraping if page_data didn't work
+    if not data['name']:
+        # Find company name - look for h1 with company name
+        h1 = soup.find('h1')
+        if h1:
+            name_text = h1.get_text(strip=True)
+            # Remove "| Y Combinator" suffix if present
+            data['name'] = name_text.split('|')[0].strip()
+        elif soup.find('meta', property='og:title'):
+            # Server-rendered pages always carry the meta tags
+            data['name'] = soup.find('meta', property='og:title').get('content', '').split('|')[0].strip()
+        else:
+            # Try title tag
+            title = soup.find('title')
+            if title:
+                title_text = title.get_text(strip=True)
+                data['name'] = title_text.split('|')[0].strip()
+    
+    if not data['description']:
+        # Try meta description
+        meta_desc = soup.find('meta', property='og:description')
+        if meta_desc:
+            data['description'] = meta_desc.get('content', '')
+        else:
+            # Try to find description in common locations
+            desc_elem = soup.find('p', class_=lambda x: x and ('description' in x.lower() or 'tagline' in x.lower()))
+            if desc_elem:
+                data['description'] = desc_elem.get_text(strip=True)
+    
+    if not data['full_description']:
+        # Look for longer description text
+        desc_selectors = [
+            'div[class*="long-description"]',
+            'div[class*="description"] p',
+            'section[class*="about"]',
+            'div[class*="about"]'
+        ]
+        for selector in desc_selectors:
+            desc_elem = soup.select_one(selector)
+            if desc_elem:
+                text = desc_elem.get_text(strip=True)
+                if len(text) > 50:  # Only use if substantial
+                    data['full_description'] = text
+                    break
+    
+    if not data['website']:
+        # Find website link - look for external links
+        # YC pages usually have a "Visit Website" or similar link
+        links = soup.find_all('a', href=True)
         
-        # Use CSV data as fallback if provided
-        if csv_data:
-            if not data['batch'] and csv_data.get('batch'):
-                data['batch'] = csv_data['batch']
-            if not data['tags'] and csv_data.get('main_industry'):
-                tags = [csv_data['main_industry']]
-                if csv_data.get('sub_industry') and csv_data['sub_industry'] != 'N/A':
-                    tags.append(csv_data['sub_industry'])
-                data['tags'] = tags
-        
-        # Try to extract from page data first (most reliable)
-        if page_data and isinstance(page_data, dict):
-            company_data = page_data.get('company') or page_data.get('companyData') or {}
-            if company_data:
-                if not data['name']:
-                    data['name'] = company_data.get('name', '')
-                if not data['description']:
-                    data['description'] = company_data.get('one_liner', '') or company_data.get('description', '')
-                if not data['full_description']:
-                    data['full_description'] = company_data.get('long_description', '') or company_data.get('description', '')
-                if not data['batch']:
-                    data['batch'] = company_data.get('batch', '')
-                if not data['website']:
-                    data['website'] = company_data.get('website', '') or company_data.get('url', '')
-                if not data['founders'] and company_data.get('founders'):
-                    data['founders'] = [f.get('name', '') for f in company_data['founders'] if isinstance(f, dict)]
-                if not data['tags'] and company_data.get('tags'):
-                    data['tags'] = company_data['tags']
-        
-        # Fallback to HTML scraping if page_data didn't work
-        if not data['name']:
-            # Find company name - look for h1 with company name
-            h1 = soup.find('h1')
-            if h1:
-                name_text = h1.get_text(strip=True)
-                # Remove "| Y Combinator" suffix if present
-                data['name'] = name_text.split('|')[0].strip()
-            else:
-                # Try title tag
-                title = soup.find('title')
-                if title:
-                    title_text = title.get_text(strip=True)
-                    data['name'] = title_text.split('|')[0].strip()
-        
-        if not data['description']:
-            # Try meta description
-            meta_desc = soup.find('meta', property='og:description')
-            if meta_desc:
-                data['description'] = meta_desc.get('content', '')
-            else:
-                # Try to find description in common locations
-                desc_elem = soup.find('p', class_=lambda x: x and ('description' in x.lower() or 'tagline' in x.lower()))
-                if desc_elem:
-                    data['description'] = desc_elem.get_text(strip=True)
+        # Domains to exclude
+        exclude_domains = [
+            'ycombinator.com', 'startupschool.org', 'bookface.com',
+            'twitter.com', 'linkedin.com', 'github.com', 'facebook.com',
+            'instagram.com', 'youtube.com', 'medium.com', 'blog'
+        ]
         
-        if not data['full_description']:
-            # Look for longer description text
-            desc_selectors = [
-                'div[class*="long-description"]',
-                'div[class*="description"] p',
-                'section[class*="about"]',
-                'div[class*="about"]'
-            ]
-            for selector in desc_selectors:
-                desc_elem = soup.select_one(selector)
-                if desc_elem:
-                    text = desc_elem.get_text(strip=True)
-                    if len(text) > 50:  # Only use if substantial
-                        data['full_description'] = text
-                        break
+        # First, try to find links with "website" or "visit" text
+        for link in links:
+            href = link.get('href', '')
+            text = link.get_text(strip=True).lower()
+            if href.startswith('http') and ('website' in text or 'visit' in text):
+                if not any(domain in href.lower() for domain in exclude_domains):
+                    data['website'] = href
+                    break
         
+        # If not found, look for the first external link that's not excluded
         if not data['website']:
-            # Find website link - look for external links
-            # YC pages usually have a "Visit Website" or similar link
-            links = soup.find_all('a', href=True)
-            
-            # Domains to exclude
-            exclude_domains = [
-                'ycombinator.com', 'startupschool.org', 'bookface.com',
-                'twitter.com', 'linkedin.com', 'github.com', 'facebook.com',
-                'instagram.com', 'youtube.com', 'medium.com', 'blog'
-            ]
-            
-            # First, try to find links with "website" or "visit" text
             for link in links:
                 href = link.get('href', '')
-                text = link.get_text(strip=True).lower()
-                if href.startswith('http') and ('website' in text or 'visit' in text):
-                    if not any(domain in href.lower() for domain in exclude_domains):
-                        data['website'] = href
-                        break
-            
-            # If not found, look for the first external link that's not excluded
-            if not data['website']:
-                for link in links:
-                    href = link.get('href', '')
-                    if href.startswith('http'):
-                        # Skip if it's an excluded domain
-                        if any(domain in href.lower() for domain in exclude_domains):
-                            continue
-                        # Skip if it looks like a social media or blog link
-                        if any(x in href.lower() for x in ['/twitter', '/linkedin', '/github', '/facebook', '/blog', '/post']):
-                            continue
-                        data['website'] = href
-                        break
+                if href.startswith('http'):
+                    # Skip if it's an excluded domain
+                    if any(domain in href.lower() for domain in exclude_domains):
+                        continue
+                    # Skip if it looks like a social media or blog link
+                    if any(x in href.lower() for x in ['/twitter', '/linkedin', '/github', '/facebook', '/blog', '/post']):
+                        continue
+                    data['website'] = href
+                    break
+    
+    if not data['batch']:
+        # Extract batch info - look for batch badges or text
+        # Try multiple strategies
+        batch_patterns = [
+            r'(Summer|Winter|Fall|Spring)\s+(\d{4})',  # "Summer 2024"
+            r'(S|W|F)(\d{2})',  # "S24", "W24"
+            r'(Summer|Winter|Fall|Spring)\s+(\d{2})',  # "Summer 24"
+        ]
+        
+        # Search in all text content
+        page_text = soup.get_text()
+        for pattern in batch_patterns:
+            match = re.search(pattern, page_text, re.IGNORECASE)
+            if match:
+                data['batch'] = match.group(0).strip()
+                break
         
+        # Also try looking in specific elements
         if not data['batch']:
-            # Extract batch info - look for batch badges or text
-            # Try multiple strategies
-            batch_patterns = [
-                r'(Summer|Winter|Fall|Spring)\s+(\d{4})',  # "Summer 2024"
-                r'(S|W|F)(\d{2})',  # "S24", "W24"
-                r'(Summer|Winter|Fall|Spring)\s+(\d{2})',  # "Summer 24"
-            ]
-            
-            # Search in all text content
-            page_text = soup.get_text()
-            for pattern in batch_patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
+            batch_elements = soup.find_all(['span', 'div', 'p'], string=re.compile(r'(Summer|Winter|Fall|Spring|S\d{2}|W\d{2}|F\d{2})', re.IGNORECASE))
+            for elem in batch_elements[:5]:
+                text = elem.get_text(strip=True)
+                match = re.search(r'(Summer|Winter|Fall|Spring)\s+(\d{4})|(S|W|F)(\d{2})', text, re.IGNORECASE)
                 if match:
                     data['batch'] = match.group(0).strip()
                     break
-            
-            # Also try looking in specific elements
-            if not data['batch']:
-                batch_elements = soup.find_all(['span', 'div', 'p'], string=re.compile(r'(Summer|Winter|Fall|Spring|S\d{2}|W\d{2}|F\d{2})', re.IGNORECASE))
-                for elem in batch_elements[:5]:
-                    text = elem.get_text(strip=True)
-                    match = re.search(r'(Summer|Winter|Fall|Spring)\s+(\d{4})|(S|W|F)(\d{2})', text, re.IGNORECASE)
-                    if match:
-                        data['batch'] = match.group(0).strip()
-                        break
-        
-        if not data['tags']:
-            # Extract tags - look for tag/badge elements
-            # Filter out common non-tag elements
-            exclude_tag_texts = ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9', '']
-            
-            tag_selectors = [
-                'span[class*="tag"]',
-                'div[class*="tag"]',
-                'span[class*="badge"]',
-                'div[class*="badge"]',
-                'a[class*="tag"]',
-                '[class*="category"]',
-                '[class*="industry"]'
-            ]
-            for selector in tag_selectors:
-                tag_elems = soup.select(selector)
-                if tag_elems:
-                    tags = []
-                    for tag in tag_elems:
-                        text = tag.get_text(strip=True)
-                        # Only include if it's meaningful text
-                        if text and text not in exclude_tag_texts and len(text) > 1:
-                            # Skip if it's just a number or single character
-                            if not (text.isdigit() or len(text) == 1):
-                                tags.append(text)
-                    if tags:
-                        data['tags'] = list(set(tags))[:10]  # Remove duplicates
-                        break
-        
-        # Clean up data
-        if data['name'] and '|' in data['name']:
-            data['name'] = data['name'].split('|')[0].strip()
-        
-        return data
+    
+    if not data['tags']:
+        # Extract tags - look for tag/badge elements
+        # Filter out common non-tag elements
+        exclude_tag_texts = ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9', '']
         
-    except Exception as e:
-        print(f"Error scraping YC listing {yc_url}: {e}")
-        import traceback
-        traceback.print_exc()
-        return {
-            'yc_url': yc_url,
-            'error': str(e)
-        }
+        tag_selectors = [
+            'span[class*="tag"]',
+            'div[class*="tag"]',
+            'span[class*="badge"]',
+            'div[class*="badge"]',
+            'a[class*="tag"]',
+            '[class*="category"]',
+            '[class*="industry"]'
+        ]
+        for selector in tag_selectors:
+            tag_elems = soup.select(selector)
+            if tag_elems:
+                tags = []
+                for tag in tag_elems:
+                    text = tag.get_text(strip=True)
+                    # Only include if it's meaningful text
+                    if text and text not in exclude_tag_texts and len(text) > 1:
+                        # Skip if it's just a number or single character
+                        if not (text.isdigit() or len(text) == 1):
+                            tags.append(text)
+                if tags:
+                    data['tags'] = list(set(tags))[:10]  # Remove duplicates
+                    break
+    
+    # Clean up data
+    if data['name'] and '|' in data['name']:
+        data['name'] = data['name'].split('|')[0].strip()
+    
+    return apply_csv_data(data, csv_data)
+
+
+def apply_csv_data(data: Dict[str, Any], csv_data: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    A copy of a parsed listing with the CSV's batch and industries, which
+    take precedence over what the page shows
+
+    The page cache stores listings before this step, so a cached listing is
+    the same whoever scraped it first.
+    """
+    data = dict(data)
+    if csv_data:
+        if csv_data.get('batch'):
+            data['batch'] = csv_data['batch']
+        if csv_data.get('main_industry'):
+            tags = [csv_data['main_industry']]
+            if csv_data.get('sub_industry') and csv_data['sub_industry'] != 'N/A':
+                tags.append(csv_data['sub_industry'])
+            data['tags'] = tags
+    return data
 
 
 def scrape_landing_page(website_url: str) -> Dict[str, Any]:
     """
-    Scrape company landing page for key content
+    Scrape company landing page for key content (served from the page cache when possible)
     """
+    # Landing pages need rendering: a changed page from the revalidation is not reused
+    cached, _ = cached_page_data(website_url, 'landing_page')
+    if cached is not None:
+        return cached
+    
     try:
-        # Use playwright for dynamic content
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            
-            # Set reasonable timeout
-            page.goto(website_url, wait_until="networkidle", timeout=30000)
-            time.sleep(2)  # Wait for dynamic content
+        # Use playwright for dynamic content (pooled, long-lived browser)
+        with get_browser_pool().page() as page:
+            # Skip images, fonts, styles and trackers; wait for the main content and a settled DOM
+            block_resources(page, website_url)
+            response, _ = LANDING_PAGE_READINESS.wait(page, website_url)
             
             html = page.content()
-            browser.close()
-        
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer"]):
-            script.decompose()
-        
-        data = {
-            'website_url': website_url,
-            'hero_section': '',
-            'value_proposition': '',
-            'headlines': [],
-            'features': [],
-            'pricing': '',
-            'main_content': ''
-        }
-        
-        # Extract hero section (usually h1 + first paragraph)
-        h1 = soup.find('h1')
-        if h1:
-            data['hero_section'] = h1.get_text(strip=True)
-            # Get first paragraph after h1
-            next_p = h1.find_next('p')
-            if next_p:
-                data['value_proposition'] = next_p.get_text(strip=True)
-        
-        # Extract all headlines
-        headlines = soup.find_all(['h1', 'h2', 'h3'])
-        data['headlines'] = [h.get_text(strip=True) for h in headlines[:10]]
-        
-        # Try to find features (usually in lists or specific sections)
-        feature_selectors = [
-            'ul[class*="feature"]',
-            'div[class*="feature"]',
-            'section[class*="feature"]',
-            'li[class*="feature"]'
-        ]
-        for selector in feature_selectors:
-            feature_elems = soup.select(selector)
-            if feature_elems:
-                for elem in feature_elems[:5]:
-                    text = elem.get_text(strip=True)
-                    if text and len(text) > 10:
-                        data['features'].append(text)
-                break
-        
-        # Extract pricing info (if available)
-        price_elem = soup.find(string=lambda x: x and ('$' in x or '€' in x or 'price' in x.lower()))
-        if price_elem:
-            parent = price_elem.find_parent()
-            if parent:
-                data['pricing'] = parent.get_text(strip=True)
-        
-        # Get main content (all text, cleaned)
-        main_content = soup.get_text(separator=' ', strip=True)
-        # Limit to first 5000 chars
-        data['main_content'] = main_content[:5000]
         
+        data = parse_landing_page(html, website_url)
+        cache_page(website_url, 'landing_page', html, data, response.headers if response else None)
         return data
         
     except Exception as e:
@@ -318,3 +485,64 @@ def scrape_landing_page(website_url: str) -> Dict[str, Any]:
             'error': str(e)
         }
 
+
+def parse_landing_page(html: str, website_url: str) -> Dict[str, Any]:
+    """Extract the key content of a landing page from its HTML"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Remove script and style elements
+    for script in soup(["script", "style", "nav", "footer"]):
+        script.decompose()
+    
+    data = {
+        'website_url': website_url,
+        'hero_section': '',
+        'value_proposition': '',
+        'headlines': [],
+        'features': [],
+        'pricing': '',
+        'main_content': ''
+    }
+    
+    # Extract hero section (usually h1 + first paragraph)
+    h1 = soup.find('h1')
+    if h1:
+        data['hero_section'] = h1.get_text(strip=True)
+        # Get first paragraph after h1
+        next_p = h1.find_next('p')
+        if next_p:
+            data['value_proposition'] = next_p.get_text(strip=True)
+    
+    # Extract all headlines
+    headlines = soup.find_all(['h1', 'h2', 'h3'])
+    data['headlines'] = [h.get_text(strip=True) for h in headlines[:10]]
+    
+    # Try to find features (usually in lists or specific sections)
+    feature_selectors = [
+        'ul[class*="feature"]',
+        'div[class*="feature"]',
+        'section[class*="feature"]',
+        'li[class*="feature"]'
+    ]
+    for selector in feature_selectors:
+        feature_elems = soup.select(selector)
+        if feature_elems:
+            for elem in feature_elems[:5]:
+                text = elem.get_text(strip=True)
+                if text and len(text) > 10:
+                    data['features'].append(text)
+            break
+    
+    # Extract pricing info (if available)
+    price_elem = soup.find(string=lambda x: x and ('$' in x or '€' in x or 'price' in x.lower()))
+    if price_elem:
+        parent = price_elem.find_parent()
+        if parent:
+            data['pricing'] = parent.get_text(strip=True)
+    
+    # Get main content (all text, cleaned)
+    main_content = soup.get_text(separator=' ', strip=True)
+    # Limit to first 5000 chars
+    data['main_content'] = main_content[:5000]
+    
+    return data
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+"""
+Async scrapers and a concurrent scraping engine
+
+scrape_yc_listing_async and scrape_landing_page_async are the async
+counterparts of the scrapers in lib/scraper.py: they render pages of the
+async browser pool and reuse the same parsing and YC listing HTTP tier (run
+in worker threads, as BeautifulSoup is CPU-bound).
+
+ScrapeEngine keeps many of them in flight on one event loop, bounded by
+two caps:
+- SCRAPE_CONCURRENCY pages at once overall
+- SCRAPE_PER_HOST_CONCURRENCY pages at once per host, so a bulk job over
+  ycombinator.com stays polite while other hosts proceed in parallel
+
+scrape_many() yields results in completion order, so a batch takes about as
+long as its slowest pages rather than the sum of all of them.
+"""
+import os
+import time
+import asyncio
+from urllib.parse import urlparse
+from typing import Dict, Any, Optional, Iterable, AsyncIterator, Tuple
+
+from dotenv import load_dotenv
+
+from lib.browser_pool import async_browser_pool
+from lib.readiness import LANDING_PAGE_READINESS, YC_LISTING_READINESS
+from lib.resource_blocking import block_resources_async
+from lib.scraper import (
+    NEXT_DATA_SCRIPT,
+    SCRAPE_HTTP_FIRST,
+    apply_csv_data,
+    cache_page,
+    cached_page_data,
+    count_tier,
+    fetch_yc_listing_http,
+    has_required_fields,
+    parse_landing_page,
+    parse_yc_listing,
+)
+
+load_dotenv()
+
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "8"))
+SCRAPE_PER_HOST_CONCURRENCY = int(os.getenv("SCRAPE_PER_HOST_CONCURRENCY", "2"))
+
+
+async def scrape_yc_listing_async(yc_url: str, csv_data: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Async counterpart of scrape_yc_listing (page cache, HTTP tier, then the browser)"""
+    partial = None
+    try:
+        cached, response = await asyncio.to_thread(cached_page_data, yc_url, 'yc_listing')
+        if cached is not None:
+            count_tier('cache')
+            return apply_csv_data(cached, csv_data)
+
+        if SCRAPE_HTTP_FIRST or response is not None:
+            partial = await asyncio.to_thread(fetch_yc_listing_http, yc_url, csv_data, response)
+            if partial is not None and has_required_fields(partial):
+                count_tier('http')
+                return partial
+            count_tier('escalations')
+
+        async with async_browser_pool.page() as page:
+            await block_resources_async(page, yc_url)
+            response, _ = await YC_LISTING_READINESS.wait_async(page, yc_url)
+
+            page_data = None
+            try:
+                page_data = await page.evaluate(NEXT_DATA_SCRIPT)
+            except Exception:
+                pass
+
+            html = await page.content()
+
+        data = await asyncio.to_thread(parse_yc_listing, html, yc_url, page_data)
+        await asyncio.to_thread(cache_page, yc_url, 'yc_listing', html, data, response.headers if response else None)
+        count_tier('browser')
+        return apply_csv_data(data, csv_data)
+
+    except Exception as e:
+        print(f"Error scraping YC listing {yc_url}: {e}")
+        if partial is not None:
+            count_tier('http_partial')
+            return partial
+        count_tier('failed')
+        return {
+            'yc_url': yc_url,
+            'error': str(e)
+        }
+
+
+async def scrape_landing_page_async(website_url: str) -> Dict[str, Any]:
+    """Async counterpart of scrape_landing_page"""
+    try:
+        cached, _ = await asyncio.to_thread(cached_page_data, website_url, 'landing_page')
+        if cached is not None:
+            return cached
+
+        async with async_browser_pool.page() as page:
+            await block_resources_async(page, website_url)
+            response, _ = await LANDING_PAGE_READINESS.wait_async(page, website_url)
+
+            html = await page.content()
+
+        data = await asyncio.to_thread(parse_landing_page, html, website_url)
+        await asyncio.to_thread(cache_page, website_url, 'landing_page', html, data, response.headers if response else None)
+        return data
+
+    except Exception as e:
+        print(f"Error scraping landing page {website_url}: {e}")
+        return {
+            'website_url': website_url,
+            'error': str(e)
+        }
+
+
+SCRAPERS = {
+    'yc_listing': scrape_yc_listing_async,
+    'landing_page': scrape_landing_page_async,
+}
+
+
+def url_host(url: str) -> str:
+    """Host a per-host cap applies to ('www.' is ignored)"""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class ScrapeEngine:
+    """Runs async scrapes concurrently under a global and a per-host cap"""
+
+    def __init__(
+        self,
+        concurrency: int = SCRAPE_CONCURRENCY,
+        per_host: int = SCRAPE_PER_HOST_CONCURRENCY
+    ):
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
+        # Semaphores are created on first use, inside the loop that runs the scrapes
+        self._global: Optional[asyncio.Semaphore] = None
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight = 0
+        self.counters = {'pages': 0, 'errors': 0, 'max_in_flight': 0, 'scrape_s': 0.0}
+
+    async def scrape(self, kind: str, url: str, **kwargs) -> Dict[str, Any]:
+        """Run one scraper ('yc_listing' or 'landing_page') once both caps allow it"""
+        if kind not in SCRAPERS:
+            raise ValueError(f"Unknown scrape kind '{kind}'. Available: {', '.join(SCRAPERS)}")
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.concurrency)
+        host = self._hosts.setdefault(url_host(url), asyncio.Semaphore(self.per_host))
+
+        # Take the host slot first, so pages queued behind a busy host hold no global slot
+        async with host:
+            async with self._global:
+                self._in_flight += 1
+                self.counters['max_in_flight'] = max(self.counters['max_in_flight'], self._in_flight)
+                start = time.perf_counter()
+                try:
+                    result = await SCRAPERS[kind](url, **kwargs)
+                finally:
+                    self._in_flight -= 1
+                    self.counters['scrape_s'] += time.perf_counter() - start
+
+        self.counters['pages'] += 1
+        if 'error' in result:
+            self.counters['errors'] += 1
+        return result
+
+    async def scrape_many(self, jobs: Iterable[Dict[str, Any]]) -> AsyncIterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Scrape jobs ({'kind': ..., 'url': ..., 'kwargs': {...}}) concurrently,
+        yielding (job, result) pairs as each one completes
+        """
+        async def run(job: Dict[str, Any]):
+            return job, await self.scrape(job['kind'], job['url'], **job.get('kwargs', {}))
+
+        tasks = [asyncio.create_task(run(job)) for job in jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The caller stopped early: do not leave scrapes running, and wait
+            # until they are gone so their pages are closed before the pool is
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'concurrency': self.concurrency,
+            'per_host': self.per_host,
+            'hosts': len(self._hosts),
+            **self.counters,
+        }
+
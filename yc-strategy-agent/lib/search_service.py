@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+"""
+Long-running semantic search service
+
+Loads the embedding model and the Qdrant client once, then serves
+search_similar_companies over a small local HTTP API so that callers
+(the orchestrator, the Next.js route) skip interpreter start-up, model
+load and connection setup on every request.
+
+Endpoints:
+    POST /search   {"idea_pitch": "...", "limit": 3, "filters": {...}, "mode": "dense"|"hybrid"}
+    GET  /health   cold start timings, warm latency and query cache stats
+"""
+import os
+import sys
+import json
+import time
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any, Optional
+
+import requests
+from dotenv import load_dotenv
+
+from lib.qdrant_client import (
+    COLLECTION_NAME,
+    SEARCH_BACKEND,
+    VECTOR_NAME,
+    client_pool,
+    get_pooled_client,
+    get_embedding_model,
+    search_similar_companies,
+)
+from lib.query_cache import get_query_cache
+
+load_dotenv()
+
+SEARCH_SERVICE_HOST = os.getenv("SEARCH_SERVICE_HOST", "127.0.0.1")
+SEARCH_SERVICE_PORT = int(os.getenv("SEARCH_SERVICE_PORT", "8765"))
+SEARCH_SERVICE_URL = os.getenv("SEARCH_SERVICE_URL", f"http://{SEARCH_SERVICE_HOST}:{SEARCH_SERVICE_PORT}")
+
+# Number of recent warm requests kept for latency percentiles
+LATENCY_WINDOW = 1000
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class SearchService:
+    """Holds the warm model/client and records cold vs. warm latency"""
+
+    def __init__(self, collection_name: str = COLLECTION_NAME):
+        self.collection_name = collection_name
+        self.client = None
+        self.cold_start: Dict[str, float] = {}
+        self.latencies_ms = deque(maxlen=LATENCY_WINDOW)
+        self.requests_served = 0
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        """Load the embedding model, connect to Qdrant and run a first inference and query"""
+        start = time.perf_counter()
+        get_embedding_model()
+        model_loaded = time.perf_counter()
+
+        if SEARCH_BACKEND == "local":
+            from lib.local_index import get_local_index
+            get_local_index()
+        else:
+            self.client = get_pooled_client()
+            self.client.collection_exists(collection_name=self.collection_name)
+        client_ready = time.perf_counter()
+
+        # Straight to the model and Qdrant, so the embedding and query caches keep no warm-up entry
+        vector = next(iter(get_embedding_model().embed(["warm up"])))
+        if self.client is not None:
+            self.client.query_points(
+                collection_name=self.collection_name,
+                query=vector.tolist(),
+                using=VECTOR_NAME,
+                limit=1,
+                with_payload=False
+            )
+        first_query = time.perf_counter()
+
+        self.cold_start = {
+            'model_load_ms': (model_loaded - start) * 1000,
+            'client_connect_ms': (client_ready - model_loaded) * 1000,
+            'first_query_ms': (first_query - client_ready) * 1000,
+            'total_ms': (first_query - start) * 1000,
+        }
+        print(f"Search service warm in {self.cold_start['total_ms']:.0f} ms "
+              f"(model {self.cold_start['model_load_ms']:.0f} ms, "
+              f"client {self.cold_start['client_connect_ms']:.0f} ms, "
+              f"first query {self.cold_start['first_query_ms']:.0f} ms)")
+
+    def search(
+        self,
+        idea_pitch: str,
+        limit: int = 3,
+        filters: Optional[Dict[str, Any]] = None,
+        mode: str = "dense"
+    ) -> Dict[str, Any]:
+        """Run a search on the warm model/client and time it"""
+        start = time.perf_counter()
+        results = search_similar_companies(
+            idea_pitch,
+            limit=limit,
+            collection_name=self.collection_name,
+            client=self.client,
+            filters=filters,
+            mode=mode
+        )
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self.latencies_ms.append(latency_ms)
+            self.requests_served += 1
+
+        return {'results': results, 'latency_ms': latency_ms}
+
+    def stats(self) -> Dict[str, Any]:
+        """Cold start timings and warm latency percentiles"""
+        with self._lock:
+            latencies = list(self.latencies_ms)
+            served = self.requests_served
+        return {
+            'status': 'ok',
+            'backend': SEARCH_BACKEND,
+            'collection': self.collection_name,
+            'cold_start': self.cold_start,
+            'warm': {
+                'requests_served': served,
+                'p50_ms': _percentile(latencies, 50),
+                'p95_ms': _percentile(latencies, 95),
+                'p99_ms': _percentile(latencies, 99),
+                'mean_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+            },
+            'client_pool': client_pool.stats(),
+            'query_cache': get_query_cache().stats() if get_query_cache() else None,
+        }
+
+    def close(self):
+        """Release the pooled Qdrant connections"""
+        self.client = None
+        client_pool.close()
+
+
+def _make_handler(service: SearchService):
+    """Build a request handler class bound to a warm SearchService"""
+
+    class SearchRequestHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, body: Dict[str, Any]):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send_json(200, service.stats())
+            else:
+                self._send_json(404, {'error': f"Unknown path '{self.path}'"})
+
+        def do_POST(self):
+            if self.path != '/search':
+                self._send_json(404, {'error': f"Unknown path '{self.path}'"})
+                return
+
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+            except (ValueError, json.JSONDecodeError) as e:
+                self._send_json(400, {'error': f"Invalid JSON body: {e}"})
+                return
+
+            if not isinstance(body, dict):
+                self._send_json(400, {'error': "Body must be a JSON object"})
+                return
+
+            idea_pitch = body.get('idea_pitch') or ''
+            if not isinstance(idea_pitch, str) or not idea_pitch.strip():
+                self._send_json(400, {'error': "'idea_pitch' is required and must be a string"})
+                return
+
+            limit = body.get('limit', 3)
+            if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+                self._send_json(400, {'error': "'limit' must be a positive integer"})
+                return
+
+            filters = body.get('filters')
+            if filters is not None and not isinstance(filters, dict):
+                self._send_json(400, {'error': "'filters' must be an object"})
+                return
+
+            mode = body.get('mode', 'dense')
+            if not isinstance(mode, str):
+                self._send_json(400, {'error': "'mode' must be a string"})
+                return
+
+            try:
+                self._send_json(200, service.search(
+                    idea_pitch.strip(),
+                    limit=limit,
+                    filters=filters,
+                    mode=mode
+                ))
+            except Exception as e:
+                self._send_json(500, {'error': str(e)})
+
+        def log_message(self, format, *args):
+            # Keep stdout quiet; latency is reported through /health
+            pass
+
+    return SearchRequestHandler
+
+
+def serve(host: str = SEARCH_SERVICE_HOST, port: int = SEARCH_SERVICE_PORT, collection_name: str = COLLECTION_NAME):
+    """Warm up the search service and serve requests until interrupted"""
+    service = SearchService(collection_name=collection_name)
+    service.warm_up()
+
+    server = ThreadingHTTPServer((host, port), _make_handler(service))
+    print(f"🔎 Search service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down search service...")
+    finally:
+        server.server_close()
+        service.close()
+
+
+def search_via_service(
+    idea_pitch: str,
+    limit: int = 3,
+    service_url: str = SEARCH_SERVICE_URL,
+    timeout: float = 10.0,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Query a running search service, raising if it is unreachable or fails"""
+    response = requests.post(
+        f"{service_url}/search",
+        json={'idea_pitch': idea_pitch, 'limit': limit, 'filters': filters},
+        timeout=timeout
+    )
+    if response.status_code != 200:
+        raise ValueError(f"Search service error ({response.status_code}): {response.text}")
+    return response.json()['results']
+
+
+def search_companies(
+    idea_pitch: str,
+    limit: int = 3,
+    service_url: Optional[str] = SEARCH_SERVICE_URL,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Search through the warm service when it is running, falling back to an
+    in-process search_similar_companies call otherwise
+    """
+    if service_url:
+        try:
+            return search_via_service(idea_pitch, limit=limit, service_url=service_url, filters=filters)
+        except requests.exceptions.ConnectionError:
+            # stderr keeps stdout clean for callers that parse JSON output
+            print("  Search service not running, searching in-process", file=sys.stderr)
+    return search_similar_companies(idea_pitch, limit=limit, filters=filters)
@@ -5,24 +5,118 @@ Main orchestrator script that runs the complete pipeline
 import sys
 import json
 import time
+import asyncio
+import sqlite3
 from pathlib import Path
 from datetime import datetime
+from typing import List, Dict, Any
 
 # Add parent directory to path to import lib
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from lib.qdrant_client import search_similar_companies
-from lib.scraper import scrape_yc_listing, scrape_landing_page
+from lib.search_service import search_companies
+from lib.scraper import scrape_tier_stats
+from lib.readiness import readiness_stats
+from lib.resource_blocking import resource_blocking_stats
+from lib.page_cache import get_page_cache
+from lib.scraper_async import ScrapeEngine
+from lib.browser_pool import async_browser_pool, browser_pool_stats
 from lib.google_search import search_strategic_insights
 from lib.mistral_client import generate_report_analysis
 from lib.report_generator import format_report_json, save_report
 
+async def collect_company(engine: ScrapeEngine, company: Dict[str, Any], label: str) -> Dict[str, Any]:
+    """Scrape one company's YC listing and landing page and search for insights"""
+    company_data = {
+        'name': company['name'],
+        'description': company['description'],
+        'url': company['url'],
+        'industry': company['main_industry'],
+        'similarity_score': company['similarity_score']
+    }
+    
+    # Google search does not depend on the scraped pages, run it alongside them
+    insights_task = asyncio.create_task(
+        asyncio.to_thread(search_strategic_insights, company['name'], num_results=5)
+    )
+    
+    # Step 2: Scrape YC listing
+    print(f"{label} [2.1] Scraping YC listing...")
+    try:
+        yc_data = await engine.scrape('yc_listing', company['url'])
+    except Exception as e:
+        yc_data = {'error': str(e)}
+    company_data['yc_listing'] = yc_data
+    if 'error' in yc_data:
+        print(f"{label}  ⚠️  Error scraping YC listing: {yc_data['error']}")
+    
+    # Step 3: Scrape landing page (if website available)
+    website_url = yc_data.get('website', '')
+    if website_url:
+        print(f"{label} [2.2] Scraping landing page: {website_url}")
+        try:
+            landing_data = await engine.scrape('landing_page', website_url)
+        except Exception as e:
+            landing_data = {'error': str(e)}
+        company_data['landing_page'] = landing_data
+        if 'error' in landing_data:
+            print(f"{label}  ⚠️  Error scraping landing page: {landing_data['error']}")
+    else:
+        print(f"{label} [2.2] Skipping landing page (no website URL found)")
+        company_data['landing_page'] = {}
+    
+    # Step 4: Google search for strategic insights
+    try:
+        insights = await insights_task
+        company_data['google_insights'] = insights
+        print(f"{label} [2.3] Found {len(insights)} insights")
+    except Exception as e:
+        print(f"{label}  ⚠️  Error in Google search: {e}")
+        company_data['google_insights'] = []
+    
+    print(f"{label} ✅ Done")
+    return company_data
+
+
+async def collect_companies(companies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Collect every company concurrently; the scrape engine caps pages in
+    flight overall and per host (SCRAPE_CONCURRENCY, SCRAPE_PER_HOST_CONCURRENCY)
+    """
+    engine = ScrapeEngine()
+    try:
+        results = await asyncio.gather(*(
+            collect_company(engine, company, f"[{i}/{len(companies)} {company['name']}]")
+            for i, company in enumerate(companies, 1)
+        ), return_exceptions=True)
+    finally:
+        await async_browser_pool.close()
+    
+    # One company failing outright still leaves the others in the report
+    collected = []
+    for company, result in zip(companies, results):
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            print(f"[{company['name']}]  ⚠️  Error collecting company: {result}")
+            result = {
+                'name': company['name'],
+                'description': company['description'],
+                'url': company['url'],
+                'industry': company['main_industry'],
+                'similarity_score': company['similarity_score'],
+                'error': str(result)
+            }
+        collected.append(result)
+    return collected
+
+
 def main(idea_pitch: str):
     """
     Run the complete pipeline:
     1. Semantic search → get 3 companies
-    2. For each company: scrape YC listing + landing page
-    3. For each company: Google search for insights
+    2. For each company (concurrently): scrape YC listing + landing page
+    3. For each company (concurrently): Google search for insights
     4. Generate final report
     """
     print("=" * 60)
@@ -38,69 +132,19 @@ def main(idea_pitch: str):
     # Step 1: Semantic search
     print("Step 1: Finding similar YC companies...")
     try:
-        similar_companies = search_similar_companies(idea_pitch, limit=3)
+        similar_companies = search_companies(idea_pitch, limit=3)
         print(f"Found {len(similar_companies)} similar companies\n")
     except Exception as e:
         print(f"Error in semantic search: {e}")
         sys.exit(1)
     
-    # Step 2-4: For each company, collect data
-    for i, company in enumerate(similar_companies, 1):
-        print(f"\n{'='*60}")
-        print(f"Processing Company {i}/{len(similar_companies)}: {company['name']}")
-        print(f"{'='*60}")
-        
-        company_data = {
-            'name': company['name'],
-            'description': company['description'],
-            'url': company['url'],
-            'industry': company['main_industry'],
-            'similarity_score': company['similarity_score']
-        }
-        
-        # Step 2: Scrape YC listing
-        print(f"\n[2.1] Scraping YC listing...")
-        try:
-            yc_data = scrape_yc_listing(company['url'])
-            company_data['yc_listing'] = yc_data
-            
-            # Extract website URL if available
-            website_url = yc_data.get('website', '')
-            # If no website found, we'll skip landing page scraping
-        except Exception as e:
-            print(f"  ⚠️  Error scraping YC listing: {e}")
-            company_data['yc_listing'] = {'error': str(e)}
-            website_url = ''
-        
-        # Step 3: Scrape landing page (if website available)
-        if website_url:
-            print(f"[2.2] Scraping landing page: {website_url}")
-            try:
-                landing_data = scrape_landing_page(website_url)
-                company_data['landing_page'] = landing_data
-            except Exception as e:
-                print(f"  ⚠️  Error scraping landing page: {e}")
-                company_data['landing_page'] = {'error': str(e)}
-        else:
-            print(f"[2.2] Skipping landing page (no website URL found)")
-            company_data['landing_page'] = {}
-        
-        # Step 4: Google search for strategic insights
-        print(f"[2.3] Searching for strategic insights...")
-        try:
-            insights = search_strategic_insights(company['name'], num_results=5)
-            company_data['google_insights'] = insights
-            print(f"  Found {len(insights)} insights")
-        except Exception as e:
-            print(f"  ⚠️  Error in Google search: {e}")
-            company_data['google_insights'] = []
-        
-        # Rate limiting between companies
-        if i < len(similar_companies):
-            print("  Waiting 2 seconds before next company...")
-            time.sleep(2)
-        
-        collected_data['companies'].append(company_data)
+    # Step 2-4: Collect data for all companies at once
+    print(f"{'='*60}")
+    print(f"Steps 2-4: Collecting data for {len(similar_companies)} companies")
+    print(f"{'='*60}")
+    start = time.perf_counter()
+    collected_data['companies'] = asyncio.run(collect_companies(similar_companies))
+    print(f"\nCollected {len(similar_companies)} companies in {time.perf_counter() - start:.1f}s")
     
     # Save intermediate data for debugging
     intermediate_file = Path(__file__).parent.parent / "data" / "outputs" / f"collected_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -109,6 +153,29 @@ def main(idea_pitch: str):
         json.dump(collected_data, f, indent=2, ensure_ascii=False)
     print(f"\n💾 Intermediate data saved to: {intermediate_file}")
     
+    pool = browser_pool_stats()
+    if pool['pages']:
+        print(f"🌐 Browser pool: {pool['pages']} pages on {pool['launches']} browser launch(es), "
+              f"~{pool['launch_s_saved']:.1f}s of launches saved")
+    tiers = scrape_tier_stats()
+    print(f"⚡ YC listings: {tiers['cache']} cached, {tiers['http']} from raw HTML, "
+          f"{tiers['browser']} rendered, {tiers['failed']} failed")
+    try:
+        page_cache = get_page_cache()
+        cache_stats = page_cache.stats() if page_cache is not None else None
+    except (sqlite3.Error, OSError):
+        cache_stats = None
+    if cache_stats is not None:
+        print(f"🗄️  Page cache: {cache_stats['hits']} hits, {cache_stats['revalidated']} revalidated (304), "
+              f"{cache_stats['misses'] + cache_stats['stale'] - cache_stats['revalidated']} scraped")
+    for policy, readiness in readiness_stats().items():
+        print(f"⏱️  {policy} pages ready in {readiness['total_ms']['mean']:.0f} ms on average "
+              f"({readiness['budget_exhausted']}/{readiness['pages']} hit the page budget)")
+    blocking = resource_blocking_stats()
+    if blocking['pages']:
+        print(f"🚫 Blocked {blocking['blocked']}/{blocking['requests']} requests "
+              f"(~{blocking['bytes_saved_est_per_page'] / 1e6:.1f} MB saved per page, estimated)")
+    
     # Step 5: Generate report
     print(f"\n{'='*60}")
     print("Step 5: Generating strategic report...")
@@ -1,17 +1,46 @@
 #!/usr/bin/env python
 """
-One-time setup script to load YC companies from CSV into Qdrant collection
+Setup script to load YC companies from CSV into Qdrant collection
+
+By default only new or changed companies are re-embedded and companies that
+left the CSV are removed (delta sync). Use --rebuild to drop and re-create
+the collection from scratch, or --from-artifact to restore it from a
+prebuilt embedding artifact (scripts/build_artifact.py) without loading the
+model. The local payload store is rebuilt either way.
 """
 import sys
 import os
+import argparse
 from pathlib import Path
 
 # Add parent directory to path to import lib
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from lib.qdrant_client import upload_companies_from_csv
+from lib.qdrant_client import (
+    upload_companies_from_csv,
+    sync_companies_from_csv,
+    get_pooled_client,
+    COLLECTION_PROFILES,
+    COLLECTION_PROFILE,
+)
+from lib.payload_store import PAYLOAD_STORE_PATH, build_payload_store_from_csv
+from lib.artifact import default_artifact_path, restore_collection_from_artifact
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index YC companies from CSV into Qdrant")
+    parser.add_argument("--rebuild", action="store_true", help="Drop and re-create the collection instead of syncing changes")
+    parser.add_argument("--from-artifact", nargs="?", const="", default=None, metavar="PATH",
+                        help="Restore the collection from an embedding artifact instead of embedding "
+                             "(default PATH: the artifact for the current model and CSV)")
+    parser.add_argument("--profile", choices=list(COLLECTION_PROFILES), default=COLLECTION_PROFILE,
+                        help="Storage/index profile for a newly created collection (default: %(default)s)")
+    parser.add_argument("--embed-processes", type=int, default=None,
+                        help="Embed in N worker processes (default: EMBED_PROCESSES, 0 = in-process)")
+    parser.add_argument("--embed-threads", type=int, default=None,
+                        help="Intra-op threads per embedding process (default: EMBED_THREADS_PER_PROCESS)")
+    
+    args = parser.parse_args()
+    
     # Path to companies.csv
     csv_path = os.path.join(
         Path(__file__).parent.parent,
@@ -25,12 +54,33 @@ if __name__ == "__main__":
         sys.exit(1)
     
     print(f"Loading companies from {csv_path}...")
-    print("This may take a few minutes...")
     
     try:
-        upload_companies_from_csv(csv_path)
+        if args.from_artifact is not None:
+            artifact_path = args.from_artifact or default_artifact_path(csv_path)
+            print(f"Restoring from artifact {artifact_path}...")
+            restore_collection_from_artifact(get_pooled_client(), artifact_path, csv_path, profile=args.profile)
+        elif args.rebuild:
+            print("Full rebuild requested, this may take a few minutes...")
+            upload_companies_from_csv(
+                csv_path,
+                recreate=True,
+                profile=args.profile,
+                embed_processes=args.embed_processes,
+                embed_threads=args.embed_threads
+            )
+        else:
+            sync_companies_from_csv(
+                csv_path,
+                profile=args.profile,
+                embed_processes=args.embed_processes,
+                embed_threads=args.embed_threads
+            )
+        
+        # Local payload store used to hydrate thin search responses (SEARCH_PAYLOAD_SOURCE=local)
+        stored = build_payload_store_from_csv(csv_path)
+        print(f"💾 Payload store rebuilt: {stored} companies → {PAYLOAD_STORE_PATH}")
         print("\n✅ Setup complete! Companies are now indexed in Qdrant.")
     except Exception as e:
         print(f"\n❌ Error during setup: {e}")
         sys.exit(1)
-
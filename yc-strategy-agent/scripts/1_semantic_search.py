@@ -9,20 +9,32 @@ from pathlib import Path
 # Add parent directory to path to import lib
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from lib.qdrant_client import search_similar_companies
+from lib.search_service import search_companies
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/1_semantic_search.py '<idea_pitch>'")
+    args = [arg for arg in sys.argv[1:] if arg != "--json"]
+    json_only = "--json" in sys.argv[1:]
+    
+    if not args:
+        print("Usage: python scripts/1_semantic_search.py '<idea_pitch>' [--json]")
         print('Example: python scripts/1_semantic_search.py "AI-powered CRM for startups"')
         sys.exit(1)
     
-    idea_pitch = sys.argv[1]
+    idea_pitch = args[0]
+    
+    if json_only:
+        # Machine-readable mode for the Next.js route: results JSON only on stdout
+        try:
+            print(json.dumps(search_companies(idea_pitch, limit=3)))
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
     
     print(f"Searching for companies similar to: '{idea_pitch}'...")
     
     try:
-        results = search_similar_companies(idea_pitch, limit=3)
+        results = search_companies(idea_pitch, limit=3)
         
         if not results:
             print("No similar companies found.")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Throughput of search_similar_companies_batch for growing numbers of pitches
+
+Pitches are company descriptions sampled from data/companies.csv (cycled
+when more are requested than the CSV holds).
+
+Setup has already put every corpus description in the embedding cache, so
+the run uses a scratch cache directory, emptied before each size; the
+embedding figures then measure the model and its token-budget batching
+rather than cache reads.
+"""
+import sys
+import os
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+# Before lib is imported, which reads the cache location once
+SCRATCH_CACHE_DIR = tempfile.mkdtemp(prefix="benchmark_embeddings_")
+os.environ["EMBEDDING_CACHE_DIR"] = SCRATCH_CACHE_DIR
+
+# Add parent directory to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.batching import embedding_batch_stats
+from lib.embedding_cache import get_embedding_cache
+from lib.qdrant_client import (
+    EMBEDDING_MODEL,
+    SEARCH_BACKEND,
+    SEARCH_PAYLOAD_SOURCE,
+    VECTOR_SIZE,
+    embed_texts,
+    get_embedding_model,
+    get_qdrant_client,
+    iter_csv_rows,
+    model_cache_key,
+    search_similar_companies,
+    search_similar_companies_batch,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batched semantic search throughput")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000], help="Batch sizes to run (default: %(default)s)")
+    parser.add_argument("--limit", type=int, default=3, help="Results per pitch (default: %(default)s)")
+    parser.add_argument("--backend", default=SEARCH_BACKEND, choices=["qdrant", "local"], help="Search backend (default: %(default)s)")
+    parser.add_argument("--payload-source", default=SEARCH_PAYLOAD_SOURCE, choices=["qdrant", "local"],
+                        help="Payloads from Qdrant responses or the local payload store (default: %(default)s)")
+    parser.add_argument("--sequential-max", type=int, default=100,
+                        help="Also time one-by-one search for sizes up to this value (default: %(default)s)")
+    
+    args = parser.parse_args()
+    
+    csv_path = os.path.join(Path(__file__).parent.parent, "data", "companies.csv")
+    corpus = [row['description'] for row in iter_csv_rows(csv_path)]
+    
+    # Load the model and connection outside the timed sections
+    get_embedding_model()
+    client = get_qdrant_client() if args.backend == "qdrant" else None
+    
+    cache = get_embedding_cache(model_cache_key(EMBEDDING_MODEL), VECTOR_SIZE)
+    
+    report = []
+    for size in args.sizes:
+        # Suffix cycled pitches so repeats are distinct texts (no embedding cache hits)
+        pitches = [
+            corpus[i % len(corpus)] if i < len(corpus) else f"{corpus[i % len(corpus)]} ({i // len(corpus)})"
+            for i in range(size)
+        ]
+        
+        # Smaller sizes are prefixes of larger ones: start every size from an empty cache
+        if cache:
+            cache.clear()
+        embedding_batch_stats.reset()
+        start = time.perf_counter()
+        embed_texts(pitches)
+        embed_s = time.perf_counter() - start
+        batch_stats = embedding_batch_stats.summary()
+        
+        # Embeddings are cached now, so this measures the search round trips alone
+        start = time.perf_counter()
+        results = search_similar_companies_batch(pitches, limit=args.limit, client=client, backend=args.backend,
+                                                 payload_source=args.payload_source)
+        search_s = time.perf_counter() - start
+        assert len(results) == size
+        
+        entry = {
+            'pitches': size,
+            'embed_s': embed_s,
+            'batch_search_s': search_s,
+            'pitches_per_s': size / (embed_s + search_s),
+            'embed_batches': batch_stats['batches'],
+            'padding_ratio': batch_stats['padding_ratio'],
+            'tokens_per_s': batch_stats['tokens_per_s'],
+        }
+        
+        if size <= args.sequential_max:
+            start = time.perf_counter()
+            for pitch in pitches:
+                search_similar_companies(pitch, limit=args.limit, client=client, backend=args.backend,
+                                         payload_source=args.payload_source, use_cache=False)
+            entry['sequential_search_s'] = time.perf_counter() - start
+        
+        report.append(entry)
+        print(f"{size:>6} pitches: embed {embed_s:.3f}s, batch search {search_s:.3f}s "
+              f"→ {entry['pitches_per_s']:.1f} pitches/s, "
+              f"{entry['padding_ratio']:.0%} padding over {entry['embed_batches']} batches"
+              + (f" (one-by-one search {entry['sequential_search_s']:.3f}s)" if 'sequential_search_s' in entry else ""))
+    
+    if client is not None:
+        client.close()
+    shutil.rmtree(SCRATCH_CACHE_DIR, ignore_errors=True)
+    
+    print("\nJSON output:")
+    print(json.dumps({'backend': args.backend, 'payload_source': args.payload_source, 'limit': args.limit, 'results': report}, indent=2))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Embedding throughput of the in-process model vs. the multi-process engine
+
+Embeds company descriptions from data/companies.csv with the in-process
+TextEmbedding (baseline) and with an EmbeddingEngine for every combination
+of --workers and --threads, bypassing the embedding cache so every run does
+real inference. Results are written as JSON to data/outputs/benchmarks/.
+"""
+import sys
+import os
+import json
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.qdrant_client import EMBEDDING_MODEL, get_embedding_model, iter_csv_rows
+from lib.embedding_engine import EmbeddingEngine
+
+
+def time_embedding(embed, texts, chunk_size: int) -> float:
+    """Seconds to embed texts in chunk_size calls, as the ingest pipeline does"""
+    start = time.perf_counter()
+    for i in range(0, len(texts), chunk_size):
+        np.asarray(list(embed(texts[i:i + chunk_size])))
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark multi-process embedding throughput")
+    parser.add_argument("--texts", type=int, default=2000, help="Descriptions to embed (default: %(default)s)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker process counts (default: %(default)s)")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2], help="Intra-op threads per worker (default: %(default)s)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="Texts per embed call (default: %(default)s)")
+
+    args = parser.parse_args()
+
+    csv_path = os.path.join(Path(__file__).parent.parent, "data", "companies.csv")
+    texts = [row['description'].strip() for row in iter_csv_rows(csv_path)][:args.texts]
+    print(f"Embedding {len(texts)} descriptions with {EMBEDDING_MODEL} (cpu count: {os.cpu_count()})")
+
+    results = []
+
+    model = get_embedding_model()
+    elapsed = time_embedding(model.embed, texts, args.chunk_size)
+    results.append({'mode': 'in-process', 'workers': 1, 'threads': None, 'seconds': elapsed, 'texts_per_s': len(texts) / elapsed})
+    print(f"  in-process            : {len(texts) / elapsed:8.1f} texts/s")
+
+    for workers in args.workers:
+        for threads in args.threads:
+            start = time.perf_counter()
+            with EmbeddingEngine(num_workers=workers, threads_per_worker=threads) as engine:
+                startup_s = time.perf_counter() - start
+                elapsed = time_embedding(engine.embed, texts, args.chunk_size)
+            results.append({
+                'mode': 'engine',
+                'workers': workers,
+                'threads': threads,
+                'startup_s': startup_s,
+                'seconds': elapsed,
+                'texts_per_s': len(texts) / elapsed,
+            })
+            print(f"  {workers} workers x {threads} threads: {len(texts) / elapsed:8.1f} texts/s "
+                  f"(startup {startup_s:.1f}s)")
+
+    best = max(results, key=lambda entry: entry['texts_per_s'])
+    print(f"\nBest: {best['mode']} {best['workers']} workers x {best['threads']} threads "
+          f"at {best['texts_per_s']:.1f} texts/s")
+
+    output_dir = Path(__file__).parent.parent / "data" / "outputs" / "benchmarks"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / f"embedding_engine_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({'model': EMBEDDING_MODEL, 'texts': len(texts), 'cpu_count': os.cpu_count(), 'results': results}, f, indent=2)
+    print(f"💾 Results saved to: {output_path}")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+"""
+Load time, throughput, memory and recall@k of the embedding profiles
+
+Each model variant (float32, int8) is loaded once and embeds the whole
+company corpus plus a fixed set of idea pitches, bypassing the embedding
+cache. Every profile then builds its vectors the way the local index does
+(PCA fitted on the corpus, float16 storage) and answers the pitches with an
+exact search. Recall@k is measured against the `default` profile, counting
+a hit as correct when its default score reaches the default k-th score so
+companies with identical descriptions tying at the cut-off are not misses.
+
+Memory is reported as the model's ONNX file size, the resident-set growth
+while loading it (Linux only) and the size of the stored vectors. Results
+are written as JSON to data/outputs/benchmarks/. Quantized profiles need
+scripts/quantize_embedding_model.py to have run.
+"""
+import sys
+import os
+import gc
+import json
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.batching import plan_batches
+from lib.qdrant_client import EMBEDDING_MODEL, iter_csv_rows
+from lib.local_index import normalize_rows, top_k
+from lib.embedding_profiles import EMBEDDING_PROFILES, PcaProjection, get_embedding_profile, load_text_embedding
+from scripts.benchmark_search import BENCHMARK_PITCHES
+
+
+def resident_mb() -> float:
+    """Resident set size of this process in MB (0 where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def embed_all(model, texts) -> np.ndarray:
+    """Embed texts in length-sorted batches, in input order"""
+    vectors = np.empty((len(texts), 0), dtype=np.float32)
+    for batch in plan_batches(texts):
+        embedded = np.asarray(list(model.embed([texts[i] for i in batch], batch_size=len(batch))), dtype=np.float32)
+        if vectors.shape[1] == 0:
+            vectors = np.empty((len(texts), embedded.shape[1]), dtype=np.float32)
+        vectors[batch] = embedded
+    return vectors
+
+
+def measure_variant(quantized: bool, texts, pitches) -> dict:
+    """Load one model variant and embed the corpus and the pitches with it"""
+    profile = 'int8' if quantized else 'default'
+    gc.collect()
+    rss_before = resident_mb()
+    start = time.perf_counter()
+    model = load_text_embedding(EMBEDDING_MODEL, profile)
+    list(model.embed(["warm-up"]))
+    load_s = time.perf_counter() - start
+    rss_mb = resident_mb() - rss_before
+
+    model_dir = Path(model.model._model_dir)
+    model_mb = sum(f.stat().st_size for f in model_dir.rglob('*.onnx')) / 1e6
+
+    start = time.perf_counter()
+    corpus = embed_all(model, texts)
+    embed_s = time.perf_counter() - start
+    queries = embed_all(model, pitches)
+    del model
+    return {
+        'load_s': load_s,
+        'rss_mb': rss_mb,
+        'model_mb': model_mb,
+        'texts_per_s': len(texts) / embed_s,
+        'corpus': normalize_rows(corpus),
+        'queries': normalize_rows(queries),
+    }
+
+
+def profile_vectors(profile: str, corpus: np.ndarray, queries: np.ndarray):
+    """Corpus (stored dtype) and query vectors of a profile, as the local index builds them"""
+    settings = get_embedding_profile(profile)
+    if settings['dims']:
+        projection = PcaProjection.fit(corpus, settings['dims'])
+        corpus = normalize_rows(projection.transform(corpus))
+        queries = normalize_rows(projection.transform(queries))
+    return corpus.astype(settings['dtype']), queries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the lighter embedding profiles against the default")
+    parser.add_argument("--profiles", nargs="+", choices=list(EMBEDDING_PROFILES), default=list(EMBEDDING_PROFILES),
+                        help="Profiles to measure (default: all)")
+    parser.add_argument("--limit", type=int, default=3, help="k for recall@k (default: %(default)s)")
+    parser.add_argument("--texts", type=int, default=None, help="Only use the first N descriptions (default: all)")
+
+    args = parser.parse_args()
+
+    csv_path = os.path.join(Path(__file__).parent.parent, "data", "companies.csv")
+    texts = [row['description'].strip() for row in iter_csv_rows(csv_path)][:args.texts]
+    profiles = ['default'] + [profile for profile in args.profiles if profile != 'default']
+    print(f"Embedding {len(texts)} descriptions and {len(BENCHMARK_PITCHES)} pitches with {EMBEDDING_MODEL}")
+
+    variants = {}
+    for quantized in sorted({get_embedding_profile(profile)['quantized'] for profile in profiles}):
+        variants[quantized] = measure_variant(quantized, texts, BENCHMARK_PITCHES)
+        variant = variants[quantized]
+        print(f"  {'int8' if quantized else 'float32'} model: load {variant['load_s']:.2f}s, "
+              f"{variant['texts_per_s']:.1f} texts/s, {variant['model_mb']:.1f} MB on disk, "
+              f"+{variant['rss_mb']:.0f} MB resident")
+
+    baseline = variants[False]
+    baseline_scores = baseline['queries'] @ baseline['corpus'].T
+    kth_scores = np.sort(baseline_scores, axis=1)[:, -min(args.limit, baseline_scores.shape[1])]
+
+    results = []
+    print(f"\n{'profile':<10} {'dims':>5} {'dtype':>8} {'store MB':>9} {'load s':>7} {'texts/s':>8} {f'recall@{args.limit}':>9}")
+    for profile in profiles:
+        settings = get_embedding_profile(profile)
+        variant = variants[settings['quantized']]
+        corpus, queries = profile_vectors(profile, variant['corpus'], variant['queries'])
+        found = top_k(queries @ corpus.astype(np.float32).T, args.limit)
+        recall = float(np.mean([
+            min(sum(baseline_scores[i, row] >= kth_scores[i] - 1e-6 for row in rows), args.limit) / args.limit
+            for i, rows in enumerate(found)
+        ]))
+        entry = {
+            'profile': profile,
+            'quantized': settings['quantized'],
+            'dims': corpus.shape[1],
+            'dtype': settings['dtype'],
+            'store_mb': corpus.nbytes / 1e6,
+            'load_s': variant['load_s'],
+            'rss_mb': variant['rss_mb'],
+            'model_mb': variant['model_mb'],
+            'texts_per_s': variant['texts_per_s'],
+            'recall': recall,
+        }
+        results.append(entry)
+        print(f"{profile:<10} {entry['dims']:>5} {entry['dtype']:>8} {entry['store_mb']:>9.2f} "
+              f"{entry['load_s']:>7.2f} {entry['texts_per_s']:>8.1f} {recall:>9.3f}")
+
+    output_dir = Path(__file__).parent.parent / "data" / "outputs" / "benchmarks"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / f"embedding_profiles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'model': EMBEDDING_MODEL,
+            'texts': len(texts),
+            'pitches': len(BENCHMARK_PITCHES),
+            'limit': args.limit,
+            'results': results,
+        }, f, indent=2)
+    print(f"\n💾 Results saved to: {output_path}")
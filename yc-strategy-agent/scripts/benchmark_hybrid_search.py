@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Compare dense-only and hybrid (dense + BM25) search on known-item queries
+
+Two query sets are sampled from data/companies.csv:
+- name: the company name alone (exact-term queries dense search struggles with)
+- description: the company's one-liner (semantic queries)
+A query counts as a hit when the source company is in the top k results.
+"""
+import sys
+import os
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.qdrant_client import get_qdrant_client, get_embedding_model, get_sparse_model, iter_csv_rows, search_similar_companies
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency/recall comparison of dense vs. hybrid search")
+    parser.add_argument("--queries", type=int, default=200, help="Companies sampled per query set (default: %(default)s)")
+    parser.add_argument("--limit", type=int, default=10, help="k for recall@k (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=42, help="Sampling seed (default: %(default)s)")
+    
+    args = parser.parse_args()
+    
+    csv_path = os.path.join(Path(__file__).parent.parent, "data", "companies.csv")
+    companies = list(iter_csv_rows(csv_path))
+    sample = random.Random(args.seed).sample(companies, min(args.queries, len(companies)))
+    query_sets = {
+        'name': [(row['name'], row['name']) for row in sample],
+        'description': [(row['description'], row['name']) for row in sample],
+    }
+    
+    # Load models and connect outside the timed loop
+    get_embedding_model()
+    get_sparse_model()
+    client = get_qdrant_client()
+    
+    report = {}
+    for set_name, queries in query_sets.items():
+        for mode in ("dense", "hybrid"):
+            latencies, hits = [], 0
+            for query, expected_name in queries:
+                start = time.perf_counter()
+                results = search_similar_companies(query, limit=args.limit, client=client, mode=mode, use_cache=False)
+                latencies.append((time.perf_counter() - start) * 1000)
+                hits += any(company['name'] == expected_name for company in results)
+            
+            key = f"{set_name}/{mode}"
+            report[key] = {
+                f'recall@{args.limit}': hits / len(queries),
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+            }
+            print(f"{key:<20} recall@{args.limit}={report[key][f'recall@{args.limit}']:.3f} "
+                  f"p50={report[key]['p50_ms']:.1f}ms p95={report[key]['p95_ms']:.1f}ms")
+    
+    client.close()
+    
+    print("\nJSON output:")
+    print(json.dumps(report, indent=2))
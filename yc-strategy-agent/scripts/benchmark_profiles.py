@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+Measure the RAM / build time / latency / recall tradeoff of each collection profile
+
+For every profile a scratch collection is built on the Qdrant server from
+the company vectors (optionally multiplied with noisy copies to simulate a
+larger dataset), then queried with sampled company descriptions. Recall@k
+is measured against exact brute-force results computed in NumPy.
+
+Quantization and HNSW settings have no effect in local/embedded Qdrant, so
+this needs a Qdrant server (QDRANT_URL). Results are written as JSON to
+data/outputs/benchmarks/.
+"""
+import sys
+import os
+import json
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qdrant_client.models import CollectionStatus
+from lib.qdrant_client import (
+    COLLECTION_NAME,
+    COLLECTION_PROFILES,
+    VECTOR_NAME,
+    VECTOR_SIZE,
+    create_collection,
+    embed_texts,
+    get_collection_profile,
+    get_qdrant_client,
+    iter_csv_rows,
+)
+from lib.local_index import normalize_rows, top_k, recall_at_k
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+
+def estimate_ram_bytes(profile: dict, count: int) -> int:
+    """
+    Rough resident size of the dense vector data for a profile: originals
+    (unless on disk), quantized copies and HNSW links (unless on disk)
+    """
+    original = count * VECTOR_SIZE * 4
+    quantization = profile['quantization_config']
+    if quantization is None:
+        quantized = 0
+    elif hasattr(quantization, 'binary'):
+        quantized = count * VECTOR_SIZE // 8
+    else:
+        quantized = count * VECTOR_SIZE
+    hnsw = profile['hnsw_config']
+    m = hnsw.m if hnsw is not None and hnsw.m else 16
+    links = count * m * 2 * 4
+    hnsw_on_disk = hnsw is not None and hnsw.on_disk
+    return (0 if profile['on_disk'] else original) + quantized + (0 if hnsw_on_disk else links)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark collection profiles against an exact baseline")
+    parser.add_argument("--profiles", nargs="+", default=list(COLLECTION_PROFILES), choices=list(COLLECTION_PROFILES))
+    parser.add_argument("--multiply", type=int, default=1, help="Add noisy copies to reach N x the corpus size (default: %(default)s)")
+    parser.add_argument("--queries", type=int, default=500, help="Number of queries (default: %(default)s)")
+    parser.add_argument("--limit", type=int, default=10, help="k for recall@k (default: %(default)s)")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch collections")
+    
+    args = parser.parse_args()
+    
+    csv_path = os.path.join(Path(__file__).parent.parent, "data", "companies.csv")
+    texts = [row['description'].strip() for row in iter_csv_rows(csv_path)]
+    print(f"Embedding {len(texts)} descriptions (cached after the first run)...")
+    base = normalize_rows(embed_texts(texts))
+    
+    rng = np.random.default_rng(0)
+    copies = [base] + [normalize_rows(base + rng.normal(0, 0.05, base.shape).astype(np.float32)) for _ in range(args.multiply - 1)]
+    vectors = np.concatenate(copies)
+    queries = normalize_rows(base[rng.choice(len(base), size=min(args.queries, len(base)), replace=False)]
+                             + rng.normal(0, 0.02, (min(args.queries, len(base)), VECTOR_SIZE)).astype(np.float32))
+    
+    print(f"Computing exact top-{args.limit} for {len(queries)} queries over {len(vectors)} vectors...")
+    exact = top_k(queries @ vectors.T, args.limit).tolist()
+    
+    client = get_qdrant_client()
+    results = []
+    for profile_name in args.profiles:
+        profile = get_collection_profile(profile_name)
+        collection_name = f"{COLLECTION_NAME}_bench_{profile_name.replace('-', '_')}"
+        print(f"\n=== {profile_name} → {collection_name}")
+        
+        start = time.perf_counter()
+        create_collection(client, collection_name, recreate=True, profile=profile_name)
+        client.upload_collection(
+            collection_name=collection_name,
+            vectors={VECTOR_NAME: vectors},
+            ids=range(len(vectors)),
+            batch_size=256,
+            parallel=4,
+            wait=True
+        )
+        while client.get_collection(collection_name).status != CollectionStatus.GREEN:
+            time.sleep(0.5)
+        build_s = time.perf_counter() - start
+        
+        latencies, found = [], []
+        for query in queries:
+            request_start = time.perf_counter()
+            response = client.query_points(
+                collection_name=collection_name,
+                query=query.tolist(),
+                using=VECTOR_NAME,
+                search_params=profile['search_params'],
+                limit=args.limit,
+                with_payload=False
+            )
+            latencies.append((time.perf_counter() - request_start) * 1000)
+            found.append([point.id for point in response.points])
+        
+        entry = {
+            'profile': profile_name,
+            'vectors': len(vectors),
+            'estimated_ram_mb': estimate_ram_bytes(profile, len(vectors)) / 1e6,
+            'build_s': build_s,
+            'p50_ms': percentile(latencies, 50),
+            'p99_ms': percentile(latencies, 99),
+            f'recall@{args.limit}': recall_at_k(exact, found),
+        }
+        results.append(entry)
+        print(f"RAM≈{entry['estimated_ram_mb']:.1f} MB, build {build_s:.1f}s, "
+              f"p50 {entry['p50_ms']:.2f} ms, p99 {entry['p99_ms']:.2f} ms, "
+              f"recall@{args.limit} {entry[f'recall@{args.limit}']:.3f}")
+        
+        if not args.keep:
+            client.delete_collection(collection_name)
+    
+    client.close()
+    
+    output_dir = Path(__file__).parent.parent / "data" / "outputs" / "benchmarks"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / f"profiles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({'queries': len(queries), 'limit': args.limit, 'results': results}, f, indent=2)
+    print(f"\n💾 Results saved to: {output_path}")
@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+"""
+Repeatable end-to-end benchmark of the search path on embedded Qdrant
+
+Loads data/companies.csv into a local embedded Qdrant (in memory, or on
+disk with --path) through the regular ingest pipeline, then replays a fixed
+set of idea pitches and reports:
+- ingest time
+- p50/p95/p99 latency of search_similar_companies
+- QPS with N concurrent callers
+- recall@k against exact brute-force scores over the indexed vectors
+
+No Qdrant server or network is needed once the embedding model is cached.
+Results are written as JSON (with the git commit) to data/outputs/benchmarks/,
+and --compare prints the change against an earlier run. Set
+EMBEDDING_CACHE=false to include full model time in the ingest figure.
+"""
+import sys
+import os
+import json
+import time
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qdrant_client import QdrantClient
+from lib.qdrant_client import (
+    COLLECTION_PROFILE,
+    COLLECTION_PROFILES,
+    EMBEDDING_MODEL,
+    VECTOR_NAME,
+    create_collection,
+    embed_texts,
+    get_embedding_model,
+    iter_csv_rows,
+    run_ingest_pipeline,
+    search_similar_companies,
+)
+from lib.local_index import normalize_rows
+
+BENCHMARK_COLLECTION = "benchmark_companies"
+
+BENCHMARK_PITCHES = [
+    "AI-powered CRM for startups",
+    "Food delivery marketplace for suburban restaurants",
+    "Developer tools for testing LLM applications",
+    "Payroll and compliance for remote teams",
+    "Vertical SaaS for dental clinics",
+    "Open-source observability platform for Kubernetes",
+    "Carbon accounting software for manufacturers",
+    "Telehealth for pet owners",
+    "Embedded insurance API for e-commerce platforms",
+    "Robotic process automation for accounting firms",
+    "Marketplace for freelance video editors",
+    "Battery recycling for electric vehicles",
+    "AI tutor for high school math",
+    "Fraud detection for cross-border payments",
+    "Construction project management on mobile",
+    "Synthetic data generation for computer vision",
+    "B2B procurement platform for restaurants",
+    "Personal finance app for Gen Z",
+    "Clinical trial recruitment using patient records",
+    "Voice AI agents for customer support call centers",
+]
+
+# Metrics compared by --compare: (key, higher is better)
+COMPARED_METRICS = [
+    ('ingest_s', False),
+    ('p50_ms', False),
+    ('p95_ms', False),
+    ('p99_ms', False),
+    ('recall', True),
+]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+
+def git_commit() -> str:
+    """Current commit hash, or '' outside a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).parent, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def fetch_vectors(client: QdrantClient, collection_name: str):
+    """All point IDs and dense vectors of a collection"""
+    ids, vectors = [], []
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=collection_name,
+            limit=1000,
+            offset=offset,
+            with_payload=False,
+            with_vectors=[VECTOR_NAME]
+        )
+        for record in records:
+            ids.append(record.id)
+            vectors.append(record.vector[VECTOR_NAME])
+        if offset is None:
+            break
+    return np.array(ids, dtype=np.int64), normalize_rows(np.array(vectors, dtype=np.float32))
+
+
+def run_concurrent(client: QdrantClient, pitches, limit: int, concurrency: int, rounds: int) -> float:
+    """Queries per second with `concurrency` callers replaying the pitches"""
+    def worker(offset: int):
+        for i in range(rounds * len(pitches)):
+            search_similar_companies(
+                pitches[(offset + i) % len(pitches)],
+                limit=limit,
+                collection_name=BENCHMARK_COLLECTION,
+                client=client,
+                backend="qdrant",
+                use_cache=False
+            )
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    return concurrency * rounds * len(pitches) / (time.perf_counter() - start)
+
+
+def print_comparison(previous_path: str, current: dict):
+    """Print each compared metric next to its value in an earlier run"""
+    with open(previous_path, 'r', encoding='utf-8') as f:
+        previous = json.load(f)
+    print(f"\nChange vs. {previous_path} (commit {previous.get('commit') or '?'}):")
+    for key, higher_is_better in COMPARED_METRICS:
+        before, after = previous['results'].get(key), current['results'].get(key)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before if before else 0.0
+        better = change > 0 if higher_is_better else change < 0
+        marker = "✅" if better else ("⚠️ " if change else "  ")
+        print(f"  {marker} {key:<10} {before:10.3f} → {after:10.3f} ({change:+.1%})")
+    for level, qps in current['results']['qps'].items():
+        before = previous['results'].get('qps', {}).get(level)
+        if before:
+            print(f"     qps@{level:<6} {before:10.1f} → {qps:10.1f} ({(qps - before) / before:+.1%})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ingest, latency, QPS and recall on embedded Qdrant")
+    parser.add_argument("--path", default=None, help="Embedded Qdrant storage directory (default: in memory)")
+    parser.add_argument("--profile", choices=list(COLLECTION_PROFILES), default=COLLECTION_PROFILE,
+                        help="Collection profile (default: %(default)s)")
+    parser.add_argument("--limit", type=int, default=10, help="k for results and recall@k (default: %(default)s)")
+    parser.add_argument("--rounds", type=int, default=5, help="Times the pitches are replayed per measurement (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16],
+                        help="Concurrent callers for the QPS runs (default: %(default)s)")
+    parser.add_argument("--output", default=None, help="JSON output path (default: data/outputs/benchmarks/search_<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier JSON output to compare against")
+
+    args = parser.parse_args()
+
+    csv_path = os.path.join(Path(__file__).parent.parent, "data", "companies.csv")
+    client = QdrantClient(path=args.path) if args.path else QdrantClient(":memory:")
+
+    # Model load is a one-off cost, keep it out of the ingest figure
+    get_embedding_model()
+
+    print(f"Ingesting {csv_path} into embedded Qdrant ({args.path or ':memory:'})...")
+    start = time.perf_counter()
+    create_collection(client, BENCHMARK_COLLECTION, recreate=True, profile=args.profile)
+    # Embedded Qdrant is not safe for concurrent writes, so a single uploader
+    points = run_ingest_pipeline(client, iter_csv_rows(csv_path), collection_name=BENCHMARK_COLLECTION, upload_workers=1)
+    ingest_s = time.perf_counter() - start
+    print(f"  {points} points in {ingest_s:.2f}s")
+
+    # Warm-up round: pitch embeddings are cached afterwards, as in a warm service.
+    # The query cache stays out of every timed search, or repeats would skip the model and Qdrant.
+    embed_texts(BENCHMARK_PITCHES)
+    for pitch in BENCHMARK_PITCHES:
+        search_similar_companies(pitch, limit=args.limit, collection_name=BENCHMARK_COLLECTION, client=client,
+                                 backend="qdrant", use_cache=False)
+
+    latencies = []
+    for _ in range(args.rounds):
+        for pitch in BENCHMARK_PITCHES:
+            request_start = time.perf_counter()
+            search_similar_companies(pitch, limit=args.limit, collection_name=BENCHMARK_COLLECTION, client=client,
+                                     backend="qdrant", use_cache=False)
+            latencies.append((time.perf_counter() - request_start) * 1000)
+    print(f"  latency p50 {percentile(latencies, 50):.2f} ms, p95 {percentile(latencies, 95):.2f} ms, "
+          f"p99 {percentile(latencies, 99):.2f} ms")
+
+    qps = {}
+    for concurrency in args.concurrency:
+        qps[str(concurrency)] = run_concurrent(client, BENCHMARK_PITCHES, args.limit, concurrency, args.rounds)
+        print(f"  {concurrency:>3} concurrent callers: {qps[str(concurrency)]:.1f} QPS")
+
+    # Exact scores against the vectors actually stored in the collection
+    ids, vectors = fetch_vectors(client, BENCHMARK_COLLECTION)
+    row_by_id = {int(point_id): row for row, point_id in enumerate(ids)}
+    query_vectors = normalize_rows(embed_texts(BENCHMARK_PITCHES))
+    exact_scores = query_vectors @ vectors.T
+    found = []
+    for query_vector in query_vectors:
+        response = client.query_points(
+            collection_name=BENCHMARK_COLLECTION,
+            query=query_vector.tolist(),
+            using=VECTOR_NAME,
+            search_params=COLLECTION_PROFILES[args.profile]['search_params'],
+            limit=args.limit,
+            with_payload=False
+        )
+        found.append([point.id for point in response.points])
+    # A result is correct when it scores at least the exact k-th score, so
+    # companies with identical descriptions tying at the cut-off are not misses
+    kth_scores = np.sort(exact_scores, axis=1)[:, -min(args.limit, exact_scores.shape[1])]
+    per_query = [
+        min(sum(exact_scores[i, row_by_id[point_id]] >= kth_scores[i] - 1e-6 for point_id in found_ids), args.limit) / args.limit
+        for i, found_ids in enumerate(found)
+    ]
+    recall = float(np.mean(per_query))
+    print(f"  recall@{args.limit} vs. brute force: {recall:.3f}")
+
+    client.close()
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'storage': args.path or ':memory:',
+            'profile': args.profile,
+            'embedding_model': EMBEDDING_MODEL,
+            'pitches': len(BENCHMARK_PITCHES),
+            'rounds': args.rounds,
+            'limit': args.limit,
+        },
+        'results': {
+            'points': points,
+            'ingest_s': ingest_s,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'qps': qps,
+            'recall': recall,
+        },
+    }
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+    else:
+        output_dir = Path(__file__).parent.parent / "data" / "outputs" / "benchmarks"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / f"search_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results saved to: {output_path}")
+
+    if args.compare:
+        print_comparison(args.compare, report)
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+"""
+Embed data/companies.csv once and save it as a versioned artifact
+
+The artifact (vectors, sparse vectors and payloads, tagged with the model
+and the CSV hash) lets new environments index the collection with
+`scripts/0_setup_qdrant.py --from-artifact` instead of re-embedding.
+"""
+import sys
+import os
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.artifact import ARTIFACT_DIR, build_artifact, default_artifact_path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build an embedding artifact from the companies CSV")
+    parser.add_argument("--output", default=None,
+                        help=f"Artifact directory (default: {ARTIFACT_DIR}/<model>-<csv hash>)")
+    parser.add_argument("--no-sparse", action="store_true", help="Leave out the BM25 sparse vectors")
+    
+    args = parser.parse_args()
+    
+    csv_path = os.path.join(Path(__file__).parent.parent, "data", "companies.csv")
+    output = args.output or default_artifact_path(csv_path)
+    
+    print(f"Building artifact from {csv_path}...")
+    start_time = time.time()
+    try:
+        path = build_artifact(csv_path, output, include_sparse=not args.no_sparse)
+    except Exception as e:
+        print(f"❌ Error building artifact: {e}")
+        sys.exit(1)
+    
+    size = sum(f.stat().st_size for f in Path(path).iterdir())
+    print(f"✅ Artifact written in {time.time() - start_time:.2f} seconds ({size / 1e6:.1f} MB) → {path}")
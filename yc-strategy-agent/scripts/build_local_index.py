@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Build the in-process NumPy search index (SEARCH_BACKEND=local) and
+optionally check Qdrant's results against its exact top-k
+"""
+import sys
+import os
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.qdrant_client import get_qdrant_client, company_point_id, embed_texts, search_similar_companies, COLLECTION_NAME
+from lib.local_index import (
+    LOCAL_INDEX_DIR,
+    LocalIndex,
+    build_local_index_from_csv,
+    build_local_index_from_collection,
+    recall_at_k,
+)
+from lib.embedding_profiles import EMBEDDING_PROFILE, EMBEDDING_PROFILES
+
+VERIFY_PITCHES = [
+    "AI-powered CRM for startups",
+    "Food delivery marketplace for suburban restaurants",
+    "Developer tools for testing LLM applications",
+    "Payroll and compliance for remote teams",
+    "Vertical SaaS for dental clinics",
+]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the local exact-search index")
+    parser.add_argument("--source", choices=["csv", "qdrant"], default="csv",
+                        help="Embed data/companies.csv, or mirror the Qdrant collection (default: %(default)s)")
+    parser.add_argument("--output", default=LOCAL_INDEX_DIR, help="Index directory (default: %(default)s)")
+    parser.add_argument("--embedding-profile", choices=list(EMBEDDING_PROFILES), default=EMBEDDING_PROFILE,
+                        help="PCA dimensions / float16 storage of the index vectors; the model itself follows "
+                             "EMBEDDING_PROFILE (default: %(default)s)")
+    parser.add_argument("--verify", action="store_true", help="Report Qdrant recall@k against the exact results of the index just built")
+    parser.add_argument("--limit", type=int, default=10, help="k used by --verify (default: %(default)s)")
+    
+    args = parser.parse_args()
+    
+    start_time = time.time()
+    try:
+        if args.source == "csv":
+            csv_path = os.path.join(Path(__file__).parent.parent, "data", "companies.csv")
+            print(f"Building local index from {csv_path}...")
+            count = build_local_index_from_csv(csv_path, index_dir=args.output, profile=args.embedding_profile)
+        else:
+            print(f"Mirroring Qdrant collection '{COLLECTION_NAME}'...")
+            client = get_qdrant_client()
+            count = build_local_index_from_collection(client, index_dir=args.output, profile=args.embedding_profile)
+            client.close()
+    except Exception as e:
+        print(f"❌ Error building local index: {e}")
+        sys.exit(1)
+    
+    print(f"✅ Indexed {count} companies in {time.time() - start_time:.2f} seconds → {args.output}")
+    
+    if args.verify:
+        # The index just written to --output, not the one SEARCH_BACKEND=local would open
+        index = LocalIndex(args.output)
+        expected, actual = [], []
+        for pitch, query_vector in zip(VERIFY_PITCHES, embed_texts(VERIFY_PITCHES)):
+            qdrant_results = search_similar_companies(pitch, limit=args.limit, backend="qdrant", use_cache=False)
+            expected.append([point_id for point_id, _, _ in index.search(query_vector, limit=args.limit)])
+            actual.append([company_point_id(c) for c in qdrant_results])
+        print(f"Qdrant recall@{args.limit} vs exact baseline: {recall_at_k(expected, actual):.3f}")
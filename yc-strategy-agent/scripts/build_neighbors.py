@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Precompute the top-k most similar companies of every company
+
+Vectors come from the Qdrant collection (default) or the local index. Only
+companies whose vector changed since the last build are rescored against
+the whole corpus; use --full to recompute everything.
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.qdrant_client import COLLECTION_NAME, get_pooled_client
+from lib.neighbors import NEIGHBORS_DIR, NEIGHBORS_K, NeighborIndex, build_neighbors, fetch_collection_vectors
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the company-to-company neighbour index")
+    parser.add_argument("--source", choices=["qdrant", "local"], default="qdrant",
+                        help="Read vectors from the Qdrant collection or the local index (default: %(default)s)")
+    parser.add_argument("--k", type=int, default=NEIGHBORS_K, help="Neighbours kept per company (default: %(default)s)")
+    parser.add_argument("--block-size", type=int, default=1024, help="Rows scored per matrix product (default: %(default)s)")
+    parser.add_argument("--full", action="store_true", help="Recompute every company instead of only the changed ones")
+    parser.add_argument("--output", default=NEIGHBORS_DIR, help="Neighbour index directory (default: %(default)s)")
+    parser.add_argument("--show", metavar="COMPANY", help="Print the neighbours of a company after the build")
+    
+    args = parser.parse_args()
+    
+    start_time = time.time()
+    try:
+        if args.source == "qdrant":
+            print(f"Reading vectors from Qdrant collection '{COLLECTION_NAME}'...")
+            ids, vectors = fetch_collection_vectors(get_pooled_client())
+            source = f"qdrant:{COLLECTION_NAME}"
+        else:
+            from lib.local_index import get_local_index
+            index = get_local_index()
+            ids, vectors = index.ids, index.vectors
+            source = "local"
+        
+        stats = build_neighbors(ids, vectors, k=args.k, neighbors_dir=args.output,
+                                block_size=args.block_size, full=args.full, source=source)
+    except Exception as e:
+        print(f"❌ Error building neighbour index: {e}")
+        sys.exit(1)
+    
+    print(f"✅ Neighbours of {stats['points']} companies in {time.time() - start_time:.2f} seconds → {args.output}")
+    print(f"   {stats['recomputed']} recomputed, {stats['merged']} merged with changed companies, "
+          f"{stats['unchanged']} unchanged")
+    
+    if args.show:
+        neighbors = NeighborIndex(args.output)
+        if args.source == "local":
+            payload_of = lambda point_id: index.payload(index.row_by_id[point_id])
+        else:
+            client = get_pooled_client()
+            payload_of = lambda point_id: client.retrieve(COLLECTION_NAME, ids=[point_id])[0].payload
+        print(f"\nCompanies most similar to {args.show}:")
+        for i, (point_id, score) in enumerate(neighbors.neighbors_by_name(args.show, limit=10), 1):
+            print(f"{i:>3}. {payload_of(point_id).get('name', point_id)} ({score:.3f})")
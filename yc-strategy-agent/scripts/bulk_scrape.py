@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Scrape many YC listings (and optionally their landing pages) concurrently
+
+Listings are scraped by the async ScrapeEngine, under the global and
+per-host concurrency caps; every result is appended to a JSON Lines file as
+soon as it completes, and a listing's landing page is queued as soon as its
+website is known.
+"""
+import sys
+import csv
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+# Add parent directory to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.browser_pool import async_browser_pool, browser_pool_stats
+from lib.scraper import scrape_tier_stats
+from lib.resource_blocking import resource_blocking_stats
+from lib.scraper_async import SCRAPE_CONCURRENCY, SCRAPE_PER_HOST_CONCURRENCY, ScrapeEngine
+
+
+async def bulk_scrape(rows, output_path: Path, landing_pages: bool, engine: ScrapeEngine) -> int:
+    """Scrape every row's listing (and landing page); returns the number of pages written"""
+    written = 0
+
+    async def scrape_company(row, out):
+        nonlocal written
+        listing = await engine.scrape('yc_listing', row['url'], csv_data=row)
+        out.write(json.dumps({'kind': 'yc_listing', 'name': row['name'], 'data': listing}, ensure_ascii=False) + "\n")
+        written += 1
+        if landing_pages and listing.get('website'):
+            landing = await engine.scrape('landing_page', listing['website'])
+            out.write(json.dumps({'kind': 'landing_page', 'name': row['name'], 'data': landing}, ensure_ascii=False) + "\n")
+            written += 1
+        print(f"  [{written} pages] {row['name']}")
+
+    with open(output_path, 'w', encoding='utf-8') as out:
+        try:
+            await asyncio.gather(*(scrape_company(row, out) for row in rows))
+        finally:
+            await async_browser_pool.close()
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape YC listings concurrently")
+    parser.add_argument("--limit", type=int, default=50, help="Number of companies from the CSV (default: %(default)s)")
+    parser.add_argument("--landing-pages", action="store_true", help="Also scrape each company's website")
+    parser.add_argument("--concurrency", type=int, default=SCRAPE_CONCURRENCY,
+                        help="Pages in flight overall (default: %(default)s)")
+    parser.add_argument("--per-host", type=int, default=SCRAPE_PER_HOST_CONCURRENCY,
+                        help="Pages in flight per host (default: %(default)s)")
+    parser.add_argument("--output", type=str, default=None, help="JSON Lines output (default: data/outputs/scraped_<timestamp>.jsonl)")
+
+    args = parser.parse_args()
+
+    csv_path = Path(__file__).parent.parent / "data" / "companies.csv"
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        rows = [row for row in csv.DictReader(f) if row.get('url')][:args.limit]
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        output_path = Path(__file__).parent.parent / "data" / "outputs" / f"scraped_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"Scraping {len(rows)} companies (concurrency {args.concurrency}, {args.per_host} per host)...")
+    engine = ScrapeEngine(concurrency=args.concurrency, per_host=args.per_host)
+    start = time.perf_counter()
+    try:
+        written = asyncio.run(bulk_scrape(rows, output_path, args.landing_pages, engine))
+    except Exception as e:
+        print(f"❌ Error during bulk scrape: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    stats = engine.stats()
+    pool = browser_pool_stats()
+    print(f"\n✅ {written} pages in {elapsed:.1f}s ({written / elapsed:.2f} pages/s), {stats['errors']} errors")
+    print(f"   Peak in flight: {stats['max_in_flight']}, summed page time {stats['scrape_s']:.1f}s "
+          f"({stats['scrape_s'] / elapsed:.1f}x overlap)")
+    print(f"   Browser launches: {pool['launches']}, pages per browser: {pool['pages_per_browser']:.1f}")
+    tiers = scrape_tier_stats()
+    print(f"   YC listings cached: {tiers['cache']}, from raw HTML: {tiers['http']}, "
+          f"rendered: {tiers['browser']}, failed: {tiers['failed']}")
+    blocking = resource_blocking_stats()
+    print(f"   Blocked requests: {blocking['blocked']}/{blocking['requests']} "
+          f"({blocking['blocked_per_page']:.1f} and ~{blocking['bytes_saved_est_per_page'] / 1e6:.2f} MB per page, estimated)")
+    print(f"💾 Results saved to: {output_path}")
@@ -10,13 +10,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
-from qdrant_client import QdrantClient
 from qdrant_client.models import Document
+from lib.qdrant_client import get_pooled_client
 
 load_dotenv()
 
-QDRANT_URL = os.getenv("QDRANT_URL")
-QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
 COLLECTION_NAME = os.getenv("COLLECTION_NAME", "yc_companies")
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "BAAI/bge-small-en")
 VECTOR_NAME = f"fast-{EMBEDDING_MODEL.split('/')[-1].lower()}"
@@ -27,7 +25,7 @@ def test_collection_info():
     print("Collection Info")
     print("=" * 60)
     
-    client = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY, prefer_grpc=True)
+    client = get_pooled_client()
     
     if not client.collection_exists(collection_name=COLLECTION_NAME):
         print(f"❌ Collection '{COLLECTION_NAME}' does not exist!")
@@ -49,7 +47,6 @@ def test_collection_info():
         print(f"   - Name: {sample.payload.get('name', 'N/A')}")
         print(f"   - Description: {sample.payload.get('description', 'N/A')[:80]}...")
     
-    client.close()
     return True
 
 
@@ -59,7 +56,7 @@ def test_search():
     print("Testing Search")
     print("=" * 60)
     
-    client = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY, prefer_grpc=True)
+    client = get_pooled_client()
     
     query_text = "AI-powered CRM for startups"
     print(f"Query: '{query_text}'")
@@ -112,8 +109,6 @@ def test_search():
         print(f"❌ Error: {e}")
         import traceback
         traceback.print_exc()
-    finally:
-        client.close()
 
 
 if __name__ == "__main__":
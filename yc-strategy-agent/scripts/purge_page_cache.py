@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""
+Show statistics of the scraped page cache or purge entries from it
+"""
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.page_cache import PAGE_CACHE_PATH, PAGE_CACHE_TTLS, PageCache
+
+
+def print_stats(cache: PageCache):
+    stats = cache.stats()
+    print(f"Page cache: {stats['path']}")
+    if not stats['sources']:
+        print("  (empty)")
+    for source, entry in stats['sources'].items():
+        print(f"  {source:<14} {entry['entries']:>6} pages, {entry['html_bytes'] / 1e6:.1f} MB compressed HTML, "
+              f"{entry['data_bytes'] / 1e6:.1f} MB extracted data, TTL {entry['ttl'] / 3600:.0f}h")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or purge the scraped page cache")
+    parser.add_argument("--source", choices=list(PAGE_CACHE_TTLS), default=None,
+                        help="Only purge pages of this source (default: all sources)")
+    parser.add_argument("--expired", action="store_true", help="Purge pages past their source's TTL")
+    parser.add_argument("--older-than", type=float, default=None, metavar="DAYS",
+                        help="Purge pages fetched more than DAYS days ago")
+    parser.add_argument("--all", action="store_true", help="Purge every page (of --source, if given)")
+    parser.add_argument("--stats", action="store_true", help="Only print statistics (as JSON)")
+
+    args = parser.parse_args()
+
+    if not Path(PAGE_CACHE_PATH).exists():
+        print(f"No page cache at '{PAGE_CACHE_PATH}'")
+        sys.exit(0)
+
+    try:
+        cache = PageCache()
+        if args.stats:
+            print(json.dumps(cache.stats(), indent=2))
+            sys.exit(0)
+
+        if not (args.expired or args.older_than is not None or args.all):
+            print_stats(cache)
+            print("\nNothing purged: pass --expired, --older-than DAYS or --all")
+            sys.exit(0)
+
+        older_than = args.older_than * 86400 if args.older_than is not None else None
+        deleted = cache.purge(source=args.source, expired_only=args.expired, older_than=older_than)
+        print(f"✅ Purged {deleted} pages")
+        print_stats(cache)
+    except Exception as e:
+        print(f"❌ Error purging page cache: {e}")
+        sys.exit(1)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+"""
+Write the int8 copy of the embedding model used by quantized embedding
+profiles (EMBEDDING_PROFILE=int8 or lite). Needs the `onnx` package.
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.qdrant_client import EMBEDDING_MODEL
+from lib.embedding_profiles import quantize_model, quantized_model_path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quantize the embedding model to int8")
+    parser.add_argument("--output", default=None,
+                        help=f"Output directory (default: {quantized_model_path(EMBEDDING_MODEL)})")
+    
+    args = parser.parse_args()
+    
+    print(f"Quantizing {EMBEDDING_MODEL} to int8...")
+    start_time = time.time()
+    try:
+        output = quantize_model(EMBEDDING_MODEL, args.output)
+    except Exception as e:
+        print(f"❌ Error quantizing model: {e}")
+        sys.exit(1)
+    
+    size = sum(f.stat().st_size for f in output.rglob('*.onnx'))
+    print(f"✅ int8 model written in {time.time() - start_time:.2f} seconds ({size / 1e6:.1f} MB) → {output}")
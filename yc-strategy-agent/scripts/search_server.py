@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+"""
+Start the warm semantic search service (keeps the embedding model and
+Qdrant client loaded between requests)
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.search_service import serve, SEARCH_SERVICE_HOST, SEARCH_SERVICE_PORT
+from lib.qdrant_client import COLLECTION_NAME
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the warm semantic search service")
+    parser.add_argument("--host", default=SEARCH_SERVICE_HOST, help="Interface to bind (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=SEARCH_SERVICE_PORT, help="Port to listen on (default: %(default)s)")
+    parser.add_argument("--collection", default=COLLECTION_NAME, help="Qdrant collection to search (default: %(default)s)")
+    
+    args = parser.parse_args()
+    
+    try:
+        serve(host=args.host, port=args.port, collection_name=args.collection)
+    except Exception as e:
+        print(f"❌ Error starting search service: {e}")
+        sys.exit(1)
@@ -8,7 +8,7 @@ from pathlib import Path
 # Add parent directory to path to import lib
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from lib.qdrant_client import get_qdrant_client, COLLECTION_NAME
+from lib.qdrant_client import get_pooled_client, COLLECTION_NAME
 
 def test_collection():
     """Test that collection exists and has data"""
@@ -16,7 +16,7 @@ def test_collection():
     print("Testing Qdrant Collection")
     print("=" * 60)
     
-    client = get_qdrant_client()
+    client = get_pooled_client()
     
     # Check if collection exists
     if not client.collection_exists(collection_name=COLLECTION_NAME):
@@ -55,7 +55,6 @@ def test_collection():
         print(f"❌ Error fetching points: {e}")
         return False
     
-    client.close()
     return True
 
 
@@ -0,0 +1,5 @@
+"""Make `lib` importable when pytest runs from the repository root or tests/"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
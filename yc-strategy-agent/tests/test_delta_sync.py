@@ -0,0 +1,114 @@
+"""sync_companies_from_csv: new, changed, unchanged and deleted companies against an in-memory Qdrant"""
+import csv
+import hashlib
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import SparseVector
+
+from lib import dedup, qdrant_client as qc
+
+FIELDS = ['name', 'description', 'main_industry', 'sub_industry', 'batch', 'url']
+COMPANIES = [
+    ['Acme Rockets', 'Reusable rockets for small satellite launches', 'Industrials', 'Aerospace', 'W21',
+     'https://www.ycombinator.com/companies/acme-rockets'],
+    ['Ledgerly', 'Bookkeeping software that closes the books for startups', 'Fintech', 'Accounting', 'S22',
+     'https://www.ycombinator.com/companies/ledgerly'],
+    ['PetPal', 'Telehealth visits with veterinarians for dogs and cats', 'Consumer', 'Pets', 'W23',
+     'https://www.ycombinator.com/companies/petpal'],
+]
+
+
+class FakeEmbedding:
+    """Deterministic stand-in for the fastembed model, counting embedded texts"""
+
+    def __init__(self):
+        self.texts = []
+
+    def embed(self, texts, batch_size=None):
+        for text in texts:
+            self.texts.append(text)
+            seed = int.from_bytes(hashlib.sha256(text.encode('utf-8')).digest()[:4], 'little')
+            yield np.random.default_rng(seed).normal(size=qc.VECTOR_SIZE).astype(np.float32)
+
+
+@pytest.fixture
+def qdrant(tmp_path, monkeypatch):
+    client = QdrantClient(":memory:")
+    model = FakeEmbedding()
+    monkeypatch.setattr(qc, 'get_pooled_client', lambda: client)
+    monkeypatch.setattr(qc, 'get_embedding_model', lambda: model)
+    monkeypatch.setattr(qc, 'get_embedding_cache', lambda model_name, dim: None)
+    monkeypatch.setattr(qc, 'embed_sparse_documents', lambda texts: [SparseVector(indices=[0], values=[1.0]) for _ in texts])
+    monkeypatch.setattr(qc, 'bump_index_generation', lambda: None)
+    monkeypatch.setattr(dedup, 'DEDUP_REPORT_PATH', str(tmp_path / "dedup_report.json"))
+    client.model = model
+    yield client
+    client.close()
+
+
+def write_csv(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+    return str(path)
+
+
+def sync(csv_path):
+    return qc.sync_companies_from_csv(csv_path, collection_name="companies", max_workers=1, upload_workers=1, embed_processes=0)
+
+
+def stored(client):
+    records, _ = client.scroll("companies", limit=100, with_payload=True)
+    return {record.payload['name']: record.payload for record in records}
+
+
+def test_first_sync_adds_everything(qdrant, tmp_path):
+    stats = sync(write_csv(tmp_path / "companies.csv", COMPANIES))
+
+    assert stats == {'new': 3, 'changed': 0, 'unchanged': 0, 'deleted': 0}
+    assert set(stored(qdrant)) == {'Acme Rockets', 'Ledgerly', 'PetPal'}
+
+
+def test_second_sync_classifies_rows(qdrant, tmp_path):
+    sync(write_csv(tmp_path / "companies.csv", COMPANIES))
+    qdrant.model.texts.clear()
+
+    updated = [
+        COMPANIES[0],
+        # Payload-only change: re-upserted with its new batch
+        COMPANIES[1][:4] + ['W24'] + COMPANIES[1][5:],
+        # PetPal left the CSV, a new company joined
+        ['Gridwise', 'Forecasting software for electric utility grids', 'Energy', 'Utilities', 'S24',
+         'https://www.ycombinator.com/companies/gridwise'],
+    ]
+    stats = sync(write_csv(tmp_path / "companies.csv", updated))
+
+    assert stats == {'new': 1, 'changed': 1, 'unchanged': 1, 'deleted': 1}
+    companies = stored(qdrant)
+    assert set(companies) == {'Acme Rockets', 'Ledgerly', 'Gridwise'}
+    assert companies['Ledgerly']['batch'] == 'W24'
+    assert sorted(qdrant.model.texts) == sorted([COMPANIES[1][1], updated[2][1]])
+
+
+def test_unchanged_csv_is_a_no_op(qdrant, tmp_path):
+    csv_path = write_csv(tmp_path / "companies.csv", COMPANIES)
+    sync(csv_path)
+    qdrant.model.texts.clear()
+
+    stats = sync(csv_path)
+
+    assert stats == {'new': 0, 'changed': 0, 'unchanged': 3, 'deleted': 0}
+    assert qdrant.model.texts == []
+
+
+def test_embedding_profile_switch_changes_every_row(qdrant, tmp_path, monkeypatch):
+    csv_path = write_csv(tmp_path / "companies.csv", COMPANIES)
+    sync(csv_path)
+
+    monkeypatch.setattr(qc, 'model_cache_key', lambda model_name: f"{model_name}:int8")
+    stats = sync(csv_path)
+
+    assert stats == {'new': 0, 'changed': 3, 'unchanged': 0, 'deleted': 0}
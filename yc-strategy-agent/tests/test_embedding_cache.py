@@ -0,0 +1,92 @@
+"""EmbeddingCache: round trips, LRU eviction and persistence across instances"""
+import numpy as np
+
+from lib.embedding_cache import EmbeddingCache
+
+DIM = 4
+
+
+def vector(value: float) -> np.ndarray:
+    return np.full(DIM, value, dtype=np.float32)
+
+
+def test_put_then_get(tmp_path):
+    cache = EmbeddingCache("test-model", DIM, capacity=8, cache_dir=str(tmp_path))
+    cache.put_many(["alpha", "beta"], [vector(1), vector(2)])
+
+    alpha, beta, gamma = cache.get_many(["alpha", "beta", "gamma"])
+
+    np.testing.assert_array_equal(alpha, vector(1))
+    np.testing.assert_array_equal(beta, vector(2))
+    assert gamma is None
+    assert cache.stats()['hits'] == 2
+    assert cache.stats()['misses'] == 1
+
+
+def test_keys_ignore_extra_whitespace(tmp_path):
+    cache = EmbeddingCache("test-model", DIM, capacity=8, cache_dir=str(tmp_path))
+    cache.put_many(["Hello  World"], [vector(3)])
+
+    np.testing.assert_array_equal(cache.get_many([" Hello World\n"])[0], vector(3))
+    assert cache.get_many(["hello world"]) == [None]
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = EmbeddingCache("test-model", DIM, capacity=2, cache_dir=str(tmp_path))
+    cache.put_many(["a", "b"], [vector(1), vector(2)])
+    cache.get_many(["a"])  # "b" is now the least recently used
+
+    cache.put_many(["c"], [vector(3)])
+
+    a, b, c = cache.get_many(["a", "b", "c"])
+    assert b is None
+    np.testing.assert_array_equal(a, vector(1))
+    np.testing.assert_array_equal(c, vector(3))
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['entries'] == 2
+
+
+def test_entries_survive_reopening(tmp_path):
+    cache = EmbeddingCache("test-model", DIM, capacity=8, cache_dir=str(tmp_path))
+    cache.put_many(["persisted"], [vector(5)])
+    cache.flush()
+
+    reopened = EmbeddingCache("test-model", DIM, capacity=8, cache_dir=str(tmp_path))
+
+    np.testing.assert_array_equal(reopened.get_many(["persisted"])[0], vector(5))
+
+
+def test_layout_change_resets_cache(tmp_path):
+    cache = EmbeddingCache("test-model", DIM, capacity=8, cache_dir=str(tmp_path))
+    cache.put_many(["stale"], [vector(1)])
+    cache.flush()
+
+    resized = EmbeddingCache("test-model", DIM, capacity=4, cache_dir=str(tmp_path))
+
+    assert resized.get_many(["stale"]) == [None]
+
+
+def test_writes_from_another_instance_are_seen(tmp_path):
+    first = EmbeddingCache("test-model", DIM, capacity=2, cache_dir=str(tmp_path))
+    second = EmbeddingCache("test-model", DIM, capacity=2, cache_dir=str(tmp_path))
+    first.put_many(["a", "b"], [vector(1), vector(2)])
+
+    # `second` must reload its slot index and evict like `first` would have
+    second.put_many(["c"], [vector(3)])
+
+    a, b, c = second.get_many(["a", "b", "c"])
+    assert a is None
+    np.testing.assert_array_equal(b, vector(2))
+    np.testing.assert_array_equal(c, vector(3))
+    # `first` still maps "a" to the reused slot: a miss, never c's vector
+    assert first.get_many(["a"]) == [None]
+
+
+def test_clear(tmp_path):
+    cache = EmbeddingCache("test-model", DIM, capacity=4, cache_dir=str(tmp_path))
+    cache.put_many(["a"], [vector(1)])
+
+    cache.clear()
+
+    assert cache.get_many(["a"]) == [None]
+    assert cache.stats()['entries'] == 0
@@ -0,0 +1,140 @@
+"""PageCache and cached_page_data: fresh hits, stale entries and 304 revalidation"""
+import sqlite3
+
+import pytest
+
+from lib import page_cache, scraper
+from lib.page_cache import PageCache, normalize_url
+
+URL = "https://www.ycombinator.com/companies/acme?utm_source=x"
+DATA = {'name': 'Acme', 'description': 'Rockets', 'batch': 'W21'}
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, text: str = "", headers=None):
+        self.status_code = status_code
+        self.ok = 200 <= status_code < 400
+        self.text = text
+        self.headers = headers or {}
+
+
+class FakeSession:
+    """Answers every GET with one response and records the request headers"""
+
+    def __init__(self, response: FakeResponse):
+        self.response = response
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        return self.response
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = PageCache(str(tmp_path / "pages.sqlite"))
+    monkeypatch.setattr(scraper, 'get_page_cache', lambda: cache)
+    return cache
+
+
+def use_session(monkeypatch, response: FakeResponse) -> FakeSession:
+    session = FakeSession(response)
+    monkeypatch.setattr(scraper, 'get_http_session', lambda: session)
+    return session
+
+
+def make_stale(monkeypatch):
+    monkeypatch.setitem(page_cache.PAGE_CACHE_TTLS, 'yc_listing', -1)
+
+
+def test_normalize_url_ignores_tracking_and_trailing_slash():
+    assert normalize_url("https://Example.com/about/?utm_source=x&b=2&a=1#top") == "example.com/about?a=1&b=2"
+    assert normalize_url("http://example.com:443/") == normalize_url("https://example.com")
+
+
+def test_put_then_get(cache):
+    cache.put(URL, 'yc_listing', "<html>acme</html>", DATA, etag='"v1"')
+
+    page = cache.get("https://www.ycombinator.com/companies/acme/", 'yc_listing')
+
+    assert page.fresh
+    assert page.data == DATA
+    assert page.html == "<html>acme</html>"
+    assert page.conditional_headers() == {'If-None-Match': '"v1"'}
+    assert cache.get(URL, 'landing_page') is None
+    assert cache.counters['hits'] == 1
+    assert cache.counters['misses'] == 1
+
+
+def test_fresh_entry_is_served_without_a_request(cache, monkeypatch):
+    cache.put(URL, 'yc_listing', "<html></html>", DATA, etag='"v1"')
+    session = use_session(monkeypatch, FakeResponse(200))
+
+    assert scraper.cached_page_data(URL, 'yc_listing') == (DATA, None)
+    assert session.requests == []
+
+
+def test_stale_entry_revalidated_by_304(cache, monkeypatch):
+    cache.put(URL, 'yc_listing', "<html></html>", DATA, etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    make_stale(monkeypatch)
+    session = use_session(monkeypatch, FakeResponse(304))
+
+    assert scraper.cached_page_data(URL, 'yc_listing') == (DATA, None)
+    assert session.requests == [{
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': "Mon, 01 Jan 2024 00:00:00 GMT",
+    }]
+    assert cache.counters['stale'] == 1
+    assert cache.counters['revalidated'] == 1
+
+
+def test_stale_entry_changed_returns_the_new_response(cache, monkeypatch):
+    cache.put(URL, 'yc_listing', "<html></html>", DATA, etag='"v1"')
+    make_stale(monkeypatch)
+    response = FakeResponse(200, "<html>new</html>", {'ETag': '"v2"'})
+    use_session(monkeypatch, response)
+
+    assert scraper.cached_page_data(URL, 'yc_listing') == (None, response)
+    assert cache.counters['revalidated'] == 0
+
+
+def test_stale_entry_with_failed_revalidation_is_a_miss(cache, monkeypatch):
+    cache.put(URL, 'yc_listing', "<html></html>", DATA, etag='"v1"')
+    make_stale(monkeypatch)
+    use_session(monkeypatch, FakeResponse(503))
+
+    assert scraper.cached_page_data(URL, 'yc_listing') == (None, None)
+
+
+def test_stale_entry_without_validators_is_a_miss(cache, monkeypatch):
+    cache.put(URL, 'yc_listing', "<html></html>", DATA)
+    make_stale(monkeypatch)
+    session = use_session(monkeypatch, FakeResponse(304))
+
+    assert scraper.cached_page_data(URL, 'yc_listing') == (None, None)
+    assert session.requests == []
+
+
+def test_unreadable_cache_is_a_miss(monkeypatch):
+    class BrokenCache:
+        def get(self, url, source):
+            raise sqlite3.OperationalError("database disk image is malformed")
+
+    monkeypatch.setattr(scraper, 'get_page_cache', lambda: BrokenCache())
+
+    assert scraper.cached_page_data(URL, 'yc_listing') == (None, None)
+
+
+def test_failed_scrapes_are_not_cached(cache):
+    scraper.cache_page(URL, 'yc_listing', "<html></html>", {'error': 'timeout'})
+
+    assert cache.get(URL, 'yc_listing') is None
+
+
+def test_purge_expired(cache, monkeypatch):
+    cache.put(URL, 'yc_listing', "<html></html>", DATA)
+    cache.put("https://acme.com", 'landing_page', "<html></html>", {'hero_section': 'Hi'})
+    make_stale(monkeypatch)
+
+    assert cache.purge(expired_only=True) == 1
+    assert cache.get("https://acme.com", 'landing_page') is not None
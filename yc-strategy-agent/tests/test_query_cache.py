@@ -0,0 +1,116 @@
+"""QueryCache: exact and semantic hits, TTL and index-generation invalidation"""
+import os
+
+import numpy as np
+
+from lib.query_cache import QueryCache, bump_index_generation, search_context
+
+RESULTS = [{'name': 'Acme', 'similarity_score': 0.9}]
+EMBEDDING = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+
+
+def make_cache(tmp_path, **kwargs) -> QueryCache:
+    return QueryCache(generation_path=str(tmp_path / "index_generation"), **kwargs)
+
+
+def bump(tmp_path):
+    """Bump the generation with an mtime that surely differs, whatever the filesystem's resolution"""
+    path = tmp_path / "index_generation"
+    previous = path.stat().st_mtime_ns if path.exists() else 0
+    bump_index_generation(str(path))
+    mtime = max(path.stat().st_mtime_ns, previous + 1_000_000_000)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_exact_hit_returns_a_copy(tmp_path):
+    cache = make_cache(tmp_path)
+    context = search_context(limit=3)
+    cache.put("An AI tutor", context, EMBEDDING, RESULTS)
+
+    results, embedding = cache.lookup("  An AI   tutor ", context)
+
+    assert results == RESULTS
+    np.testing.assert_array_equal(embedding, EMBEDDING)
+    results[0]['name'] = 'changed'
+    assert cache.lookup("An AI tutor", context)[0] == RESULTS
+
+
+def test_other_context_misses_but_reuses_embedding(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("An AI tutor", search_context(limit=3), EMBEDDING, RESULTS)
+
+    results, embedding = cache.lookup("An AI tutor", search_context(limit=5))
+
+    assert results is None
+    np.testing.assert_array_equal(embedding, EMBEDDING)
+
+
+def test_generation_bump_invalidates(tmp_path):
+    bump(tmp_path)
+    cache = make_cache(tmp_path, semantic=True)
+    context = search_context(limit=3)
+    cache.put("An AI tutor", context, EMBEDDING, RESULTS)
+    assert cache.lookup("An AI tutor", context)[0] == RESULTS
+
+    bump(tmp_path)
+
+    assert cache.lookup("An AI tutor", context) == (None, None)
+    assert cache.lookup_similar(EMBEDDING, context) is None
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_generation_created_after_cache_invalidates(tmp_path):
+    cache = make_cache(tmp_path)
+    context = search_context(limit=3)
+    cache.put("An AI tutor", context, EMBEDDING, RESULTS)
+
+    bump(tmp_path)
+
+    assert cache.lookup("An AI tutor", context) == (None, None)
+
+
+def test_unchanged_generation_keeps_entries(tmp_path):
+    bump(tmp_path)
+    cache = make_cache(tmp_path)
+    context = search_context(limit=3)
+    cache.put("An AI tutor", context, EMBEDDING, RESULTS)
+
+    for _ in range(3):
+        assert cache.lookup("An AI tutor", context)[0] == RESULTS
+    assert cache.stats()['invalidations'] == 0
+
+
+def test_expired_entry_misses(tmp_path):
+    cache = make_cache(tmp_path, ttl=0.0)
+    context = search_context(limit=3)
+    cache.put("An AI tutor", context, EMBEDDING, RESULTS)
+
+    assert cache.lookup("An AI tutor", context)[0] is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_semantic_hit_within_distance(tmp_path):
+    cache = make_cache(tmp_path, semantic=True, semantic_distance=0.05)
+    context = search_context(limit=3)
+    cache.put("An AI tutor", context, EMBEDDING, RESULTS)
+
+    near = np.array([1.0, 0.1, 0.0], dtype=np.float32)
+    far = np.array([0.0, 1.0, 0.0], dtype=np.float32)
+
+    assert cache.lookup_similar(near, context) == RESULTS
+    assert cache.lookup_similar(far, context) is None
+    assert cache.lookup_similar(near, search_context(limit=5)) is None
+
+
+def test_exact_tier_evicts_least_recently_used(tmp_path):
+    cache = make_cache(tmp_path, size=2)
+    context = search_context(limit=3)
+    for pitch in ("one", "two"):
+        cache.put(pitch, context, EMBEDDING, RESULTS)
+    cache.lookup("one", context)
+
+    cache.put("three", context, EMBEDDING, RESULTS)
+
+    assert cache.lookup("two", context) == (None, None)
+    assert cache.lookup("one", context)[0] == RESULTS
+    assert cache.stats()['evictions'] == 1